@@ -1,4 +1,5 @@
 from blockchain.transaction import load_from_dict as load_transaction_from_dict, Transaction
+from blockchain.merkle import MerkleAccumulator
 import hashlib
 import json
 
@@ -12,8 +13,14 @@ def load_from_dict(dict):
         new_transaction = load_transaction_from_dict(each_transaction_json)
         new_block.add_transaction(new_transaction)
 
+    new_block.hash = new_block.calculate_hash()
     return new_block
 
+def submit_digest(previous_hash , merkle_root : str) -> str:
+    """The nonce the lead validator signs in a block's SUBMIT_BLOCK transaction, it commits to the block's previous hash
+    and to every transaction before the SUBMIT_BLOCK."""
+    return hashlib.sha256((str(previous_hash) + merkle_root).encode("utf-8")).hexdigest()
+
 def load_from_json(json_str):
     loaded_dict = json.loads(json_str)
     return load_from_dict(loaded_dict)
@@ -25,14 +32,12 @@ class Block:
         self.previous_hash = "0"
         # self.timestamp = timestamp
         self.data = []  # list of transactions
+        self.merkle_tree = MerkleAccumulator() # built incrementally from each transaction hash.
         self.hash = self.calculate_hash()
 
     def calculate_hash(self) -> str:
-        """Generates a hash string depending on block content."""
-        data_to_hash = str(self.previous_hash)
-        each_transaction : Transaction
-        for each_transaction in self.data:
-            data_to_hash += each_transaction.to_json()
+        """Generates a hash string from the previous hash and the merkle root of the block's transactions."""
+        data_to_hash = str(self.previous_hash) + self.merkle_tree.root()
         return hashlib.sha256(data_to_hash.encode("utf-8")).hexdigest()
 
     def set_previous_hash(self , new_previous_hash):
@@ -41,9 +46,17 @@ class Block:
         self.previous_hash = new_previous_hash
         self.hash = self.calculate_hash()
 
-    def add_transaction(self, transaction):
+    def add_transaction(self, transaction : Transaction):
+        """Appends the transaction, the block hash is not recalculated until the block is finalized."""
         self.data.append(transaction)
-        self.hash = self.calculate_hash()
+        self.merkle_tree.append(transaction.hash)
+
+    def submitted_digest(self) -> str:
+        """The submit_digest of this block, taking its last transaction as the SUBMIT_BLOCK."""
+        merkle_tree = MerkleAccumulator()
+        for each_transaction in self.data[:-1]:
+            merkle_tree.append(each_transaction.hash)
+        return submit_digest(self.previous_hash , merkle_tree.root())
 
     def __str__(self) -> str:
         return f"Hash : {self.hash} \nLength : {len(self.data)} \nPrevious Hash : {self.previous_hash[:6]} \n   {self.data} \n" + ("-" * 36)
@@ -0,0 +1,134 @@
+"""This module contains the append-only block store used to keep finalized blocks on disk between restarts."""
+import os
+import struct
+import typing
+import zlib
+
+from blockchain.block import Block, load_from_json as load_block_from_json
+
+RECORD_HEADER = struct.Struct(">II") # payload length , crc32 of the payload.
+
+class BlockStore:
+    """Stores blocks in a single segment file of length prefixed records, with an index from block hash to file offset.
+
+    Each append is written to the os straight away but only fsynced every sync_batch_size blocks, so a crash can lose
+    at most the last unsynced blocks. A torn or corrupt record at the end of the file is truncated when the store is opened."""
+    path : str
+    index : typing.Dict[str , int]
+    hashes : typing.List[str]
+    recovered_blocks : typing.List[Block] | None
+    sync_batch_size : int
+    unsynced : int
+
+    def __init__(self , path : str , sync_batch_size : int = 16):
+        self.path = path
+        self.sync_batch_size = max(1 , sync_batch_size)
+        self.unsynced = 0
+        self.index = {}
+        self.hashes = []
+        self.recovered_blocks = None
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory , exist_ok=True)
+        self.file = open(path , "a+b")
+        self.recover()
+
+    def recover(self) -> None:
+        """Rebuilds the index from the segment file and truncates anything after the last valid record.
+
+        The decoded blocks are kept for the first load_blocks call so startup only reads the file once."""
+        self.index.clear()
+        self.hashes.clear()
+        self.recovered_blocks = []
+        valid_end = 0
+        for offset , each_block in self.scan():
+            self.index[each_block.hash] = offset
+            self.hashes.append(each_block.hash)
+            self.recovered_blocks.append(each_block)
+            valid_end = self.file.tell()
+
+        self.file.seek(0 , os.SEEK_END)
+        if self.file.tell() != valid_end:
+            self.file.truncate(valid_end)
+            self.sync()
+
+    def scan(self) -> typing.Iterator[typing.Tuple[int , Block]]:
+        """Yields (offset , block) for each valid record from the start of the file, stops at the first bad record."""
+        self.file.seek(0)
+        previous_hash = None
+        while True:
+            offset = self.file.tell()
+            header = self.file.read(RECORD_HEADER.size)
+            if len(header) < RECORD_HEADER.size:
+                return
+            length , checksum = RECORD_HEADER.unpack(header)
+            payload = self.file.read(length)
+            if len(payload) < length or zlib.crc32(payload) != checksum:
+                return
+            try:
+                block = load_block_from_json(payload.decode("utf-8"))
+            except (ValueError , KeyError , TypeError):
+                return
+            # blocks must chain onto each other, anything after a broken link is discarded.
+            if previous_hash is not None and block.previous_hash != previous_hash:
+                return
+            previous_hash = block.hash
+            yield offset , block
+
+    def load_blocks(self) -> typing.List[Block]:
+        """Returns every stored block in chain order."""
+        if self.recovered_blocks is not None:
+            blocks , self.recovered_blocks = self.recovered_blocks , None
+            return blocks
+        blocks = [each_block for _ , each_block in self.scan()]
+        self.file.seek(0 , os.SEEK_END)
+        return blocks
+
+    def append(self , block : Block) -> None:
+        payload = block.to_json().encode("utf-8")
+        self.recovered_blocks = None
+        self.file.seek(0 , os.SEEK_END)
+        offset = self.file.tell()
+        self.file.write(RECORD_HEADER.pack(len(payload) , zlib.crc32(payload)) + payload)
+        self.file.flush()
+        self.index[block.hash] = offset
+        self.hashes.append(block.hash)
+
+        self.unsynced += 1
+        if self.unsynced >= self.sync_batch_size:
+            self.sync()
+
+    def read_block(self , block_hash : str) -> Block | None:
+        offset = self.index.get(block_hash)
+        if offset is None:
+            return None
+        self.file.seek(offset)
+        length , _ = RECORD_HEADER.unpack(self.file.read(RECORD_HEADER.size))
+        block = load_block_from_json(self.file.read(length).decode("utf-8"))
+        self.file.seek(0 , os.SEEK_END)
+        return block
+
+    def sync(self) -> None:
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.unsynced = 0
+
+    def reset(self) -> None:
+        """Removes every stored block."""
+        self.file.truncate(0)
+        self.sync()
+        self.index.clear()
+        self.hashes.clear()
+        self.recovered_blocks = None
+
+    def close(self) -> None:
+        if self.file.closed == False:
+            self.sync()
+            self.file.close()
+
+    def __contains__(self , block_hash : str) -> bool:
+        return block_hash in self.index
+
+    def __len__(self) -> int:
+        return len(self.hashes)
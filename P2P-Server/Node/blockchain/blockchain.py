@@ -1,4 +1,5 @@
 from blockchain.block import Block, load_from_dict as load_block_from_dict
+from blockchain.block_store import BlockStore
 import json
 
 def load_from_dict(data : dict) -> "Blockchain":
@@ -15,16 +16,34 @@ def load_from_dict(data : dict) -> "Blockchain":
     
     return new_blockchain
 
+def load_from_block_store(block_store : BlockStore) -> "Blockchain | None":
+    """Creates a blockchain from the blocks kept on disk, returns None if the store is empty."""
+    stored_blocks = block_store.load_blocks()
+    if len(stored_blocks) == 0:
+        return None
+
+    new_blockchain = Blockchain(False)
+    new_blockchain.chain = stored_blocks
+    new_blockchain.head = stored_blocks[-1].hash
+    new_blockchain.block_store = block_store
+    return new_blockchain
+
 
 class Blockchain:
     """This class the classed used to store the local blockchain."""
     genesisBlock : Block
     chain : list[Block]
+    block_store : BlockStore | None
+    """If set every block added to the chain is also appended to the block store."""
+    base_height : int
+    """Height of the first block in chain, a chain synced from a checkpoint doesn't have the blocks before it."""
 
     head : str
     """The blockchain head stores the hash of the most recently finalized block, this is not the same as the head of the current working block."""
     def __init__(self , includeGenesis=False):
         self.chain = []
+        self.block_store = None
+        self.base_height = 0
         #genesis node
         if includeGenesis:
             genesisBlock = Block()
@@ -46,15 +65,53 @@ class Blockchain:
         new_block.hash = new_block.calculate_hash()
         self.head = new_block.hash
         self.chain.append(new_block)
+        if self.block_store is not None:
+            self.block_store.append(new_block)
 
     def add_genesis_block(self, new_block : Block):
         new_block.set_previous_hash(0)
         self.head = new_block.hash
         self.chain.append(new_block)
+        if self.block_store is not None:
+            self.block_store.append(new_block)
+
+    def attach_block_store(self , block_store : BlockStore) -> None:
+        """Replaces the contents of the block store with this chain, new blocks are then appended as they are added."""
+        block_store.reset()
+        for each_block in self.chain:
+            block_store.append(each_block)
+        block_store.sync()
+        self.block_store = block_store
 
     def get_latest_block(self):
         return self.chain[-1]
+
+    def height(self) -> int:
+        """The height the next block added will have."""
+        return self.base_height + len(self.chain)
+
+    def block_at(self , height : int) -> Block | None:
+        """Returns the block at the given height, or None if it isnt in the local chain."""
+        index = height - self.base_height
+        if index < 0 or index >= len(self.chain):
+            return None
+        return self.chain[index]
           
+    def serialize_page(self , page_number : int , page_size : int) -> dict:
+        """Serializes one page of the blocks held locally, page 0 starts at base_height so a chain bootstrapped from a
+        checkpoint has no empty pages. Only the blocks on the page are serialized, so a page costs the same however long
+        the chain is."""
+        page_count = max(1 , (len(self.chain) + page_size - 1) // page_size)
+        page_number = min(max(page_number , 0) , page_count - 1)
+        page_blocks = [each_block.serialize() for each_block in self.chain[page_number * page_size : (page_number + 1) * page_size]]
+        return {
+            "page" : page_number,
+            "page_count" : page_count,
+            "head" : self.head if len(self.chain) > 0 else None,
+            "height" : self.height(),
+            "blocks" : page_blocks,
+        }
+
     def pretty_print(self):
         print("Blocks".center(36 , "-"))
         print(f"Blockchain Head: {self.head} \n")
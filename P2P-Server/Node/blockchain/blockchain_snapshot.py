@@ -1,5 +1,6 @@
-import json , hashlib , typing
-import utilities.authentication as authentication
+import json , hashlib , typing , base64
+import types
+from blockchain.elector_registry import ElectorRegistry, elector_key_bytes, load_registry
 import typing
 
 def load_snapshot_from_dict(data : typing.Dict) -> "Snapshot":
@@ -9,6 +10,7 @@ def load_snapshot_from_dict(data : typing.Dict) -> "Snapshot":
     new_snapshot.validator_addresses = data.get("validator_addresses" , [])
     new_snapshot.election_candiates = data.get("election_candidates" , {})
     new_snapshot.lead_validator = data.get("lead_validator" , None)
+    new_snapshot.electors_known = False # the basic snapshot doesn't carry the elector registry.
 
     vote_tally_data : dict = data.get("vote_tally" , {})
     new_snapshot.vote_tally = {}
@@ -19,14 +21,41 @@ def load_snapshot_from_dict(data : typing.Dict) -> "Snapshot":
 
     return new_snapshot
 
+def load_snapshot_from_checkpoint(checkpoint_data : bytes) -> "Snapshot":
+    """Creates a snapshot from the bytes written by Snapshot.serialize_checkpoint, unlike to_json this includes the electors."""
+    data : dict = json.loads(checkpoint_data)
+    new_snapshot = Snapshot()
+    new_snapshot.blockchain_head = data["blockchain_head"]
+    new_snapshot.lead_validator = data["lead_validator"]
+    new_snapshot.validator_addresses = data["validator_addresses"]
+    new_snapshot.election_candiates = {int(key) : candidate for key , candidate in data["election_candidates"].items()}
+    new_snapshot.vote_tally = {int(key) : vote_tally for key , vote_tally in data["vote_tally"].items()}
+    new_snapshot.electors = load_registry(
+        base64.b64decode(data["elector_keys"] , validate=True),
+        base64.b64decode(data["electors_voted"] , validate=True),
+    )
+    new_snapshot.hash = new_snapshot.calculate_snapshot_hash()
+    return new_snapshot
+
+def checkpoint_hash(checkpoint_data : bytes) -> str:
+    return hashlib.sha256(checkpoint_data).hexdigest()
+
+SHAREABLE_ATTRIBUTES = ("validator_addresses" , "election_candiates" , "vote_tally")
+
 class Snapshot:
-    """This class tracks important state changes on the blockchain to avoid a node having to parse the whole blockchain"""
+    """This class tracks important state changes on the blockchain to avoid a node having to parse the whole blockchain
+
+    The validators, candidates and vote tally are copy on write, copy and vote_tally_view share them instead of copying
+    so a consistent view can be handed to the ui thread in O(1). A shared attribute is copied the first time it is
+    changed after being shared, so what was handed out never changes."""
     lead_validator : str
     blockchain_head : str
     hash : str
     election_candiates : dict
-    elector_dict : dict
+    electors : ElectorRegistry
     vote_tally : dict
+    electors_known : bool
+    shared_attributes : typing.Set[str]
     
     def __init__(self):
         self.validator_addresses = []
@@ -34,10 +63,19 @@ class Snapshot:
         self.blockchain_head = "0"
         self.hash = "0"
         self.election_candiates = {} #abritary candiate name and candiate id
-        self.elector_dict = {}
+        self.electors = ElectorRegistry()
         self.vote_tally = {}
+        self.electors_known = True # false if the snapshot was loaded without the electors, so they can never be checked.
+        self.shared_attributes = set() # attributes that another snapshot or a view also references.
+
+    def unshare(self , attribute : str) -> None:
+        """Gives the snapshot its own copy of a shared attribute, called before the attribute is changed."""
+        if attribute in self.shared_attributes:
+            setattr(self , attribute , getattr(self , attribute).copy())
+            self.shared_attributes.discard(attribute)
 
     def add_vote(self , candidate_id : int) -> None:
+        self.unshare("vote_tally")
         current_tally = self.vote_tally.get(candidate_id , None) 
         if current_tally is None:
             self.vote_tally[candidate_id] = 1
@@ -46,8 +84,14 @@ class Snapshot:
 
     def get_vote_tally(self) -> typing.Dict:
         return self.vote_tally
+
+    def vote_tally_view(self) -> typing.Mapping[int , int]:
+        """A read only view of the current tally that later votes don't change."""
+        self.shared_attributes.add("vote_tally")
+        return types.MappingProxyType(self.vote_tally)
     
     def add_candidate(self , candidate_name : str , candidate_id : int):
+        self.unshare("election_candiates")
         self.election_candiates[candidate_id] = {
             "candidate_name" : candidate_name,
             "candidate_id" : candidate_id
@@ -66,6 +110,7 @@ class Snapshot:
         return self.election_candiates
     
     def add_validator(self , node_id : str):
+        self.unshare("validator_addresses")
         self.validator_addresses.append(node_id)
         self.hash = self.calculate_snapshot_hash()
 
@@ -83,6 +128,19 @@ class Snapshot:
             "vote_tally" : self.vote_tally
         })
     
+    def serialize_checkpoint(self) -> bytes:
+        """Serializes the whole snapshot state, including the elector registry and which electors have voted.
+        The output is the same on every node with the same state so its hash can be committed to in a checkpoint."""
+        return json.dumps({
+            "blockchain_head" : self.blockchain_head,
+            "lead_validator" : self.lead_validator,
+            "validator_addresses" : self.validator_addresses,
+            "election_candidates" : {str(key) : candidate for key , candidate in self.election_candiates.items()},
+            "vote_tally" : {str(key) : vote_tally for key , vote_tally in self.vote_tally.items()},
+            "elector_keys" : base64.b64encode(self.electors.raw_keys()).decode(),
+            "electors_voted" : base64.b64encode(self.electors.voted).decode(),
+        } , sort_keys=True , separators=(',', ':')).encode()
+
     def is_a_validator(self , target_id : str):
         return target_id in self.validator_addresses
 
@@ -111,45 +169,61 @@ class Snapshot:
         self.hash = "0"
     
     def add_elector(self , elector_public_key : str)-> None:
-        public_key_hash = authentication.generate_sha256_hash(elector_public_key)
-        
-        self.elector_dict[public_key_hash] = {
-            "public_key" :  elector_public_key,
-            "voted" : False
-        }
+        key_bytes = elector_key_bytes(elector_public_key)
+        if key_bytes is not None:
+            self.electors.add(key_bytes)
+
+    def add_electors(self , elector_public_keys : typing.Iterable[str]) -> None:
+        """Registers every elector in one pass, keys that arent valid ed25519 public keys are skipped."""
+        self.electors.add_many(
+            each_key for each_key in map(elector_key_bytes , elector_public_keys) if each_key is not None
+        )
+
+    def add_elector_keys(self , keys : typing.Iterable[bytes]) -> None:
+        """Registers electors from their raw public keys, as carried by ADD_ELECTORS transactions."""
+        self.electors.add_many(keys)
 
     def copy(self) -> "Snapshot":
-        """Returns a 1 layer deep copy of snapshot, all sub attributes are shallow copied"""
+        """Returns a copy of the snapshot without the electors, the validators, candidates and tally are shared until
+        either snapshot changes them. The copy's attributes must only be changed through its methods."""
         new_snapshot = Snapshot()
         new_snapshot.blockchain_head = self.blockchain_head
         new_snapshot.hash = self.hash
-        new_snapshot.validator_addresses = self.validator_addresses.copy()
-        new_snapshot.election_candiates = self.election_candiates.copy()
         new_snapshot.lead_validator = self.lead_validator
-        new_snapshot.vote_tally = self.vote_tally.copy()
+        for each_attribute in SHAREABLE_ATTRIBUTES:
+            setattr(new_snapshot , each_attribute , getattr(self , each_attribute))
+        self.shared_attributes.update(SHAREABLE_ATTRIBUTES)
+        new_snapshot.shared_attributes.update(SHAREABLE_ATTRIBUTES)
+        new_snapshot.electors_known = False
         return new_snapshot
 
+    def checkpoint_copy(self) -> "Snapshot":
+        """Returns a copy with its own elector registry, serialize_checkpoint can be called on it from another thread
+        while this snapshot keeps changing."""
+        new_snapshot = self.copy()
+        new_snapshot.electors = self.electors.copy()
+        new_snapshot.electors_known = self.electors_known
+        return new_snapshot
+
+
+    def get_elector_index(self , key_bytes : bytes) -> typing.Optional[int]:
+        """Returns the registry index of an elector from its raw public key, so a caller checking several things only decodes the key once."""
+        return self.electors.lookup(key_bytes)
 
     def is_elector_registered(self , elector_public_key : str):
-        public_key_hash = authentication.generate_sha256_hash(elector_public_key)
-        elector_info : typing.Dict = self.elector_dict.get(public_key_hash , None)
-        if elector_info is None: 
-            return False 
-        else:
-            return True
+        key_bytes = elector_key_bytes(elector_public_key)
+        return key_bytes is not None and key_bytes in self.electors
 
     def has_elector_voted(self  , elector_public_key : str ) -> typing.Optional[bool]:
-        public_key_hash = authentication.generate_sha256_hash(elector_public_key)
+        key_bytes = elector_key_bytes(elector_public_key)
+        elector_index = self.electors.lookup(key_bytes) if key_bytes is not None else None
+        if elector_index is None: return
 
-        elector_info : typing.Dict = self.elector_dict.get(public_key_hash , None)
-        if elector_info is None: return
-
-        return elector_info.get("voted" , False)
+        return self.electors.is_voted(elector_index)
 
     def set_elector_voted(self , elector_public_key : str , vote_status : bool) -> None:
-        public_key_hash = authentication.generate_sha256_hash(elector_public_key)
-
-        elector_info = self.elector_dict.get(public_key_hash , None)
-        if elector_info is None: return
+        key_bytes = elector_key_bytes(elector_public_key)
+        elector_index = self.electors.lookup(key_bytes) if key_bytes is not None else None
+        if elector_index is None: return
 
-        elector_info["voted"] = vote_status
\ No newline at end of file
+        self.electors.set_voted(elector_index , vote_status)
@@ -0,0 +1,196 @@
+"""This module contains the elector registry used by the snapshot to track registered electors and whether they have voted."""
+import array
+import base64
+import binascii
+import typing
+
+ELECTOR_KEY_SIZE = 32 # raw ed25519 public key length.
+MIN_SLOTS = 8
+
+def elector_key_bytes(elector_public_key : str) -> bytes | None:
+    """Returns the raw key bytes of a base64 compressed elector public key, or None if it isnt a valid key."""
+    try:
+        key_bytes = base64.b64decode(elector_public_key , validate=True)
+    except (binascii.Error , TypeError , ValueError):
+        return None
+    if len(key_bytes) != ELECTOR_KEY_SIZE:
+        return None
+    return key_bytes
+
+def pack_elector_keys(keys : typing.Iterable[bytes]) -> str:
+    """Encodes many raw elector public keys as one base64 string, used by ADD_ELECTORS transactions."""
+    return base64.b64encode(b"".join(keys)).decode()
+
+def unpack_elector_keys(packed_keys : str) -> typing.List[bytes]:
+    """Decodes the keys packed by pack_elector_keys, returns an empty list if the string isnt a whole number of keys."""
+    try:
+        raw_keys = base64.b64decode(packed_keys , validate=True)
+    except (binascii.Error , TypeError , ValueError):
+        return []
+    if len(raw_keys) % ELECTOR_KEY_SIZE != 0:
+        return []
+    return [raw_keys[i:i + ELECTOR_KEY_SIZE] for i in range(0 , len(raw_keys) , ELECTOR_KEY_SIZE)]
+
+def load_registry(raw_keys : bytes , voted : bytes) -> "ElectorRegistry":
+    """Rebuilds a registry from the keys returned by ElectorRegistry.raw_keys and its voted bitset."""
+    if len(raw_keys) % ELECTOR_KEY_SIZE != 0 or len(voted) != (len(raw_keys) // ELECTOR_KEY_SIZE + 7) // 8:
+        raise ValueError("elector keys and voted bitset dont match")
+    new_registry = ElectorRegistry()
+    new_registry.add_many(raw_keys[i:i + ELECTOR_KEY_SIZE] for i in range(0 , len(raw_keys) , ELECTOR_KEY_SIZE))
+    if len(new_registry) != len(raw_keys) // ELECTOR_KEY_SIZE:
+        raise ValueError("elector keys contain duplicates")
+    new_registry.voted = bytearray(voted)
+    new_registry.voted_count = int.from_bytes(voted , "big").bit_count()
+    return new_registry
+
+
+class ElectorRegistry:
+    """Maps each elector's raw public key to an index in a voted bitset.
+
+    The keys are stored back to back in one bytearray in index order, found through an open addressed table of indexes
+    into it. That is about 45 bytes per elector, a dict of bytes keys takes about 145. Whether an elector has voted is a
+    single bit. A dict index can also be kept as a faster lookup when the memory is available.
+    Electors are never removed, an elector's index stays the same once registered."""
+    keys : bytearray
+    slots : array.array
+    fast_index : typing.Dict[bytes , int] | None
+    voted : bytearray
+
+    def __init__(self , fast_index : bool = False):
+        self.keys = bytearray()
+        self.slots = array.array("I" , [0]) * MIN_SLOTS # elector index + 1 of the key hashed to each slot, 0 if empty.
+        self.fast_index = {} if fast_index else None
+        self.count = 0
+        self.voted = bytearray()
+        self.voted_count = 0
+
+    def find_slot(self , key_bytes : bytes) -> typing.Tuple[int , int | None]:
+        """Returns the slot the key is in, or the empty slot it would go in, and the key's elector index if it is registered."""
+        slots = self.slots
+        keys = self.keys
+        mask = len(slots) - 1
+        position = hash(key_bytes) & mask
+        while True:
+            slot = slots[position]
+            if slot == 0:
+                return position , None
+            offset = (slot - 1) * ELECTOR_KEY_SIZE
+            if keys[offset:offset + ELECTOR_KEY_SIZE] == key_bytes:
+                return position , slot - 1
+            position = (position + 1) & mask
+
+    def resize(self , slot_count : int) -> None:
+        """Rebuilds the slot table with slot_count slots, slot_count must be a power of two."""
+        slots = array.array("I" , [0]) * slot_count
+        keys = self.keys
+        mask = slot_count - 1
+        for elector_index in range(0 , self.count):
+            offset = elector_index * ELECTOR_KEY_SIZE
+            position = hash(bytes(keys[offset:offset + ELECTOR_KEY_SIZE])) & mask
+            while slots[position] != 0:
+                position = (position + 1) & mask
+            slots[position] = elector_index + 1
+        self.slots = slots
+
+    def insert(self , key_bytes : bytes) -> int:
+        """Registers the key if it isnt already registered and returns its index, the voted bitset isnt grown."""
+        if len(key_bytes) != ELECTOR_KEY_SIZE:
+            raise ValueError("elector keys must be 32 bytes")
+        key_bytes = bytes(key_bytes)
+        position , elector_index = self.find_slot(key_bytes)
+        if elector_index is not None:
+            return elector_index
+        elector_index = self.count
+        self.keys += key_bytes
+        self.slots[position] = elector_index + 1
+        self.count += 1
+        if self.fast_index is not None:
+            self.fast_index[key_bytes] = elector_index
+        # the table is kept at most half full so probes stay short.
+        if self.count * 2 > len(self.slots):
+            self.resize(len(self.slots) * 2)
+        return elector_index
+
+    def add(self , key_bytes : bytes) -> int:
+        """Registers the elector if it isnt already registered and returns its index."""
+        elector_index = self.insert(key_bytes)
+        if elector_index // 8 >= len(self.voted):
+            self.voted.append(0)
+        return elector_index
+
+    def add_many(self , keys : typing.Iterable[bytes]) -> None:
+        """Registers every key, the slot table is grown and the voted bitset extended only once."""
+        new_keys = [bytes(each_key) for each_key in keys]
+        if any(len(each_key) != ELECTOR_KEY_SIZE for each_key in new_keys):
+            raise ValueError("elector keys must be 32 bytes")
+        slot_count = len(self.slots)
+        while (self.count + len(new_keys)) * 2 > slot_count:
+            slot_count *= 2
+        if slot_count != len(self.slots):
+            self.resize(slot_count)
+
+        # find_slot inlined, this runs once per elector when the electors are loaded.
+        slots = self.slots
+        stored_keys = self.keys
+        mask = slot_count - 1
+        count = self.count
+        fast_index = self.fast_index
+        for each_key in new_keys:
+            position = hash(each_key) & mask
+            slot = slots[position]
+            while slot != 0:
+                offset = (slot - 1) * ELECTOR_KEY_SIZE
+                if stored_keys[offset:offset + ELECTOR_KEY_SIZE] == each_key:
+                    break
+                position = (position + 1) & mask
+                slot = slots[position]
+            if slot != 0:
+                continue # already registered.
+            stored_keys += each_key
+            if fast_index is not None:
+                fast_index[each_key] = count
+            count += 1
+            slots[position] = count
+        self.count = count
+
+        missing_bytes = (self.count + 7) // 8 - len(self.voted)
+        if missing_bytes > 0:
+            self.voted.extend(bytes(missing_bytes))
+
+    def lookup(self , key_bytes : bytes) -> int | None:
+        """Returns the elector's index, or None if it isnt registered."""
+        if len(key_bytes) != ELECTOR_KEY_SIZE:
+            return None
+        key_bytes = bytes(key_bytes)
+        if self.fast_index is not None:
+            return self.fast_index.get(key_bytes)
+        return self.find_slot(key_bytes)[1]
+
+    def is_voted(self , elector_index : int) -> bool:
+        return (self.voted[elector_index >> 3] >> (elector_index & 7)) & 1 == 1
+
+    def set_voted(self , elector_index : int , vote_status : bool) -> None:
+        if self.is_voted(elector_index) == vote_status:
+            return
+        self.voted[elector_index >> 3] ^= 1 << (elector_index & 7)
+        self.voted_count += 1 if vote_status else -1
+
+    def raw_keys(self) -> bytes:
+        """Every registered key concatenated in index order."""
+        return bytes(self.keys)
+
+    def copy(self) -> "ElectorRegistry":
+        new_registry = ElectorRegistry()
+        new_registry.keys = self.keys[:]
+        new_registry.slots = self.slots[:]
+        new_registry.fast_index = self.fast_index.copy() if self.fast_index is not None else None
+        new_registry.count = self.count
+        new_registry.voted = self.voted[:]
+        new_registry.voted_count = self.voted_count
+        return new_registry
+
+    def __contains__(self , key_bytes : bytes) -> bool:
+        return self.lookup(key_bytes) is not None
+
+    def __len__(self) -> int:
+        return self.count
@@ -0,0 +1,41 @@
+"""This module contains the incremental merkle accumulator used to hash the transactions in a block."""
+import hashlib
+import typing
+
+EMPTY_ROOT = hashlib.sha256(b"").hexdigest()
+
+def hash_pair(left : bytes , right : bytes) -> bytes:
+    return hashlib.sha256(left + right).digest()
+
+class MerkleAccumulator:
+    """Keeps the roots of the perfect subtrees built so far (like a binary counter) so a leaf can be
+    appended in O(1) amortized time and the root of all leaves calculated in O(log n)."""
+    peaks : typing.List[typing.Tuple[int , bytes]]
+    length : int
+
+    def __init__(self):
+        self.peaks = [] # (height , subtree_root) pairs, heights strictly decrease left to right.
+        self.length = 0
+
+    def append(self , leaf_hash : str) -> None:
+        """Adds a hex encoded leaf hash, merging any complete subtrees of equal height."""
+        node = bytes.fromhex(leaf_hash)
+        height = 0
+        while len(self.peaks) > 0 and self.peaks[-1][0] == height:
+            _ , left = self.peaks.pop()
+            node = hash_pair(left , node)
+            height += 1
+        self.peaks.append((height , node))
+        self.length += 1
+
+    def root(self) -> str:
+        """Returns the hex encoded root, the peaks are folded right to left."""
+        if len(self.peaks) == 0:
+            return EMPTY_ROOT
+        node = self.peaks[-1][1]
+        for _ , each_peak in reversed(self.peaks[:-1]):
+            node = hash_pair(each_peak , node)
+        return node.hex()
+
+    def __len__(self) -> int:
+        return self.length
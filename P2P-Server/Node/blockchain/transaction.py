@@ -29,8 +29,8 @@ class Transaction:
         self.hash = self.calculate_hash()
         
     def calculate_hash(self) -> str:
-        data_to_hash = (str(self.operation) + str(self.data))
-        return hashlib.sha256(data_to_hash.encode()).hexdigest()
+        """Hashes the sorted json form so the hash is the same on every node after serialization."""
+        return hashlib.sha256(self.to_json().encode()).hexdigest()
 
     def serialize(self) -> dict:
         transaction_dict = {}
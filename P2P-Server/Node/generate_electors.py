@@ -1,4 +1,9 @@
-"""This is an independent python script used to generate an electors file for the given number of electors"""
+"""This is an independent python script used to generate an electors file for the given number of electors
+
+Run without arguments to be asked for the number of electors, which are written to electors.json. Pass --count to
+generate without any prompts, keys are generated on a process pool and written as they are made so the electorate
+never has to fit in memory.
+"""
 
 #standard lib imports
 import os
@@ -6,44 +11,83 @@ import sys
 import time
 import typing
 import json
-import random
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 
-# Cryptography imports
-from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import padding, rsa
-from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 import utilities.authentication as auth
 
-output_dict : dict[str , dict] = {}
-n = 1
-
-
-
-password = b"strong_password"
-
-def generate_elector(i):
-    each = {}
-    password = str(random.randint(1000 , 9999))
-    private_key , public_key = auth.generate_ecdsa_key_pair()
-    private_key_str = auth.compress_ecdsa_key(private_key)
-    public_key_str = auth.compress_ecdsa_key(public_key)
-    password_private_key = auth.compress_ecdsa_private_key_encrypted(private_key , password )
-
-    each["elector_id"] = public_key_str[:4].lower()
-    each["public_key"] = public_key_str
-    each["private_key"] = private_key_str
-
-    output_dict[i] = each
-
+GENERATION_CHUNK_SIZE = 2000 # electors generated by a worker at a time.
+PROGRESS_INTERVAL = 100000 # electors between each progress message.
+
+
+def generate_elector_chunk(count : int) -> typing.List[typing.Tuple[str , str]]:
+    """Generates count key pairs, returns the compressed public and private keys of each."""
+    key_pairs = []
+    for _ in range(0 , count):
+        private_key , public_key = auth.generate_ecdsa_key_pair()
+        key_pairs.append((auth.compress_ecdsa_key(public_key) , auth.compress_ecdsa_key(private_key)))
+    return key_pairs
+
+def iter_electors(count : int , workers : typing.Optional[int]) -> typing.Iterator[typing.Tuple[str , str]]:
+    """Yields the public and private keys of count electors, generated in chunks on a process pool."""
+    chunk_sizes = [GENERATION_CHUNK_SIZE] * (count // GENERATION_CHUNK_SIZE)
+    if count % GENERATION_CHUNK_SIZE:
+        chunk_sizes.append(count % GENERATION_CHUNK_SIZE)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for each_chunk in executor.map(generate_elector_chunk , chunk_sizes):
+            yield from each_chunk
+
+def roll_file_path(path : str) -> str:
+    """The roll is json lines, which iter_electors_file only reads from a .jsonl file, so the suffix is added if missing."""
+    return path if path.endswith(".jsonl") else path + ".jsonl"
+
+def write_electors(count : int , output_path : str , roll_path : typing.Optional[str] = None , workers : typing.Optional[int] = None) -> None:
+    """Writes count electors to output_path, and just their public keys to roll_path if given.
+
+    A .jsonl output has one elector object per line, any other output is the json object keyed by elector number that
+    load_all_electors also reads. The roll is always one public key per line, written to a .jsonl file."""
+    if roll_path is not None:
+        roll_path = roll_file_path(roll_path)
+    json_lines = output_path.endswith(".jsonl")
+    output_file = open(output_path , "w")
+    roll_file = open(roll_path , "w") if roll_path is not None else None
+    start_time = time.time()
+    try:
+        if json_lines == False:
+            output_file.write("{")
+        for i , (public_key_str , private_key_str) in enumerate(iter_electors(count , workers)):
+            elector = {
+                "elector_id" : public_key_str[:4].lower(),
+                "public_key" : public_key_str,
+                "private_key" : private_key_str,
+            }
+            if json_lines:
+                output_file.write(json.dumps(elector) + "\n")
+            else:
+                entry = json.dumps({str(i) : elector} , indent=4)[1:-2] # drop the braces around each entry.
+                output_file.write(("," if i > 0 else "") + entry)
+            if roll_file is not None:
+                roll_file.write(json.dumps(public_key_str) + "\n")
+            if (i + 1) % PROGRESS_INTERVAL == 0:
+                print(f"[Info] {i + 1} electors generated ({time.time() - start_time:.1f}s)")
+        if json_lines == False:
+            output_file.write("\n}")
+    finally:
+        output_file.close()
+        if roll_file is not None:
+            roll_file.close()
+    print(f"[Info] {count} electors written to {output_path} in {time.time() - start_time:.1f}s")
+    if roll_path is not None:
+        print(f"[Info] public keys written to {roll_path}")
 
 
 def override_message():
     print("[WARN] electors.txt already exists in current directory")
-    print("Do you wish to overide [Y/n]")   
+    print("Do you wish to overide [Y/n]")
     choice = input()
     choice = choice.strip()
     choice = choice.lower()
-    if choice != "y": 
+    if choice != "y":
         print("closing program...")
         time.sleep(1)
         sys.exit(0)
@@ -51,42 +95,60 @@ def override_message():
     choice = input()
     choice = choice.strip()
     choice = choice.lower()
-    if choice != "y": 
+    if choice != "y":
         print("closing program...")
         time.sleep(1)
         sys.exit(0)
 
-def get_file():
+def check_file():
     if os.path.exists("electors.json"):
         override_message()
     else:
         print("[Info] Electors.txt does not exist creating...")
 
-    
-    file = open("electors.json" , "w")
-    return file
-
-def main():
-
-    file = get_file()
+def interactive_main():
+    check_file()
 
     number = None
     while number is None or (str.isdigit(number) == False):
         print("Please enter number of electors to generate")
         number = input()
         number = number.strip()
-    
+
     n = int(number)
     print(f"Generating {n} electors")
 
-    for i in range(0 , n):
-        generate_elector(i)
-
-    json.dump(output_dict, file, indent=4)
-    file.close()
+    write_electors(n , "electors.json")
     print("Program completed.")
     input()
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generates a set of electors for testing, asks for the number of electors if --count isnt given.")
+    parser.add_argument("--count", type=int, default=None, help="Number of electors to generate, runs without any prompts")
+    parser.add_argument("--output", type=str, default="electors.jsonl", help="File the electors and their private keys are written to, .jsonl writes one elector per line (default: electors.jsonl)")
+    parser.add_argument("--roll", type=str, default=None, help="Also write just the public keys to this file, one per line, for the lead validator to load, .jsonl is added if missing (default: not written)")
+    parser.add_argument("--workers", type=int, default=None, help="Number of processes generating keys (default: one per cpu)")
+    parser.add_argument("--overwrite", type=int, choices=[0, 1], default=0, help="Replace the output files if they already exist (1 for True, 0 for False, default: 0)")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    if args.count is None:
+        interactive_main()
+        return
+
+    if args.count < 0:
+        print("[Error] --count cannot be negative")
+        sys.exit(1)
+    if args.roll is not None:
+        args.roll = roll_file_path(args.roll)
+    for each_path in (args.output , args.roll):
+        if each_path is not None and os.path.exists(each_path) and args.overwrite == 0:
+            print(f"[Error] {each_path} already exists, pass --overwrite 1 to replace it")
+            sys.exit(1)
+
+    write_electors(args.count , args.output , args.roll , args.workers)
+
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -40,6 +40,7 @@ from ui.candidates_page import CandidatesPage
 from threads.server_thread import ServerThread
 from threads.terminal_thread import TerminalThread
 from threads.api_thread import APIServerThread
+import server.core.constants as CONSTANTS
 import asyncio
 import socket
 import argparse
@@ -221,6 +222,10 @@ def parse_args():
     parser.add_argument("--port", type=int, default=5000, help="Port number for the server (default: 5000)")
     parser.add_argument("--bootstrap", type=int, choices=[0, 1], default=0, help="Set as bootstrap node (1 for True, 0 for False, default: 0)")
     parser.add_argument("--node-id", type=str , default=None, help="Override for nodeid of the launched node.")
+    parser.add_argument("--crypto-mode", type=str, choices=["inline", "thread", "process"], default=CONSTANTS.CRYPTO_EXECUTOR_MODE, help="Where rsa signing and verification runs (default: thread)")
+    parser.add_argument("--block-store", type=str, default=CONSTANTS.BLOCK_STORE_DIRECTORY, help="Directory finalized blocks are kept in so the chain is reloaded on restart (default: not kept)")
+    parser.add_argument("--electors-file", type=str, default=CONSTANTS.ELECTORS_FILE, help="Elector roll loaded by the lead validator, a .jsonl file is read as one elector per line (default: electors.json)")
+    parser.add_argument("--legacy-framing", type=int, choices=[0, 1], default=0, help="Use the older '#' terminated message framing (1 for True, 0 for False, default: 0)")
     args = parser.parse_args()
     
     return args
@@ -228,6 +233,10 @@ def parse_args():
 if __name__ == "__main__":
    
     args = parse_args()
+    CONSTANTS.LEGACY_FRAMING = bool(args.legacy_framing)
+    CONSTANTS.CRYPTO_EXECUTOR_MODE = args.crypto_mode
+    CONSTANTS.BLOCK_STORE_DIRECTORY = args.block_store
+    CONSTANTS.ELECTORS_FILE = args.electors_file
     app = QApplication(sys.argv)
     main_window = MainApp(app)
     if args.terminal_mode == 0:
@@ -0,0 +1,92 @@
+"""
+This module contains the connection registry which stores the server's neighbor connections.
+
+Connections are indexed by (host , port), by node id and by writer so lookups, routing a direct message
+and the cleanup when a connection closes don't need to scan every connection.
+"""
+from __future__ import annotations  # Type checking
+
+# Standard library imports
+import asyncio
+import typing
+
+# Type checking imports
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from server.messaging.outbound_queue import OutboundQueue
+
+
+class Connection:
+    """A single neighbor connection."""
+    __slots__ = ("host" , "port" , "writer" , "node_id" , "outbound")
+    host : str
+    port : int
+    writer : asyncio.StreamWriter
+    node_id : str | None
+    outbound : OutboundQueue
+
+    def __init__(self , host : str , port : int , writer : asyncio.StreamWriter , node_id : str | None , outbound : OutboundQueue):
+        self.host = host
+        self.port = port
+        self.writer = writer
+        self.node_id = node_id
+        self.outbound = outbound
+
+    def address(self) -> typing.Tuple[str , int]:
+        return (self.host , self.port)
+
+
+class ConnectionRegistry:
+    by_address : typing.Dict[typing.Tuple[str , int] , Connection]
+    by_node_id : typing.Dict[str , Connection]
+    by_writer : typing.Dict[asyncio.StreamWriter , Connection]
+    """Indexes of the current connections, by_writer holds every connection in the order they were added."""
+    def __init__(self):
+        self.by_address = {}
+        self.by_node_id = {}
+        self.by_writer = {}
+
+    def add(self , connection : Connection) -> None:
+        """Adds the connection, it replaces any other connection in the address and node id indexes."""
+        self.by_writer[connection.writer] = connection
+        self.by_address[connection.address()] = connection
+        if connection.node_id is not None:
+            self.by_node_id[connection.node_id] = connection
+
+    def remove(self , connection : Connection) -> None:
+        """Removes the connection from every index, safe to call more than once."""
+        if self.by_writer.get(connection.writer) is connection:
+            del self.by_writer[connection.writer]
+        if self.by_address.get(connection.address()) is connection:
+            del self.by_address[connection.address()]
+        if connection.node_id is not None and self.by_node_id.get(connection.node_id) is connection:
+            del self.by_node_id[connection.node_id]
+
+    def set_node_id(self , connection : Connection , node_id : str) -> None:
+        if connection.node_id is not None and self.by_node_id.get(connection.node_id) is connection:
+            del self.by_node_id[connection.node_id]
+        connection.node_id = node_id
+        self.by_node_id[node_id] = connection
+
+    def get_by_address(self , host : str , port : int) -> Connection | None:
+        return self.by_address.get((host , port))
+
+    def get_by_node_id(self , node_id : str) -> Connection | None:
+        return self.by_node_id.get(node_id)
+
+    def get_by_writer(self , writer : asyncio.StreamWriter) -> Connection | None:
+        return self.by_writer.get(writer)
+
+    def all(self) -> typing.List[Connection]:
+        """Returns a list of the connections, safe to keep while connections are added or removed."""
+        return list(self.by_writer.values())
+
+    def __contains__(self , address : typing.Tuple[str , int]) -> bool:
+        return address in self.by_address
+
+    def __iter__(self) -> typing.Iterator[Connection]:
+        return iter(self.all())
+
+    def __len__(self) -> int:
+        return len(self.by_writer)
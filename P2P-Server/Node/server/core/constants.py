@@ -27,6 +27,13 @@ class MESSAGE_CODES(Enum):
     PROPOSAL = 99
     REQUEST_FULL_BLOCKCHAIN = 100
     SEND_FULL_BLOCKCHAIN = 101
+    REQUEST_BLOCKS = 102
+    SEND_BLOCKS = 103
+    REQUEST_CHECKPOINT = 104
+    SEND_CHECKPOINT = 105
+    PLUMTREE_IHAVE = 110
+    PLUMTREE_GRAFT = 111
+    PLUMTREE_PRUNE = 112
     HEARTBEAT = 210
     VOTE = 201
 
@@ -38,6 +45,7 @@ SNAPSHOT_OPERATIONS = [
     "ADD_CANDIDATE",
     "ADD_VOTE",
     "ADD_ELECTOR",
+    "ADD_ELECTORS",
 ]
 
 VERIFCATION_EXEMPT_CODES = [
@@ -58,6 +66,58 @@ BLOCK_TIMEOUT = BLOCK_PERIOD * 3
 
 MIN_CONNECTIONS = 3
 MAX_CONNECTIONS = 10
+TEMP_CONNECTION_TIMEOUT = 5 # seconds a temp connection is kept open after it was last used.
+
+MAX_FRAME_SIZE = 256 * 1024 * 1024 # largest single message accepted, full blockchain transfers can be large.
+LEGACY_FRAMING = False # if true messages are "#" terminated instead of length prefixed.
+
+MESSAGE_ID_WINDOW = 300 # seconds a processed message id is remembered, older messages are rejected.
+MESSAGE_ID_CACHE_SIZE = 500000 # max number of processed message ids remembered.
+MAX_CLOCK_SKEW = 30 # seconds allowed between a message timestamp and the local clock.
+
+PUBLIC_KEY_CACHE_SIZE = 1024 # number of loaded peer public keys kept in memory.
+
+CRYPTO_EXECUTOR_MODE = "thread" # where rsa signing and verification runs, "inline", "thread" or "process".
+CRYPTO_MAX_WORKERS = None # None uses the executor default.
+CRYPTO_BATCH_SIZE = 32 # max number of jobs sent to a worker at once.
+
+VOTE_BATCH_WINDOW = 0.05 # seconds the lead validator collects received votes before checking them as a batch.
+VOTE_BATCH_SIZE = 512 # a batch is checked straight away once this many votes are waiting.
+BLOCK_VALIDATION_CACHE_SIZE = 200000 # number of verified transaction hashes remembered so they aren't verified twice.
+
+ELECTORS_FILE = "electors.json" # elector roll loaded by the lead validator, a .jsonl file is read as one elector per line.
+ELECTOR_BATCH_SIZE = 4096 # electors registered by each ADD_ELECTORS transaction.
+MAX_ELECTORS_PER_BLOCK = 65536 # electors registered in one block, the rest of the roll waits for the next block.
+
+BLOCK_STORE_DIRECTORY = None # if set finalized blocks are kept on disk in this directory and reloaded on restart.
+BLOCK_STORE_SYNC_BATCH = 16 # number of blocks appended to the block store between each fsync.
+
+BLOCK_SYNC_CHUNK_SIZE = 64 # max number of blocks sent in one SEND_BLOCKS message.
+BLOCK_SYNC_CHUNK_BYTES = 4 * 1024 * 1024 # SEND_BLOCKS messages stop adding blocks after this many bytes.
+BLOCK_SYNC_TIMEOUT = 10 # seconds to wait for a requested chunk before asking again from the same height.
+BLOCK_SYNC_MAX_RETRIES = 5
+CHECKPOINT_INTERVAL = 100 # blocks between each checkpoint a joining validator can start from instead of the first block, 0 disables them.
+
+MAX_ROUTE_HOPS = 16 # routes longer than this are ignored, this also stops routing loops counting up forever.
+ROUTE_EXPIRY = 10 # seconds a learned route is kept without being advertised again.
+
+TTL_SAFETY_MARGIN = 1 # extra hops added to the ttl on top of the distance to the furthest known node.
+BROADCAST_MODE = "plumtree" # how blocks are spread, "plumtree" pushes along a spanning tree and "flood" uses ttl broadcasts.
+PLUMTREE_IHAVE_INTERVAL = 0.2 # seconds message ids are batched before an IHAVE is sent to lazy neighbors.
+PLUMTREE_GRAFT_TIMEOUT = 1 # seconds to wait for an announced message before asking the announcing neighbor for it.
+PLUMTREE_CACHE_SIZE = 1024 # number of recent messages kept to answer GRAFT messages.
+MAX_HELD_BLOCKS = 64 # blocks that arrived before the block they follow are held until it arrives, up to this many.
+
+LOG_FLUSH_INTERVAL = 0.5 # seconds log lines are collected before they are written to the log file together.
+LOG_MAX_BYTES = 10 * 1024 * 1024 # a log file is rotated once it reaches this size.
+LOG_BACKUP_COUNT = 3 # number of rotated log files kept.
+LOG_CACHE_SIZE = 1000 # most recent log lines kept in memory for the log command.
+STRUCTURED_LOG_EVENTS = True # if true LOG_EVENTS entries are also written to a json lines events file next to the log.
+
+NETWORK_DISTANCE_WINDOW = 60 # seconds a measured distance to a node is kept without a new ttl message from it.
+
+OUTBOUND_QUEUE_SIZE = 1024 # max number of frames waiting to be written to a single peer.
+OUTBOUND_OVERFLOW_POLICY = "drop" # what happens when a peer's queue is full, "drop" the frame or "disconnect" the peer.
 
 HANSHAKE_PUBLIC_KEY = """-----BEGIN PUBLIC KEY-----
 MIIBIjANBgkqhkiG9w0BAQEFAAOCAQ8AMIIBCgKCAQEArDFOGOMPsUoarYCQjhi4
@@ -0,0 +1,185 @@
+"""
+This module contains the crypto executor, the node's rsa signing and the verification of received messages goes through it.
+
+Elector vote signatures (ed25519) are verified through it as well so large batches of votes are spread across the workers.
+The executor can run jobs inline on the event loop, on a thread pool or on a process pool.
+Jobs submitted during the same event loop iteration are sent to the pool as one batch to amortize the hand-off cost.
+"""
+from __future__ import annotations  # Type checking
+
+# Standard library imports
+import asyncio
+import concurrent.futures
+import multiprocessing
+import typing
+
+# Type checking imports
+from typing import TYPE_CHECKING
+
+# Local imports
+import utilities.authentication as authentication
+from utilities.key_cache import PublicKeyCache
+
+if TYPE_CHECKING:
+    from cryptography.hazmat.primitives.asymmetric.rsa import RSAPrivateKey, RSAPublicKey
+
+CRYPTO_MODES = ("inline" , "thread" , "process")
+
+# A job is (operation , public_key , message_str , signature), public_key is unused for "sign" jobs
+# and is the compressed elector public key for "verify_vote" jobs.
+CryptoJob = typing.Tuple[str , typing.Any , str , typing.Optional[str]]
+
+# Worker process state, only set inside process pool workers by init_worker_process.
+worker_private_key : RSAPrivateKey | None = None
+worker_key_cache : PublicKeyCache | None = None
+
+
+def run_crypto_job(job : CryptoJob , private_key : RSAPrivateKey) -> str | bool:
+    operation , public_key , message_str , signature = job
+    if operation == "sign":
+        return authentication.generate_signature_str_rsa(private_key , message_str)
+    if operation == "verify_vote":
+        try:
+            elector_public_key = authentication.decompress_ecdsa_key(public_key , is_private=False)
+            return authentication.verify_signature_ecdsa(elector_public_key , message_str , signature)
+        except (ValueError , TypeError): # malformed key or signature.
+            return False
+    if public_key is None:
+        return False
+    return authentication.verify_signature_rsa_key(public_key , message_str , signature)
+
+def run_crypto_batch(jobs : typing.List[CryptoJob] , private_key : RSAPrivateKey) -> typing.List[str | bool]:
+    return [run_crypto_job(each_job , private_key) for each_job in jobs]
+
+def init_worker_process(private_key_pem : str , key_cache_size : int) -> None:
+    """Loads the node's private key once per worker process so it isn't sent with every job."""
+    global worker_private_key , worker_key_cache
+    worker_private_key = authentication.load_rsa_private_key(private_key_pem)
+    worker_key_cache = PublicKeyCache(key_cache_size)
+
+def run_crypto_batch_in_process(jobs : typing.List[CryptoJob]) -> typing.List[str | bool]:
+    """Process pool entry point, verify jobs carry a (node_id , public_key_pem) pair which is loaded through the worker's key cache."""
+    loaded_jobs = []
+    for operation , public_key , message_str , signature in jobs:
+        if operation == "verify":
+            node_id , public_key_pem = public_key
+            public_key = worker_key_cache.get(node_id , public_key_pem)
+        loaded_jobs.append((operation , public_key , message_str , signature))
+    return run_crypto_batch(loaded_jobs , worker_private_key)
+
+
+class CryptoExecutor:
+    mode : str
+    private_key : RSAPrivateKey
+    key_cache : PublicKeyCache
+    pending : typing.List[typing.Tuple[CryptoJob , asyncio.Future]]
+    in_flight : int
+    peak_queue_depth : int
+    jobs_completed : int
+    """Runs rsa signing and verification for a server in the configured mode, the queue depth is the number of jobs waiting or running."""
+    def __init__(self , private_key : RSAPrivateKey , key_cache : PublicKeyCache , mode : str = "thread" , max_workers : int | None = None , batch_size : int = 32):
+        if mode not in CRYPTO_MODES:
+            raise ValueError(f"{mode} is not a valid crypto executor mode, expected one of {CRYPTO_MODES}")
+        self.mode = mode
+        self.private_key = private_key
+        self.key_cache = key_cache
+        self.max_workers = max_workers
+        self.batch_size = max(1 , batch_size)
+
+        self.executor = None # created on first use so unused pools don't start workers.
+        self.pending = []
+        self.flush_handle = None
+        self.in_flight = 0
+        self.peak_queue_depth = 0
+        self.jobs_completed = 0
+
+    def queue_depth(self) -> int:
+        return len(self.pending) + self.in_flight
+
+    async def sign(self , message_str : str) -> str:
+        """Returns the base64 signature of message_str signed with the node's private key."""
+        return await self.submit(("sign" , None , message_str , None))
+
+    async def verify(self , node_id : str , public_key_pem : str , message_str : str , signature : str) -> bool:
+        """Verifies message_str was signed by the given node's public key."""
+        if self.mode == "process":
+            public_key = (node_id , public_key_pem)
+        else:
+            public_key = self.key_cache.get(node_id , public_key_pem)
+            if public_key is None:
+                return False
+        return await self.submit(("verify" , public_key , message_str , signature))
+
+    async def verify_vote(self , elector_public_key : str , message_str : str , signature : str) -> bool:
+        """Verifies message_str was signed by the compressed ed25519 elector public key."""
+        return await self.submit(("verify_vote" , elector_public_key , message_str , signature))
+
+    def submit(self , job : CryptoJob) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        if self.mode == "inline":
+            future.set_result(run_crypto_job(job , self.private_key))
+            self.jobs_completed += 1
+            return future
+
+        self.pending.append((job , future))
+        self.peak_queue_depth = max(self.peak_queue_depth , self.queue_depth())
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+        elif self.flush_handle is None:
+            self.flush_handle = loop.call_soon(self.flush)
+        return future
+
+    def flush(self) -> None:
+        """Sends every pending job to the pool as one batch."""
+        if self.flush_handle is not None:
+            self.flush_handle.cancel()
+            self.flush_handle = None
+        if len(self.pending) == 0:
+            return
+
+        batch = self.pending
+        self.pending = []
+        jobs = [each_job for each_job , _ in batch]
+        self.in_flight += len(batch)
+
+        loop = asyncio.get_running_loop()
+        if self.mode == "process":
+            work = loop.run_in_executor(self.get_executor() , run_crypto_batch_in_process , jobs)
+        else:
+            work = loop.run_in_executor(self.get_executor() , run_crypto_batch , jobs , self.private_key)
+        work.add_done_callback(lambda done : self.batch_done(batch , done))
+
+    def batch_done(self , batch : typing.List[typing.Tuple[CryptoJob , asyncio.Future]] , done : asyncio.Future) -> None:
+        self.in_flight -= len(batch)
+        self.jobs_completed += len(batch)
+        exception = done.exception() if done.cancelled() == False else asyncio.CancelledError()
+        results = done.result() if exception is None else [None] * len(batch)
+
+        for (_ , each_future) , each_result in zip(batch , results):
+            if each_future.done():
+                continue
+            if exception is None:
+                each_future.set_result(each_result)
+            else:
+                each_future.set_exception(exception)
+
+    def get_executor(self) -> concurrent.futures.Executor:
+        if self.executor is None:
+            if self.mode == "process":
+                # spawn rather than fork, forking the server's multithreaded process can deadlock the workers.
+                self.executor = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=init_worker_process,
+                    initargs=(authentication.serialize_private_key(self.private_key) , self.key_cache.max_size),
+                )
+            else:
+                self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers , thread_name_prefix="crypto")
+        return self.executor
+
+    def shutdown(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown(wait=False , cancel_futures=True)
+            self.executor = None
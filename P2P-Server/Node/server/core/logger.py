@@ -1,71 +1,217 @@
+import atexit
+import collections
 import datetime
-import queue
-import copy
+import json
 import os
+import threading
+import time
 import traceback
 import sys
+import typing
 
 
 from testing.intergration.logevents import LOG_EVENTS
+import server.core.constants as CONSTANTS
 
 LoggingTags = {"error": "[ERROR]", "warn": "[WARN]", "info": "[INFO]" , "message" : "[TEXT-MESSAGE]"}
 
+class LogFile:
+    filename : str
+    """An appended log file that is rotated once it reaches LOG_MAX_BYTES."""
+    def __init__(self, filename:str):
+        self.filename = filename
+        self.file = open(self.filename, "a")
+        self.file_size = self.file.tell()
+
+    def write(self, text : str) -> None:
+        self.file.write(text)
+        self.file_size += len(text)
+
+    def flush(self) -> None:
+        self.file.flush()
+        if self.file_size >= CONSTANTS.LOG_MAX_BYTES:
+            self.rotate()
+
+    def rotate(self) -> None:
+        """Moves the log to filename.1, the older logs up one number, and starts a new log file."""
+        self.file.close()
+        for n in range(CONSTANTS.LOG_BACKUP_COUNT - 1, 0, -1):
+            older_file = f"{self.filename}.{n}"
+            if os.path.exists(older_file):
+                os.replace(older_file, f"{self.filename}.{n + 1}")
+        if CONSTANTS.LOG_BACKUP_COUNT > 0:
+            os.replace(self.filename, f"{self.filename}.1")
+        self.file = open(self.filename, "w")
+        self.file_size = 0
+
+    def close(self) -> None:
+        self.file.close()
+
 class Logger:
     debug_mode : bool
     filename : str
     printmode : bool
-    log_cache : queue.Queue
-    """Logger class used to store debug info to file and in some cases print to screen, will generate a log file."""
+    log_cache : typing.Deque[str]
+    pending_lines : typing.List[str]
+    pending_events : typing.List[str]
+    """Logger class used to store debug info to file and in some cases print to screen, will generate a log file.
+
+    Lines are written by a background thread, Log only formats the line and queues it. Queued lines are written in one
+    go every LOG_FLUSH_INTERVAL seconds and the file is rotated once it reaches LOG_MAX_BYTES.
+    Lines logged with event are also written to a json lines events file, each record has the LOG_EVENTS value, a
+    monotonic timestamp in nanoseconds and the event's params as their json types."""
     def __init__(self, filename:str, printmode:bool=True):
         os.makedirs("logs", exist_ok=True)  # Create 'logs' if it doesn't exist
         self.debug_mode = False
         self.filename = os.path.join("logs", filename)
+        self.events_filename = os.path.splitext(self.filename)[0] + "_events.jsonl"
         self.printmode = printmode
-        self.log_cache = queue.Queue()
+        self.log_cache = collections.deque(maxlen=CONSTANTS.LOG_CACHE_SIZE) # most recent lines for display_logs.
+
+        self.pending_lines = []
+        self.pending_events = []
+        self.condition = threading.Condition()
+        self.write_lock = threading.Lock() # held while writing or rotating the files.
+        self.closing = False
+        self.timestamp_cache = (None , "") # second , formatted timestamp
+
+        self.event_counts = collections.Counter() # LOG_EVENTS value : times logged, used by wait_for_event.
+        self.event_condition = threading.Condition()
+        self.event_waiters = 0
+
+        self.log_file = None
+        self.events_file = None
         try:
-            file = open(self.filename, "a")
-            file.write("\n----------RESTART----------\n")
-            file.close()
+            self.log_file = LogFile(self.filename)
+            self.log_file.write("\n----------RESTART----------\n")
+            self.log_file.flush()
+            if CONSTANTS.STRUCTURED_LOG_EVENTS:
+                self.events_file = LogFile(self.events_filename)
         except:
             print("[ERROR] logger failed writing to file")
             if self.debug_mode:
                 sys.exit(1)
-            
+
+        self.writer_thread = threading.Thread(target=self.writer_loop, name=f"logger {filename}", daemon=True)
+        self.writer_thread.start()
+        atexit.register(self.close)
+
+    def timestamp(self) -> str:
+        """The current time as written in log lines, only formatted again once a second."""
+        second = int(time.time())
+        cached_second , timestamp_text = self.timestamp_cache
+        if second != cached_second:
+            timestamp_text = datetime.datetime.fromtimestamp(second).strftime("%Y-%m-%d %H:%M:%S")
+            self.timestamp_cache = (second , timestamp_text)
+        return timestamp_text
 
     def Log(self, text : str, tag:str="info", PrintOveride:bool=False) -> None:
         """Logs the given input string, depending on associated tag may print aswell."""
-        if tag in LoggingTags == False:
-            print("[ERROR] {tag} is not a valid logging tag.")
-        try:
-            file = open(self.filename, "a")
-            timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            if (
-                (self.printmode and PrintOveride == True)
-                or PrintOveride
-                or tag == "error"
-                or tag == "message"
-                or tag == "warn"
-            ):
-                print(f"[{timestamp}] {LoggingTags[tag]} {text}")
-            self.log_cache.put(f"[{timestamp}] {LoggingTags[tag]} {text}")
-            file.write(f"[{timestamp}] {LoggingTags[tag]} {text}\n")
-            file.close()
+        if tag not in LoggingTags:
+            print(f"[ERROR] {tag} is not a valid logging tag.")
+            return
+        line = f"[{self.timestamp()}] {LoggingTags[tag]} {text}"
+        if (
+            (self.printmode and PrintOveride == True)
+            or PrintOveride
+            or tag == "error"
+            or tag == "message"
+            or tag == "warn"
+        ):
+            print(line)
+        self.log_cache.append(line)
+        self.queue(line , None)
 
-            if self.debug_mode:
-                sys.exit(1)
+        if self.debug_mode:
+            sys.exit(1)
 
-        except:
-            print("[ERROR] logger failed writing to file")
-            traceback.print_exc()
+    def event(self, log_event : LOG_EVENTS, *params : typing.Any, tag:str="info", PrintOveride:bool=False) -> None:
+        """Logs a LOG_EVENTS entry, the log line is written as "EVENT (param,param)" and a structured record is
+        written to the events file."""
+        monotonic_ns = time.monotonic_ns()
+        self.Log(f"{log_event.value} ({','.join(str(each_param) for each_param in params)})", tag, PrintOveride)
+        if self.events_file is not None:
+            record = {
+                "event" : log_event.value,
+                "t_ns" : monotonic_ns,
+                "time" : time.time(),
+                "tag" : tag,
+                "params" : params,
+            }
+            self.queue(None , json.dumps(record , default=str))
+
+        with self.event_condition:
+            self.event_counts[log_event.value] += 1
+            if self.event_waiters > 0:
+                self.event_condition.notify_all()
+
+    def wait_for_event(self, event_name : str, timeout : float, count:int=1) -> bool:
+        """Blocks until event_name has been logged count times since the logger started, returns False on timeout."""
+        with self.event_condition:
+            self.event_waiters += 1
+            try:
+                return self.event_condition.wait_for(lambda: self.event_counts[event_name] >= count, timeout)
+            finally:
+                self.event_waiters -= 1
+
+    def queue(self, line : str | None, event_record : str | None) -> None:
+        with self.condition:
+            was_empty = len(self.pending_lines) == 0 and len(self.pending_events) == 0
+            if line is not None:
+                self.pending_lines.append(line)
+            if event_record is not None:
+                self.pending_events.append(event_record)
+            if was_empty:
+                self.condition.notify() # the writer only waits while nothing is queued.
+
+    def writer_loop(self) -> None:
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.pending_lines or self.pending_events or self.closing)
+                if self.closing == False:
+                    # wait for more lines so they are written together, close wakes this early.
+                    self.condition.wait(CONSTANTS.LOG_FLUSH_INTERVAL)
+                closing = self.closing
+            self.flush()
+            if closing:
+                return
+
+    def flush(self) -> None:
+        """Writes every queued line and event to their files."""
+        with self.condition:
+            lines , self.pending_lines = self.pending_lines , []
+            event_records , self.pending_events = self.pending_events , []
+        with self.write_lock:
+            for each_file , each_lines in ((self.log_file , lines) , (self.events_file , event_records)):
+                if len(each_lines) == 0 or each_file is None:
+                    continue
+                try:
+                    each_file.write("\n".join(each_lines) + "\n")
+                    each_file.flush()
+                except:
+                    print("[ERROR] logger failed writing to file")
+                    traceback.print_exc()
+
+    def close(self) -> None:
+        """Writes any queued lines and stops the writer thread, called automatically on exit."""
+        with self.condition:
+            if self.closing:
+                return
+            self.closing = True
+            self.condition.notify()
+        self.writer_thread.join(timeout=5)
+        self.flush()
+        with self.write_lock:
+            for each_file in (self.log_file , self.events_file):
+                if each_file is not None:
+                    each_file.close()
+            self.log_file = None
+            self.events_file = None
 
     def display_logs(self, n:int=10) -> None:
         """Displays the most recent n entries in the log."""
         print("Logs".center(36, "-"))
-        log_copy = copy.copy(self.log_cache)
-        print(log_copy.qsize())
-        for i in range(1, n + 1):
-            if log_copy.empty():
-                return
-            item = log_copy.get()
+        print(len(self.log_cache))
+        for item in list(self.log_cache)[-n:]:
             print(item)
         print("-")
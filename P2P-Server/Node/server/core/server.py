@@ -24,18 +24,33 @@ from blockchain.block import Block
 from blockchain.transaction import Transaction
 from blockchain.blockchain import Blockchain
 from blockchain.blockchain_snapshot import Snapshot
+from blockchain.block_store import BlockStore
 from testing.intergration.logevents import LOG_EVENTS
 
 from server.core.logger import Logger
 from server.handlers.connection_handler import ConnectionHandler
 from server.messaging.message_actions import handle_message
 from server.messaging.message_proccessor import MessageProccessor
+from server.messaging.framing import encode_frame, read_frames, FrameTooLargeError
+from server.messaging.message_id_cache import MessageIdCache
+from server.messaging.outbound_queue import OutboundQueue
+from server.messaging.routing_table import RoutingTable
+from server.messaging.network_estimator import NetworkEstimator
+from server.messaging.plumtree import Plumtree
+from server.handlers.vote_ingestion import VoteIngestor
+from server.handlers.block_validation import BlockValidator
+from server.handlers.lead_failure_detector import LeadFailureDetector
+from server.core.connection_registry import Connection, ConnectionRegistry
 from server.handlers.discovery_handler import DiscoveryHandler, generate_discovered_nodes , generate_connected_peers, generate_global_nodes
 from server.handlers.new_block_processor import NewBlockProcessor
 from server.handlers.blockchain_operations import BlockchainOperations
+from server.handlers.block_sync import BlockSync
+from server.handlers.checkpoints import CheckpointManager
 from ui.ui_event_handler import UIEventHandler
 
 from utilities.enum_encoder import EnumEncoder
+from utilities.key_cache import PublicKeyCache
+from server.core.crypto_executor import CryptoExecutor
 
 # Server constants
 import server.core.constants as CONSTANTS
@@ -58,17 +73,27 @@ class Server:
     host : str
     port : int
     server : asyncio.base_events.Server | None
-    message_buffer : str
-    processed_messages : set
+    processed_messages : MessageIdCache
+    pending_verifications : typing.Dict[str , asyncio.Future]
     logger : Logger
     block_chain : Blockchain
+    block_store : BlockStore | None
     snapshot : Snapshot
     peer_connection_numbers : list
-    connections : list
+    connections : ConnectionRegistry
+    routing_table : RoutingTable
+    network_estimator : NetworkEstimator
+    plumtree : Plumtree
+    vote_ingestor : VoteIngestor
+    block_validator : BlockValidator
+    lead_failure_detector : LeadFailureDetector
     peer_directory : dict
+    public_key_cache : PublicKeyCache
+    crypto_executor : CryptoExecutor
     validator : bool
     lead_validator : bool
     temp_connections : dict
+    connection_tasks : set
     working_block : Block
     node_id : str
     global_node_table : dict
@@ -80,6 +105,8 @@ class Server:
     new_block_proccessor : NewBlockProcessor
     connection_handler : ConnectionHandler
     blockchain_operations : BlockchainOperations
+    block_sync : BlockSync
+    checkpoints : CheckpointManager
 
     node_private_key : authentication.RSAPublicKey
     node_public_key : authentication.RSAPrivateKey
@@ -91,8 +118,8 @@ class Server:
         self.host = host
         self.port = port
         self.server = None
-        self.message_buffer = ""
-        self.processed_messages = set()
+        self.processed_messages = MessageIdCache(CONSTANTS.MESSAGE_ID_WINDOW , CONSTANTS.MESSAGE_ID_CACHE_SIZE , CONSTANTS.MAX_CLOCK_SKEW)
+        self.pending_verifications = {} # message id : future set once the first copy's signature has been checked.
         self.server_events = server_events
 
         # Composite Classes.
@@ -101,17 +128,27 @@ class Server:
         self.new_block_proccessor = NewBlockProcessor(self)
         self.connection_handler = ConnectionHandler(self)
         self.blockchain_operations = BlockchainOperations(self)
+        self.block_sync = BlockSync(self)
+        self.checkpoints = CheckpointManager(self)
+        self.vote_ingestor = VoteIngestor(self)
+        self.block_validator = BlockValidator(self)
+        self.lead_failure_detector = LeadFailureDetector(self)
 
         self.logger = Logger(f"{host}_{port}_log.txt" , False)
 
         self.block_chain = program_state.get("blockchain")
+        self.block_store = None
         self.snapshot = Snapshot()
         self.validator_addresses = set()
 
         self.peer_connection_numbers = []
-        self.connections = [] #Only neighbors
+        self.connections = ConnectionRegistry() #Only neighbors
+        self.routing_table = RoutingTable(CONSTANTS.MAX_ROUTE_HOPS , CONSTANTS.ROUTE_EXPIRY)
+        self.network_estimator = NetworkEstimator(CONSTANTS.TTL_SAFETY_MARGIN , CONSTANTS.MAX_ROUTE_HOPS , CONSTANTS.NETWORK_DISTANCE_WINDOW)
+        self.plumtree = Plumtree(self)
         self.connection_status = {}
         self.peer_directory = {}
+        self.public_key_cache = PublicKeyCache(CONSTANTS.PUBLIC_KEY_CACHE_SIZE)
 
         self.initial_connection_target = None
 
@@ -122,10 +159,18 @@ class Server:
         self.lead_validator = False
 
         self.temp_connections = {}
+        self.connection_tasks = set()
 
         self.node_type = "Node"
         self.node_private_key , self.node_public_key = authentication.generate_rsa_key_pair()
         self.node_id = node_id or authentication.generate_node_id(self.node_public_key)
+        self.crypto_executor = CryptoExecutor(
+            self.node_private_key,
+            self.public_key_cache,
+            CONSTANTS.CRYPTO_EXECUTOR_MODE,
+            CONSTANTS.CRYPTO_MAX_WORKERS,
+            CONSTANTS.CRYPTO_BATCH_SIZE,
+        )
         self.server_events.sys_new_node_id.emit(self.node_id)
 
         self.elector_public_key = None
@@ -150,15 +195,25 @@ class Server:
 
     async def initial_setup(self : "Server" , bootstrap: bool = False , initial_connect: bool = False , initial_connection_host: str = None, initial_connection_port : int = None):
 
+        # reload the chain kept on disk, the snapshot is rebuilt from it so the network doesnt need to send it again.
+        restored = False
+        if CONSTANTS.BLOCK_STORE_DIRECTORY is not None:
+            block_store_path = os.path.join(CONSTANTS.BLOCK_STORE_DIRECTORY , f"{self.host}_{self.port}_blocks.dat")
+            self.block_store = BlockStore(block_store_path , CONSTANTS.BLOCK_STORE_SYNC_BATCH)
+            restored = self.blockchain_operations.load_stored_blockchain(self.block_store)
+            if restored == False:
+                self.block_chain.attach_block_store(self.block_store)
+
         # blockchain setup
-        genesisBlock = Block()
-        genesisBlock.set_previous_hash(0)
-        self.block_chain.add_genesis_block(genesisBlock)
-        self.block_chain.head = genesisBlock.hash
-        self.working_block = Block(genesisBlock.hash)
-        self.snapshot.blockchain_head = self.block_chain.head
-        # setup if the node is a bootstrap node
-        if bootstrap:
+        if restored == False:
+            genesisBlock = Block()
+            genesisBlock.set_previous_hash(0)
+            self.block_chain.add_genesis_block(genesisBlock)
+            self.block_chain.head = genesisBlock.hash
+            self.working_block = Block(genesisBlock.hash)
+            self.snapshot.blockchain_head = self.block_chain.head
+        # setup if the node is a bootstrap node, a restored chain already contains the bootstrap validator block.
+        if bootstrap and restored == False:
             validatorBlock = Block(self.block_chain.head)
 
             validatorTransaction = Transaction("ADD_VALIDATOR" , {
@@ -193,25 +248,20 @@ class Server:
             # if theyre not an acceptor but a sender the initial ip and port getting is handled in connect_to_peer
 
             # if connecting to network send the message to get list of validators
-            while True:
-
-                data = await reader.read(1024)
-                if not data:
-                    break
-                self.message_buffer += data.decode()
-
-                while "#" in self.message_buffer : # wait for a full message, wait for the "#" end char.
-                    full_message , self.message_buffer = self.message_buffer.split("#", 1)
-                    try:
-                        full_message = str.strip(full_message, "#")
-                        parsed_message = json.loads(full_message)
-                        self.logger.Log(f"{LOG_EVENTS.MESSAGE_RECIEVED.value} ({addr})" , "info")
-                        await handle_message(self , parsed_message , writer , acceptor)
-                    except json.JSONDecodeError as e:
-                        traceback.print_exc()
-                        self.logger.Log(f"Error Decoding Message: {full_message}" , "error" , False)
-                        return
-
+            async for full_message in read_frames(reader): # each connection reads its own frames.
+                try:
+                    parsed_message = json.loads(full_message)
+                    if addr in self.temp_connections:
+                        self.reset_temp_connection_timeout(addr)
+                    self.logger.event(LOG_EVENTS.MESSAGE_RECIEVED , addr)
+                    await handle_message(self , parsed_message , writer , acceptor , full_message)
+                except (json.JSONDecodeError , UnicodeDecodeError) as e:
+                    traceback.print_exc()
+                    self.logger.Log(f"Error Decoding Message: {full_message[:64]}" , "error" , False)
+                    return
+
+        except FrameTooLargeError as e:
+            self.logger.Log(f"Error with connection {addr} : {e}" , "error")
         except OSError as e:
             self.logger.Log(f"Error with connection {addr} : {e}, (OS Error)" , "error")
         except Exception as e:
@@ -227,56 +277,83 @@ class Server:
             except Exception as e:
                 self.logger.Log(f"Unexpected error during writer cleanup for {addr}: {e}", "error")
             finally:
-                # Safely remove the connection without modifying list during iteration
-                self.connections = [conn for conn in self.connections if conn.get("writer") != writer]
+                self.remove_connection(writer)
                 self.logger.Log(f"Connection with {addr} closed.", "info")
 
+    def start_connection_task(self , reader : asyncio.StreamReader , writer : asyncio.StreamWriter) -> None:
+        """Starts reading an outgoing connection, the task is referenced until it finishes
+        so it isn't garbage collected before the connection is registered."""
+        task = asyncio.create_task(self.handle_connection(reader , writer , False))
+        self.connection_tasks.add(task)
+        task.add_done_callback(self.connection_tasks.discard)
+
+    def add_connection(self , host : str , port : int , writer : asyncio.StreamWriter , node_id : str | None) -> Connection:
+        """Adds a neighbor connection, each connection gets its own outbound queue and writer task."""
+        def log_outbound_error(error : str) -> None:
+            self.logger.Log(f"Connection {host}:{port} {error}" , "warn")
+
+        outbound = OutboundQueue(writer , CONSTANTS.OUTBOUND_QUEUE_SIZE , CONSTANTS.OUTBOUND_OVERFLOW_POLICY , log_outbound_error)
+        connection = Connection(host , port , writer , node_id , outbound)
+        self.connections.add(connection)
+        self.server_events.net_connections_changed.emit(self.connections.all())
+        return connection
+
+    def remove_connection(self , writer : asyncio.StreamWriter) -> None:
+        """Removes the connection using writer and stops its writer task, safe to call more than once."""
+        connection = self.connections.get_by_writer(writer)
+        if connection is None:
+            return
+        connection.outbound.close()
+        self.connections.remove(connection)
+        if connection.node_id is not None:
+            self.routing_table.remove_neighbor(connection.node_id)
+            self.plumtree.remove_neighbor(connection.node_id)
+        self.server_events.net_connections_changed.emit(self.connections.all())
+
     def is_connected(self , addr):
         local_addr = self.server.sockets[0].getsockname()  
         if local_addr == addr:
             return True
-        for eachConnection in self.connections:
-            if (eachConnection.get('host') , eachConnection.get('port')) == addr:
-                return True
-        return False
+        return tuple(addr) in self.connections
 
     def set_proposal_time(self , new_value):
         CONSTANTS.BLOCK_PERIOD = new_value
 
-    async def temp_connections_loop(self):
-        # loop through temp connections if they have been open too long close
-        prev_time = asyncio.get_event_loop().time()
-        while True:
-            await asyncio.sleep(0.1)
-            current_time = asyncio.get_event_loop().time()
-            delta_time = current_time - prev_time
-            prev_time = current_time
-
-            for addr , connection in self.temp_connections.copy().items():
-                connection["time_idle"] = (connection.get("time_idle") or 0) + delta_time
+    def reset_temp_connection_timeout(self , addr : tuple) -> None:
+        """Moves back the time a temp connection is closed at, called when the connection is used."""
+        connection = self.temp_connections.get(addr)
+        if connection is None:
+            return
+        if connection.get("timeout_handle") is not None:
+            connection["timeout_handle"].cancel()
+        connection["timeout_handle"] = asyncio.get_running_loop().call_later(
+            CONSTANTS.TEMP_CONNECTION_TIMEOUT , self.temp_connection_timed_out , addr
+        )
 
-                if connection.get("time_idle") > 5:
-                    self.logger.Log(f"Connection closing with {addr[0] , addr[1]}, timeout" , "warn")
-                    await self.close_temp_connection(connection.get("host") , connection.get("port"))
+    def temp_connection_timed_out(self , addr : tuple) -> None:
+        self.logger.Log(f"Connection closing with {addr[0] , addr[1]}, timeout" , "warn")
+        task = asyncio.create_task(self.close_temp_connection(addr[0] , addr[1]))
+        self.connection_tasks.add(task)
+        task.add_done_callback(self.connection_tasks.discard)
 
     async def after_disconnect(self):
         pass
 
     async def close_temp_connection(self , address , port):
-        for addr , each_connection in self.temp_connections.items():
-            if each_connection.get("host") == address and each_connection.get("port") == port:
-                writer = each_connection.get("writer")
-                try:
-                    writer.close()
-                    await writer.wait_closed()  # Ensure connection is fully closed
-                    self.logger.Log(f"Closed temp connection with {address}:{port}", "info")
-                except Exception as e:
-                    self.logger.Log(f"Error closing temp connection with {address}:{port}: {e}", "error")
-                finally:
-                    self.temp_connections.pop((address, port), None)
-                return
+        each_connection = self.temp_connections.pop((address, port), None)
+        if each_connection is None:
+            self.logger.Log(f"No active connection found to close for {address}:{port}", "warn")
+            return
 
-        self.logger.Log(f"No active connection found to close for {address}:{port}", "warn")
+        if each_connection.get("timeout_handle") is not None:
+            each_connection["timeout_handle"].cancel()
+        writer = each_connection.get("writer")
+        try:
+            writer.close()
+            await writer.wait_closed()  # Ensure connection is fully closed
+            self.logger.Log(f"Closed temp connection with {address}:{port}", "info")
+        except Exception as e:
+            self.logger.Log(f"Error closing temp connection with {address}:{port}: {e}", "error")
 
     async def set_up_temp_connection(self , peer_host , peer_port):
         # this should be used to connect to known nodes only and for short amounts of time or for private data.
@@ -287,13 +364,14 @@ class Server:
             assert (peer_host != self.host) or (peer_port != self.port)
             reader, writer = await asyncio.open_connection(peer_host, peer_port)
 
-            asyncio.create_task(self.handle_connection(reader, writer , False))
+            self.start_connection_task(reader , writer)
             self.temp_connections[(peer_host, peer_port)] = {
-                "time_idle": 0,
+                "timeout_handle": None,
                 "writer": writer,
                 "port" : peer_port,
                 "host" : peer_host
             }
+            self.reset_temp_connection_timeout((peer_host, peer_port))
         except ConnectionRefusedError as e:
             self.logger.Log(f"Failed to connect to peer {peer_host}:{peer_port}: refused connection" , "error")
         except Exception as e:
@@ -305,7 +383,6 @@ class Server:
         addr = self.server.sockets[0].getsockname()
 
         asyncio.create_task(self.discovery_handler.discovery_gossip_loop())
-        asyncio.create_task(self.temp_connections_loop())
 
         if self.initial_connection_target is not None:
             
@@ -313,7 +390,7 @@ class Server:
                 self.initial_connection_try()
             )
 
-        self.logger.Log(f"{LOG_EVENTS.SERVER_STARTED.value} ({self.host},{self.port})")
+        self.logger.event(LOG_EVENTS.SERVER_STARTED , self.host , self.port)
         self.server_events.net_server_started.emit()
         async with self.server:
             await self.server.serve_forever()
@@ -325,43 +402,38 @@ class Server:
         )
 
     async def close_connection(self, host: str, port: str) -> None:
-        for each_connection in self.connections.copy():
-            if each_connection.get("host") == host and each_connection.get("port") == port:
-                writer = each_connection.get("writer")
-
-                if writer:  # Ensure writer exists before closing
-                    try:
-                        writer.close()
-                        await writer.wait_closed()  # Ensure connection is fully closed
-                        self.logger.Log(f"Closed connection with {host}:{port}", "info")
-                    except Exception as e:
-                        self.logger.Log(f"Error closing connection with {host}:{port}: {e}", "error")
+        connection = self.connections.get_by_address(host , port)
+        if connection is None:
+            self.logger.Log(f"No active connection found to close for {host}:{port}", "warn")
+            return
 
-                # Remove from connections safely
-                self.connections = [conn for conn in self.connections if conn != each_connection]
+        writer = connection.writer
+        try:
+            writer.close()
+            await writer.wait_closed()  # Ensure connection is fully closed
+            self.logger.Log(f"Closed connection with {host}:{port}", "info")
+        except Exception as e:
+            self.logger.Log(f"Error closing connection with {host}:{port}: {e}", "error")
 
-                # Remove from connection status
-                self.connection_status.pop((host, port), None)
+        self.remove_connection(writer)
 
-        self.logger.Log(f"No active connection found to close for {host}:{port}", "warn")
+        # Remove from connection status
+        self.connection_status.pop((host, port), None)
 
     async def disconnect_from_all(self):
         """Disconnects the node from all connected peers."""
-        connections_copy = self.connections.copy()  # Create a copy to avoid modification issues
+        for each_connection in self.connections.all():
+            host, port = each_connection.host, each_connection.port
+            writer = each_connection.writer
 
-        for each_connection in connections_copy:
-            host, port = each_connection.get("host"), each_connection.get("port")
-            writer = each_connection.get("writer")
-
-            if writer:
-                try:
-                    writer.close()
-                    await writer.wait_closed() 
-                    self.logger.Log(f"Closed connection with {host}:{port}", "info")
-                except Exception as e:
-                    self.logger.Log(f"Error closing connection with {host}:{port}: {e}", "error")
+            try:
+                writer.close()
+                await writer.wait_closed() 
+                self.logger.Log(f"Closed connection with {host}:{port}", "info")
+            except Exception as e:
+                self.logger.Log(f"Error closing connection with {host}:{port}: {e}", "error")
 
-            self.connections = [conn for conn in self.connections if conn != each_connection]
+            self.remove_connection(writer)
             self.connection_status.pop((host, port), None)
 
         # Clear temporary connections
@@ -369,6 +441,8 @@ class Server:
         for addr in temp_connections_copy:
             each_connection = self.temp_connections.get(addr)
             if each_connection:
+                if each_connection.get("timeout_handle") is not None:
+                    each_connection["timeout_handle"].cancel()
                 writer = each_connection.get("writer")
                 if writer:
                     try:
@@ -394,7 +468,7 @@ class Server:
             assert (peer_host != self.host) or (peer_port != self.port)
             reader, writer = await asyncio.open_connection(peer_host, peer_port)
 
-            asyncio.create_task(self.handle_connection(reader, writer, False))
+            self.start_connection_task(reader , writer)
 
             # Construct message data
             message_data = {
@@ -432,12 +506,12 @@ class Server:
             # Sign the message if it's not a validator connection
             if is_initial == False:
                 data_to_sign = json.dumps(initial_join_message , sort_keys=True , cls=EnumEncoder)
-                signature = authentication.generate_signature_str_rsa(self.node_private_key, data_to_sign)
+                signature = await self.crypto_executor.sign(data_to_sign)
                 initial_join_message["signature"] = signature
 
             # Send the message
-            initial_join_message_str = json.dumps(initial_join_message , sort_keys=True , cls=EnumEncoder) + "#"
-            writer.write(initial_join_message_str.encode())
+            initial_join_message_str = json.dumps(initial_join_message , sort_keys=True , cls=EnumEncoder)
+            writer.write(encode_frame(initial_join_message_str))
             await writer.drain()
 
             self.logger.Log(f"Initial listener message sent to {writer.get_extra_info('peername')}", "info")
@@ -513,23 +587,22 @@ class Server:
                 choice_addresses = []
 
                 for i in range(0 , 3):
-                    choice_connection = None
                     if self.validator:
-                        choice_connection = random.choice(list(self.global_node_table.values()))
+                        choice_node = random.choice(list(self.global_node_table.values()))
+                        choice_host , choice_port = choice_node.get("host") , choice_node.get("port")
                     else:
-                        choice_connection = random.choice(self.connections)
+                        choice_connection = random.choice(self.connections.all())
+                        choice_host , choice_port = choice_connection.host , choice_connection.port
 
-                    choice_host = choice_connection.get("host")
-                    choice_port = choice_connection.get("port")
                     choice_addresses.append({
                         "host" : choice_host,
                         "port" : choice_port
                     })
 
                 error_response["data"]["suggested"] = choice_addresses
-                error_response_str = json.dumps(error_response) + "#"
+                error_response_str = json.dumps(error_response)
 
-                writer.write(error_response_str.encode())
+                writer.write(encode_frame(error_response_str))
                 await writer.drain()
                 self.logger.Log(
                     f"Connection refused: Max connections reached for {addr}", "warn"
@@ -547,10 +620,7 @@ class Server:
 
                 # Add new connection if not already connected
                 if not self.is_connected((peer_host, peer_port)):
-                    self.connections.append(
-                    {"host": peer_host, "port": peer_port, "writer": writer, "node_id": node_id}
-                    )
-                    self.server_events.net_connections_changed.emit(self.connections.copy())
+                    self.add_connection(peer_host , peer_port , writer , node_id)
                 
 
                 # Send request accepted response with network state
@@ -582,8 +652,7 @@ class Server:
         peer_port_str = data.get("port" , 0)
         peer_port = int(peer_port_str) 
 
-        self.connections.append({"host": peer_host, "port": peer_port, "writer": writer, "node_id": sender_id})
-        self.server_events.net_connections_changed.emit(self.connections.copy())
+        connection = self.add_connection(peer_host , peer_port , writer , sender_id)
         self.connection_status[(peer_host, peer_port)] = "open"
 
         public_key = data.get("public_key")
@@ -594,9 +663,7 @@ class Server:
             self.logger.Log("error handling join request, missing connections or nodes." , "error")
             return
 
-        for eachConnection in self.connections: # this is messy maybe should use a dict to store connections
-            if eachConnection.get("host") == peer_host and eachConnection.get("port") == peer_port:
-                eachConnection["node_id"] = sender_id # <- not really needed
+        self.connections.set_node_id(connection , sender_id) # <- not really needed
 
         if self.peer_directory.get(sender_id) is None:
             self.peer_directory[sender_id] = {
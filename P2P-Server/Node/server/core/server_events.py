@@ -62,7 +62,7 @@ class ServerEvents(QObject):
     """Passed Parameters : block_hash_containing_transaction : str | Signal fired when the node's is detected in the blockchain state."""
 
     blc_new_vote_added : pyqtSignal = pyqtSignal(object)
-    """Passed Parameters : vote_tally : dict"""
+    """Passed Parameters : vote_tally : Mapping | Signal fired once for each block containing votes, the tally is a read only view."""
 
     blc_candidate_added : pyqtSignal = pyqtSignal(str , int)
     """Passed Parameters : new_candidate_name : str , new_candidate_id : int | Signal fired when a candidate is added to the local blockchain."""
@@ -82,7 +82,11 @@ class ServerEvents(QObject):
     blc_became_validator : pyqtSignal = pyqtSignal()
 
     blc_blockchain_updated : pyqtSignal = pyqtSignal(object)
-    """Passed Parameters: new_serialized_blockchain : dict | Singal fired when there is a change to the local blockchain."""
+    """Passed Parameters: update : dict | Singal fired when there is a change to the local blockchain, update has the new "head" and "height".
+    The new blocks are sent by blc_block_added, use blc_blockchain_page for blocks from before."""
+
+    blc_blockchain_page : pyqtSignal = pyqtSignal(object)
+    """Passed Parameters: page : dict | Signal fired in reply to UIEvents.request_blockchain_page, see Blockchain.serialize_page."""
 
     blc_request_block : pyqtSignal = pyqtSignal()
     blc_request_full_blockchain : pyqtSignal = pyqtSignal()
@@ -0,0 +1,349 @@
+"""
+This module contains the ranged blockchain sync used when a node needs the chain from another node.
+
+Blocks are requested by height in chunks, each chunk is applied through parse_block as it arrives so the whole
+chain is never held as a single message. Progress is kept between chunks so a dropped connection only costs the
+chunk in flight, the request is repeated from the same height when it times out.
+If the target has a checkpoint past the local chain, the checkpoint's snapshot is requested in chunks instead, checked
+against the hash in the checkpoint block and loaded, then only the blocks after the checkpoint are synced.
+"""
+from __future__ import annotations  # Type checking
+
+# Standard library imports
+import asyncio
+import json
+import typing
+
+# Type checking imports
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from server.core.server import Server
+
+# Blockchain modules
+from blockchain.block import load_from_dict as load_block_from_dict
+from server.handlers.checkpoints import verify_checkpoint
+
+# Server constants
+import server.core.constants as CONSTANTS
+from server.core.constants import MESSAGE_CODES
+from server.core.logger import LOG_EVENTS
+
+
+class BlockSync:
+    server : Server
+    target_node_id : str | None
+    next_height : int
+    retries : int
+    checkpoint_transfer : dict | None
+    """Requests the blockchain from a target node in height ranges, and answers the range requests of other nodes."""
+    def __init__(self , server : Server):
+        self.server = server
+        self.active = False
+        self.target_node_id = None
+        self.next_height = 0
+        self.retries = 0
+        self.resets = 0
+        self.timeout_handle = None
+        self.checkpoint_transfer = None # the checkpoint being received, None while blocks are being requested.
+        self.checkpoint_allowed = False
+        self.known_validators = set()
+
+    # requester side
+
+    async def start(self , target_node_id : str) -> None:
+        """Syncs the local blockchain with the target node's, the local chain is kept if it is a prefix of the target's."""
+        self.active = True
+        self.target_node_id = target_node_id
+        self.retries = 0
+        self.resets = 0
+        self.checkpoint_transfer = None
+        self.checkpoint_allowed = True # only the first reply can move the sync to a checkpoint.
+        # a checkpoint has to be signed by one of these, the reset snapshot and the target's replies can't vouch for it.
+        self.known_validators = set(self.server.snapshot.get_validators())
+        self.next_height = self.server.block_chain.height()
+        self.server.blockchain_operations.set_blockchain_lock(True)
+        self.server.logger.event(LOG_EVENTS.BLOCK_SYNC_STARTED , target_node_id , self.next_height)
+        await self.request_next_chunk()
+
+    async def request_next_chunk(self) -> None:
+        if self.checkpoint_transfer is not None:
+            await self.request_checkpoint_chunk()
+            return
+        previous_block = self.server.block_chain.block_at(self.next_height - 1)
+        previous_hash = previous_block.hash if previous_block is not None else None
+        request = {
+            "code" : MESSAGE_CODES.REQUEST_BLOCKS.value,
+            "data" : {
+                "start_height" : self.next_height,
+                "previous_hash" : previous_hash,
+                "max_blocks" : CONSTANTS.BLOCK_SYNC_CHUNK_SIZE,
+                "host" : self.server.host,
+                "port" : self.server.port,
+            }
+        }
+        await self.send_request(request)
+
+    async def send_request(self , request : dict) -> None:
+        self.restart_timeout()
+        message_proccessor = self.server.message_proccessor
+        # the first try goes straight to the target, retries follow the routing table in case a direct connection can't be
+        # made. Requests are never flooded, if the target can't be reached the request times out and is tried again.
+        sent = False
+        if self.retries > 0:
+            sent = await message_proccessor.ttl_broadcast(dict(request) , target_node_id=self.target_node_id , flood=False)
+        if sent == False:
+            sent = await message_proccessor.send_to_node(self.target_node_id , request , flood=False)
+        if sent == False:
+            self.server.logger.Log(f"No route to {self.target_node_id} for a block sync request" , "warn")
+
+    def restart_timeout(self) -> None:
+        self.cancel_timeout()
+        loop = asyncio.get_running_loop()
+        self.timeout_handle = loop.call_later(CONSTANTS.BLOCK_SYNC_TIMEOUT , self.request_timed_out)
+
+    def cancel_timeout(self) -> None:
+        if self.timeout_handle is not None:
+            self.timeout_handle.cancel()
+            self.timeout_handle = None
+
+    def request_timed_out(self) -> None:
+        self.timeout_handle = None
+        if self.active == False:
+            return
+        self.retries += 1
+        if self.retries > CONSTANTS.BLOCK_SYNC_MAX_RETRIES:
+            self.server.logger.event(LOG_EVENTS.BLOCK_SYNC_FAILED , self.target_node_id , self.next_height , tag="error")
+            self.finish()
+            return
+        if self.checkpoint_transfer is not None:
+            self.server.logger.Log(f"Checkpoint request timed out, resuming from chunk {len(self.checkpoint_transfer['chunks'])}" , "warn")
+        else:
+            self.server.logger.Log(f"Block sync request timed out, resuming from height {self.next_height}" , "warn")
+        asyncio.create_task(self.request_next_chunk())
+
+    async def handle_received_blocks(self , message : dict[str , typing.Any]) -> None:
+        data : dict = message.get("data") or {}
+        if self.active == False or message.get("sender") != self.target_node_id:
+            return
+        if data.get("start_height") != self.next_height:
+            return # a late reply to a request that was already repeated.
+
+        if data.get("status") == "mismatch":
+            await self.restart_from_genesis()
+            return
+
+        checkpoint_height = data.get("checkpoint_height")
+        if self.checkpoint_allowed and checkpoint_height is not None and int(checkpoint_height) > self.next_height:
+            await self.start_checkpoint_transfer()
+            return
+        self.checkpoint_allowed = False
+
+        for each_block_data in data.get("blocks" , []):
+            new_block = load_block_from_dict(each_block_data)
+            if self.server.blockchain_operations.append_synced_block(new_block) == False:
+                await self.restart_from_genesis()
+                return
+            self.next_height += 1
+
+        self.retries = 0
+        if self.next_height >= int(data.get("chain_height" , 0)):
+            self.finish()
+            self.server.logger.event(LOG_EVENTS.BLOCK_SYNC_COMPLETED , self.target_node_id , self.next_height)
+        else:
+            await self.request_next_chunk()
+
+    async def restart_from_genesis(self) -> None:
+        """The local chain isnt a prefix of the target's so it is replaced, from the target's checkpoint if it has one
+        and otherwise from the first block."""
+        self.resets += 1
+        if self.resets > 1:
+            self.server.logger.event(LOG_EVENTS.BLOCK_SYNC_FAILED , self.target_node_id , self.next_height , tag="error")
+            self.finish()
+            return
+        self.server.blockchain_operations.reset_blockchain()
+        self.next_height = 0
+        if self.checkpoint_allowed:
+            await self.start_checkpoint_transfer()
+        else:
+            await self.request_next_chunk()
+
+    async def start_checkpoint_transfer(self) -> None:
+        self.checkpoint_allowed = False # if the checkpoint can't be used the blocks are synced instead.
+        self.retries = 0
+        self.checkpoint_transfer = {"snapshot_hash" : None , "chunks" : []}
+        await self.request_checkpoint_chunk()
+
+    async def request_checkpoint_chunk(self) -> None:
+        request = {
+            "code" : MESSAGE_CODES.REQUEST_CHECKPOINT.value,
+            "data" : {
+                "snapshot_hash" : self.checkpoint_transfer["snapshot_hash"],
+                "chunk_index" : len(self.checkpoint_transfer["chunks"]),
+                "host" : self.server.host,
+                "port" : self.server.port,
+            }
+        }
+        await self.send_request(request)
+
+    async def handle_received_checkpoint(self , message : dict[str , typing.Any]) -> None:
+        data : dict = message.get("data") or {}
+        transfer = self.checkpoint_transfer
+        if self.active == False or transfer is None or message.get("sender") != self.target_node_id:
+            return
+        if data.get("chunk_index") != len(transfer["chunks"]):
+            return # a late reply to a request that was already repeated.
+
+        if data.get("status") == "mismatch":
+            # the target made a newer checkpoint during the transfer, start again with that one.
+            self.checkpoint_transfer = {"snapshot_hash" : None , "chunks" : []}
+            await self.request_checkpoint_chunk()
+            return
+        if data.get("status") != "ok":
+            await self.end_checkpoint_transfer()
+            return
+
+        if len(transfer["chunks"]) == 0:
+            transfer["snapshot_hash"] = data.get("snapshot_hash")
+            transfer["height"] = int(data.get("height" , 0))
+            transfer["block"] = data.get("block")
+            transfer["chunk_count"] = int(data.get("chunk_count" , 0))
+        transfer["chunks"].append(data.get("chunk" , ""))
+
+        self.retries = 0
+        if len(transfer["chunks"]) < transfer["chunk_count"]:
+            await self.request_checkpoint_chunk()
+            return
+
+        checkpoint_block = load_block_from_dict(transfer["block"])
+        checkpoint_data = "".join(transfer["chunks"]).encode()
+        snapshot = verify_checkpoint(checkpoint_block , transfer["height"] , checkpoint_data)
+        if snapshot is not None and await self.server.checkpoints.checkpoint_block_signed(checkpoint_block , snapshot , self.known_validators) == False:
+            snapshot = None
+        if snapshot is None or self.server.blockchain_operations.load_checkpoint(checkpoint_block , transfer["height"] , snapshot , checkpoint_data) == False:
+            self.server.logger.event(LOG_EVENTS.CHECKPOINT_REJECTED , transfer["height"] , tag="warn")
+            self.server.blockchain_operations.reset_blockchain()
+            self.next_height = 0
+            await self.end_checkpoint_transfer()
+            return
+        self.server.logger.event(LOG_EVENTS.CHECKPOINT_LOADED , self.target_node_id , transfer["height"] , len(checkpoint_data))
+        self.next_height = transfer["height"] + 1
+        await self.end_checkpoint_transfer()
+
+    async def end_checkpoint_transfer(self) -> None:
+        """Goes back to requesting blocks, from after the checkpoint if it was loaded."""
+        self.checkpoint_transfer = None
+        self.retries = 0
+        await self.request_next_chunk()
+
+    def finish(self) -> None:
+        self.cancel_timeout()
+        self.active = False
+        self.checkpoint_transfer = None
+        operations = self.server.blockchain_operations
+        if len(self.server.block_chain.chain) > 0:
+            operations.set_snapshot_attr("blockchain_head" , self.server.block_chain.head)
+        operations.new_working_block()
+        operations.set_blockchain_lock(False)
+        operations.apply_held_blocks()
+        operations.emit_blockchain_updated()
+
+    # responder side
+
+    async def handle_request_blocks(self , message : dict[str , typing.Any]) -> None:
+        data : dict = message.get("data") or {}
+        blockchain = self.server.block_chain
+        start_height = int(data.get("start_height" , 0))
+        max_blocks = min(int(data.get("max_blocks" , CONSTANTS.BLOCK_SYNC_CHUNK_SIZE)) , CONSTANTS.BLOCK_SYNC_CHUNK_SIZE)
+        previous_hash = data.get("previous_hash")
+        latest_checkpoint = self.server.checkpoints.latest
+
+        response_data = {
+            "start_height" : start_height,
+            "chain_height" : blockchain.height(),
+            "checkpoint_height" : latest_checkpoint.height if latest_checkpoint is not None else None,
+            "status" : "ok",
+            "blocks" : [],
+        }
+
+        # a chain synced from a checkpoint only knows the hash of the block before its first block.
+        if start_height == blockchain.base_height and start_height > 0 and len(blockchain.chain) > 0:
+            expected_previous_hash = blockchain.chain[0].previous_hash
+        else:
+            previous_block = blockchain.block_at(start_height - 1)
+            expected_previous_hash = previous_block.hash if previous_block is not None else None
+
+        if start_height < blockchain.base_height or start_height > blockchain.height():
+            response_data["status"] = "mismatch"
+        elif start_height > 0 and expected_previous_hash != previous_hash:
+            response_data["status"] = "mismatch"
+        else:
+            # chunks are bounded by size as well as count, at least one block is always sent.
+            chunk_size = 0
+            start_index = start_height - blockchain.base_height
+            for each_block in blockchain.chain[start_index : start_index + max(1 , max_blocks)]:
+                serialized_block = each_block.serialize()
+                chunk_size += len(json.dumps(serialized_block))
+                if chunk_size > CONSTANTS.BLOCK_SYNC_CHUNK_BYTES and len(response_data["blocks"]) > 0:
+                    break
+                response_data["blocks"].append(serialized_block)
+
+        response = {
+            "code" : MESSAGE_CODES.SEND_BLOCKS.value,
+            "data" : response_data,
+        }
+        await self.send_response(message , response)
+
+    async def handle_request_checkpoint(self , message : dict[str , typing.Any]) -> None:
+        """Sends one chunk of the latest checkpoint's snapshot, the first chunk also carries the checkpoint block."""
+        data : dict = message.get("data") or {}
+        checkpoint = self.server.checkpoints.latest
+        chunk_index = int(data.get("chunk_index" , 0))
+        response_data = {
+            "chunk_index" : chunk_index,
+            "status" : "ok",
+        }
+
+        if checkpoint is None:
+            response_data["status"] = "none"
+        elif chunk_index > 0 and data.get("snapshot_hash") != checkpoint.snapshot_hash:
+            response_data["status"] = "mismatch"
+        else:
+            chunk_bytes = CONSTANTS.BLOCK_SYNC_CHUNK_BYTES
+            response_data["snapshot_hash"] = checkpoint.snapshot_hash
+            response_data["chunk_count"] = max(1 , (len(checkpoint.data) + chunk_bytes - 1) // chunk_bytes)
+            response_data["chunk"] = checkpoint.data[chunk_index * chunk_bytes : (chunk_index + 1) * chunk_bytes].decode()
+            if chunk_index == 0:
+                response_data["height"] = checkpoint.height
+                response_data["block"] = checkpoint.block.serialize()
+
+        response = {
+            "code" : MESSAGE_CODES.SEND_CHECKPOINT.value,
+            "data" : response_data,
+        }
+        await self.send_response(message , response)
+
+    def requester_address(self , sender : str , data : dict) -> typing.Tuple[str , int] | None:
+        """The host and port a request asked to be answered at, only if they are the address already known for the sender.
+        Otherwise any node could have the responder send blocks to an address of its choosing."""
+        try:
+            address = (str(data["host"]) , int(data["port"]))
+        except (KeyError , TypeError , ValueError):
+            return None
+        connection = self.server.connections.get_by_node_id(sender)
+        if connection is not None and connection.address() == address:
+            return address
+        node_entry = self.server.global_node_table.get(sender) or {}
+        if (node_entry.get("host") , node_entry.get("port")) == address:
+            return address
+        return None
+
+    async def send_response(self , message : dict[str , typing.Any] , response : dict) -> None:
+        """Replies the way the request arrived, along the route back if it was routed or otherwise straight back.
+        Responses are never flooded."""
+        data : dict = message.get("data") or {}
+        sender = message.get("sender")
+        message_proccessor = self.server.message_proccessor
+        if message.get("message_type") == "ttl" and await message_proccessor.ttl_broadcast(dict(response) , target_node_id=sender , flood=False):
+            return
+        await message_proccessor.send_to_node(sender , response , self.requester_address(sender , data) , flood=False)
@@ -0,0 +1,126 @@
+"""
+This module contains the block validator used by non-lead validators to check a received block before appending it.
+
+Every vote in the block is checked against the snapshot and every signature not already verified is checked in parallel on
+the crypto executor's workers, a single failure rejects the whole block. Verified transaction hashes are cached so a
+transaction is only verified once, including votes the lead validator counted itself.
+Blocks are validated in chain order, the snapshot checks depend on the blocks before, so a block that arrives before the
+block it follows is held until that block has been validated and added.
+"""
+from __future__ import annotations  # Type checking
+
+# Standard library imports
+import asyncio
+import typing
+from collections import OrderedDict
+
+# Type checking imports
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from server.core.server import Server
+
+from blockchain.block import Block
+from blockchain.transaction import Transaction
+from blockchain.elector_registry import elector_key_bytes
+import server.core.constants as CONSTANTS
+from server.core.logger import LOG_EVENTS
+from server.handlers.vote_ingestion import vote_package_json
+
+
+class BlockValidator:
+    server : Server
+    verified_transactions : OrderedDict[str , bool]
+    """Validates received blocks for a validator node and finalizes the ones that pass."""
+    def __init__(self , server : Server):
+        self.server = server
+        self.verified_transactions = OrderedDict() # transaction hash : True, oldest first.
+        self.block_lock = asyncio.Lock()
+
+        self.blocks_validated = 0
+        self.blocks_rejected = 0
+        self.signatures_verified = 0
+
+    def mark_verified(self , transaction_hashes : typing.Iterable[str]) -> None:
+        for each_hash in transaction_hashes:
+            self.verified_transactions[each_hash] = True
+            self.verified_transactions.move_to_end(each_hash)
+        while len(self.verified_transactions) > CONSTANTS.BLOCK_VALIDATION_CACHE_SIZE:
+            self.verified_transactions.popitem(last=False)
+
+    async def receive_block(self , new_block : Block) -> typing.List[Block]:
+        """Validates and finalizes the block and any held blocks that follow it, returns the blocks that were finalized."""
+        operations = self.server.blockchain_operations
+        applied_blocks = []
+        # blocks are handled one at a time so each is checked against the snapshot the block before it left.
+        async with self.block_lock:
+            while new_block is not None:
+                if new_block.previous_hash != self.server.snapshot.blockchain_head:
+                    operations.hold_block(new_block)
+                    break
+                if await self.validate_block(new_block) == False:
+                    self.blocks_rejected += 1
+                    self.server.logger.event(LOG_EVENTS.BLOCK_REJECTED , new_block.hash , tag="warn")
+                    break
+                self.blocks_validated += 1
+                if operations.finalize_next_block(new_block) == False:
+                    break
+                applied_blocks.append(new_block)
+                new_block = operations.held_blocks.pop(new_block.hash , None)
+        return applied_blocks
+
+    async def validate_block(self , block : Block) -> bool:
+        snapshot = self.server.snapshot
+        valid_candidates = snapshot.get_candidates()
+        block_voters = set()
+        to_verify : typing.List[Transaction] = []
+
+        each_transaction : Transaction
+        for i , each_transaction in enumerate(block.data):
+            if each_transaction.operation == "CHECKPOINT":
+                # a checkpoint must be first and commit to the snapshot this block is added to.
+                if i != 0 or await self.server.checkpoints.checkpoint_matches(each_transaction) == False:
+                    self.server.logger.event(LOG_EVENTS.CHECKPOINT_REJECTED , each_transaction.data.get("height") , tag="warn")
+                    return False
+                continue
+            if each_transaction.operation != "ADD_VOTE":
+                continue
+            voter_public_key = each_transaction.data.get("voter_public_key" , "")
+            try:
+                choice_id = int(each_transaction.data.get("vote_choice" , "-999"))
+            except (TypeError , ValueError):
+                return False
+
+            if choice_id not in valid_candidates:
+                self.server.logger.event(LOG_EVENTS.CANDIDATE_CHOSEN_NOT_VALID , choice_id , tag="warn")
+                return False
+            key_bytes = elector_key_bytes(voter_public_key)
+            elector_index = None if key_bytes is None else snapshot.get_elector_index(key_bytes)
+            if elector_index is None:
+                self.server.logger.event(LOG_EVENTS.UNKNOWN_ELECTOR_CREDS , voter_public_key , tag="warn")
+                return False
+            if snapshot.electors.is_voted(elector_index) or key_bytes in block_voters:
+                self.server.logger.event(LOG_EVENTS.ELECTOR_ALREADY_VOTED , voter_public_key , tag="warn")
+                return False
+            block_voters.add(key_bytes)
+
+            if each_transaction.hash not in self.verified_transactions:
+                to_verify.append(each_transaction)
+
+        crypto_executor = self.server.crypto_executor
+        results = await asyncio.gather(*[
+            crypto_executor.verify_vote(
+                each_transaction.data.get("voter_public_key" , ""),
+                vote_package_json(each_transaction.data.get("voter_public_key" , "") , int(each_transaction.data.get("vote_choice")) , each_transaction.data.get("nonce")),
+                each_transaction.data.get("vote_signature" , ""),
+            )
+            for each_transaction in to_verify
+        ])
+        self.signatures_verified += len(to_verify)
+
+        for each_transaction , each_result in zip(to_verify , results):
+            if each_result == False:
+                self.server.logger.event(LOG_EVENTS.RECEIVED_VOTE_FAILED_VERIFCATION , each_transaction.hash , tag="warn")
+                return False
+        self.mark_verified(each_transaction.hash for each_transaction in to_verify)
+        return True
@@ -8,6 +8,7 @@ from __future__ import annotations  # Type checking
 import json
 import typing
 import asyncio
+from collections import OrderedDict
 import traceback
 import typing
 
@@ -22,15 +23,19 @@ from blockchain.blockchain_snapshot import Snapshot, load_snapshot_from_dict
 from blockchain.block import Block, load_from_dict as load_block_from_dict
 from blockchain.blockchain import (
     load_from_dict as load_blockchain_from_dict,
+    load_from_block_store as load_blockchain_from_block_store,
     Blockchain,
 )
+from blockchain.block_store import BlockStore
 from blockchain.transaction import Transaction
+from blockchain.elector_registry import unpack_elector_keys
 import server.handlers.validator_actions as validator_actions
 import server.handlers.lead_validator_actions as lead_validator_actions
 import server.handlers.elector_actions as elector_actions
 import utilities.authentication as auth
 
 # Server modules
+import server.core.constants as CONSTANTS
 from server.core.constants import SNAPSHOT_OPERATIONS, MESSAGE_CODES
 from server.core.logger import LOG_EVENTS
 
@@ -40,11 +45,11 @@ def initial_parse_transaction(server: Server, transaction: Transaction , parentB
     if transaction.operation == "ADD_VALIDATOR":
         if transaction.data.get("node_id" , "") == server.node_id:
             asyncio.create_task(validator_actions.self_became_validator(server))
-            server.logger.Log(f"{LOG_EVENTS.SELF_BECAME_VALIDATOR.value} ({server.node_id})", "info")
+            server.logger.event(LOG_EVENTS.SELF_BECAME_VALIDATOR , server.node_id)
     elif transaction.operation == "SET_LEAD_VALIDATOR":
         if transaction.data.get("node_id" , "") == server.node_id:
             asyncio.create_task(lead_validator_actions.self_became_lead_validator(server))
-            server.logger.Log(f"{LOG_EVENTS.SELF_BECAME_LEAD_VALIDATOR.value} ({server.node_id})", "info")
+            server.logger.event(LOG_EVENTS.SELF_BECAME_LEAD_VALIDATOR , server.node_id)
         elif server.lead_validator == True:
             asyncio.create_task(lead_validator_actions.self_no_longer_lead_validator(server))
 
@@ -55,7 +60,7 @@ def initial_parse_transaction(server: Server, transaction: Transaction , parentB
             voter_public_key = transaction.data.get("voter_public_key" , None)
             if voter_public_key == compressed_elector_key:
                 asyncio.create_task(elector_actions.own_vote_detected(server , parentBlock.hash))
-                server.logger.Log(f"{LOG_EVENTS.OWN_VOTE_DETECTED.value} ({parentBlock.hash})", "info")
+                server.logger.event(LOG_EVENTS.OWN_VOTE_DETECTED , parentBlock.hash)
 
 
 
@@ -67,13 +72,13 @@ def parse_transaction_for_snapshot(server: Server, transaction: Transaction) ->
         if transaction.operation == "ADD_VALIDATOR":
             node_id = transaction.data.get("node_id", "unknown")
             server.snapshot.add_validator(node_id)
-            server.logger.Log(f"{LOG_EVENTS.VALIDATOR_ADDED_TO_LOCAL_SNAPSHOT.value} ({node_id})", "info")
+            server.logger.event(LOG_EVENTS.VALIDATOR_ADDED_TO_LOCAL_SNAPSHOT , node_id)
             server.server_events.blc_validator_added.emit(node_id)
         elif transaction.operation == "SET_LEAD_VALIDATOR":
             node_id = transaction.data.get("node_id")
             server.snapshot.set_lead_validator(node_id)
             server.server_events.blc_lead_validator_set.emit(node_id)
-            server.logger.Log(f"{LOG_EVENTS.LEAD_VALIDATOR_CHANGED_ON_LOCAL_SNAPSHOT.value} ({node_id})", "info")
+            server.logger.event(LOG_EVENTS.LEAD_VALIDATOR_CHANGED_ON_LOCAL_SNAPSHOT , node_id)
         elif transaction.operation == "ADD_CANDIDATE":
             candidate_name = transaction.data.get("candidate_name")
             candidate_id = transaction.data.get("candidate_id")
@@ -82,11 +87,13 @@ def parse_transaction_for_snapshot(server: Server, transaction: Transaction) ->
                 candidate_name,
                 candidate_id
             )
-            server.logger.Log(f"{LOG_EVENTS.CANDIDATE_ADDED.value} ({candidate_name},{candidate_id})", "info")
+            server.logger.event(LOG_EVENTS.CANDIDATE_ADDED , candidate_name , candidate_id)
             server.server_events.blc_candidate_added.emit(candidate_name , candidate_id)
 
         elif transaction.operation == "ADD_ELECTOR":
             server.snapshot.add_elector(transaction.data.get("elector_public_key"))
+        elif transaction.operation == "ADD_ELECTORS":
+            server.snapshot.add_elector_keys(unpack_elector_keys(transaction.data.get("elector_public_keys" , "")))
         elif transaction.operation == "ADD_VOTE":
             voter_public_key = transaction.data.get("voter_public_key")
             vote_choice = transaction.data.get("vote_choice")
@@ -95,19 +102,26 @@ def parse_transaction_for_snapshot(server: Server, transaction: Transaction) ->
             vote_choice = int(vote_choice)
             server.snapshot.set_elector_voted(voter_public_key, True)
             server.snapshot.add_vote(vote_choice)
-            server.server_events.blc_new_vote_added.emit(server.snapshot.vote_tally.copy())
 
 def parse_block(server: Server, block: Block) -> None:
+    # a checkpoint commits to the snapshot before the block so it is checked before any transaction is parsed.
+    server.checkpoints.record_checkpoint(block)
+    votes_added = False
     each_transaction: Transaction
     for each_transaction in block.data:
         initial_parse_transaction(server, each_transaction , block)
         parse_transaction_for_snapshot(server, each_transaction)
+        votes_added = votes_added or each_transaction.operation == "ADD_VOTE"
+    # the ui is sent the tally once per block, the view shares the tally until the next vote changes it.
+    if votes_added:
+        server.server_events.blc_new_vote_added.emit(server.snapshot.vote_tally_view())
 
 class BlockchainOperations:
 
     def __init__(self, server: Server):
         self.server = server
         self.lock_blockchain = False
+        self.held_blocks = OrderedDict() # previous_hash : block, blocks that arrived before the block they follow.
 
         self.snapshot_update_events = {
             "blockchain_head": self.server.server_events.blc_snapshot_head_updated,
@@ -133,7 +147,9 @@ class BlockchainOperations:
             snapshot_data: typing.Dict[str, typing.Any] = json.loads(snapshot_data_str)
             assert snapshot_data is not None
             self.server.snapshot = load_snapshot_from_dict(snapshot_data)
+            self.server.lead_failure_detector.head_changed()
             self.server.server_events.blc_new_snapshot_loaded.emit(self.server.snapshot.copy())
+            self.apply_held_blocks()
         except Exception as e:
             self.server.logger.Log(f"Could not load snapshot data: {e}.", "error")
 
@@ -143,6 +159,8 @@ class BlockchainOperations:
         Raises a KeyError if given attribute is not valid."""
         if hasattr(self.server.snapshot, attribute):
             setattr(self.server.snapshot, attribute, new_value)
+            if attribute == "blockchain_head":
+                self.server.lead_failure_detector.head_changed()
             if attribute in self.snapshot_update_events.keys():
                 event = self.snapshot_update_events.get(attribute)
                 event.emit(new_value)
@@ -150,6 +168,17 @@ class BlockchainOperations:
             raise KeyError(f"{attribute} is not a value attribute of server.snapshot")
 
 
+    def emit_blockchain_updated(self) -> None:
+        """Tells the ui the head and height changed, the blocks themselves are sent by blc_block_added as they are added."""
+        self.server.server_events.blc_blockchain_updated.emit({
+            "head" : self.server.block_chain.head,
+            "height" : self.server.block_chain.height(),
+        })
+
+    def send_blockchain_page(self, page_number: int, page_size: int) -> None:
+        """Sends one page of the local blockchain to the ui, used when the ui wants blocks it wasn't sent or has dropped."""
+        self.server.server_events.blc_blockchain_page.emit(self.server.block_chain.serialize_page(page_number , page_size))
+
     def new_working_block(self):
         """Creates a new empty working block."""
         self.server.working_block = Block(self.server.block_chain.head)
@@ -165,11 +194,14 @@ class BlockchainOperations:
             received_chain_list = blockchain_data.get("chainlist")
             assert received_head and received_chain_list
             loaded_blockchain: Blockchain = load_blockchain_from_dict(blockchain_data)
+            if self.server.block_store is not None:
+                loaded_blockchain.attach_block_store(self.server.block_store)
             self.server.server_events.blc_new_blockchain_loaded.emit()
             self.server.block_chain = loaded_blockchain
             for each_block in self.server.block_chain.chain:
                 #parse block to make ensure snapshot is up to date.
                 parse_block(self.server , each_block)
+                self.server.snapshot.blockchain_head = each_block.hash
                 self.server.server_events.blc_block_added.emit(each_block.serialize())
 
             self.server.logger.Log(f"completed loaded received blockchain data!", "warn")
@@ -181,7 +213,87 @@ class BlockchainOperations:
         finally: 
             self.set_blockchain_lock(False)
 
-  
+    def reset_blockchain(self) -> None:
+        """Replaces the blockchain and snapshot with empty ones, used before a chain is synced from the first block."""
+        new_blockchain = Blockchain(False)
+        if self.server.block_store is not None:
+            new_blockchain.attach_block_store(self.server.block_store)
+        self.server.block_chain = new_blockchain
+        self.server.snapshot = Snapshot()
+        self.held_blocks.clear()
+        self.server.server_events.blc_new_blockchain_loaded.emit()
+
+    def load_checkpoint(self, checkpoint_block: Block, height: int, snapshot: Snapshot, checkpoint_data: bytes) -> bool:
+        """Replaces the blockchain with one starting at a verified checkpoint block, and the snapshot with the checkpoint's.
+        The blocks before the checkpoint are never parsed, returns False if the checkpoint block couldn't be added."""
+        new_blockchain = Blockchain(False)
+        new_blockchain.base_height = height
+        if self.server.block_store is not None:
+            new_blockchain.attach_block_store(self.server.block_store)
+        self.server.block_chain = new_blockchain
+        self.server.snapshot = snapshot
+        self.held_blocks.clear()
+        self.server.server_events.blc_new_blockchain_loaded.emit()
+        self.server.server_events.blc_new_snapshot_loaded.emit(snapshot.copy())
+        if self.append_synced_block(checkpoint_block) == False:
+            return False
+        self.server.checkpoints.set_latest(checkpoint_block , height , checkpoint_data)
+        self.set_snapshot_attr("blockchain_head" , new_blockchain.head)
+        return True
+
+    def append_synced_block(self, new_block: Block) -> bool:
+        """Appends a block received from another node's chain and parses it into the snapshot.
+        Returns False if the block doesn't follow the current head."""
+        blockchain = self.server.block_chain
+        if len(blockchain.chain) == 0 and blockchain.base_height == 0:
+            if str(new_block.previous_hash) != "0":
+                return False
+            blockchain.add_genesis_block(new_block)
+        elif len(blockchain.chain) == 0:
+            # the first block of a chain synced from a checkpoint follows the checkpoint snapshot.
+            if new_block.previous_hash != self.server.snapshot.blockchain_head:
+                return False
+            blockchain.add_block(new_block , enforce_previous_hash=False)
+        else:
+            if new_block.previous_hash != blockchain.head:
+                return False
+            blockchain.add_block(new_block , enforce_previous_hash=False)
+
+        parse_block(self.server , new_block)
+        # the head is followed block by block so the checkpoints in the synced chain can be checked against the snapshot.
+        self.server.snapshot.blockchain_head = new_block.hash
+        self.server.server_events.blc_block_added.emit(new_block.serialize())
+        return True
+
+    def load_stored_blockchain(self, block_store: BlockStore) -> bool:
+        """Replaces the blockchain with the blocks kept in block_store and rebuilds the snapshot from them.
+        Returns False if the store has no blocks."""
+        stored_blockchain = load_blockchain_from_block_store(block_store)
+        if stored_blockchain is None:
+            return False
+
+        first_block = stored_blockchain.chain[0]
+        if str(first_block.previous_hash) != "0":
+            # the chain was synced from a checkpoint, the snapshot is rebuilt from the checkpoint saved with it.
+            base_checkpoint = self.server.checkpoints.load_base_checkpoint(first_block)
+            if base_checkpoint is None:
+                self.server.logger.Log("stored blocks dont start at genesis or a saved checkpoint, discarding them", "warn")
+                return False
+            stored_blockchain.base_height , self.server.snapshot = base_checkpoint
+
+        self.server.logger.Log(f"loading {len(stored_blockchain.chain)} stored blocks", "info")
+        self.server.server_events.blc_new_blockchain_loaded.emit()
+        self.server.block_chain = stored_blockchain
+        for each_block in stored_blockchain.chain:
+            parse_block(self.server , each_block)
+            # the head is followed block by block so the checkpoints in the chain can be checked against the snapshot.
+            self.server.snapshot.blockchain_head = each_block.hash
+            self.server.server_events.blc_block_added.emit(each_block.serialize())
+
+        self.set_snapshot_attr("blockchain_head" , stored_blockchain.head)
+        self.new_working_block()
+        return True
+
     def load_block(self, blockdata_dict: dict):
         """Deletes current working block and replaces it with block generated from block_data.
         This method should be used with caution by validators who must verify a block before accepting.
@@ -189,9 +301,41 @@ class BlockchainOperations:
         new_block = load_block_from_dict(blockdata_dict)
         if new_block.hash == self.server.block_chain.head:
             return  # already processed
+        applied_blocks = self.apply_block(new_block)
+        return new_block if new_block in applied_blocks else None
+
+    def apply_block(self, new_block: Block) -> typing.List[Block]:
+        """Finalizes the block if it follows the current head, otherwise it is held until the block before it arrives.
+        Blocks can arrive out of order when they are spread through the plumtree, returns every block that was finalized."""
+        applied_blocks = []
+        while new_block is not None:
+            if self.finalize_next_block(new_block) == False:
+                break
+            applied_blocks.append(new_block)
+            new_block = self.held_blocks.pop(new_block.hash , None)
+        return applied_blocks
+
+    def finalize_next_block(self, new_block: Block) -> bool:
+        """Finalizes the block only if it follows the snapshot head, a block that doesn't is held. Returns True if it was finalized."""
+        # blocks are finalized onto the snapshot head, which a node that joined from a snapshot has without the chain before it.
+        if new_block.previous_hash != self.server.snapshot.blockchain_head:
+            self.hold_block(new_block)
+            return False
         self.server.working_block = new_block
         self.finalize_block()
-        return new_block
+        return self.server.snapshot.blockchain_head == new_block.hash # false if the blockchain is locked.
+
+    def apply_held_blocks(self) -> typing.List[Block]:
+        """Finalizes any held blocks that follow the snapshot head, used after the head is changed by a snapshot or sync."""
+        held_block = self.held_blocks.pop(self.server.snapshot.blockchain_head , None)
+        if held_block is None:
+            return []
+        return self.apply_block(held_block)
+
+    def hold_block(self, new_block: Block) -> None:
+        self.held_blocks[new_block.previous_hash] = new_block
+        while len(self.held_blocks) > CONSTANTS.MAX_HELD_BLOCKS:
+            self.held_blocks.popitem(last=False)
 
 
     def add_transaction_to_working(self, operation: str, data: typing.Dict):
@@ -204,6 +348,19 @@ class BlockchainOperations:
             self.server.logger.Log(f"Error adding to working block {e}" , "error")
 
 
+    def add_transactions_to_working(self, operation: str, data_list: typing.List[typing.Dict]) -> typing.List[Transaction]:
+        """Adds a transaction for each data dict to the local working block, returns the transactions added."""
+        added_transactions = []
+        try:
+            assert(self.server.working_block)
+            for each_data in data_list:
+                new_transaction = Transaction(operation, each_data)
+                self.server.working_block.add_transaction(new_transaction)
+                added_transactions.append(new_transaction)
+        except Exception as e:
+            self.server.logger.Log(f"Error adding to working block {e}" , "error")
+        return added_transactions
+
     def finalize_block(self):
         """A finalized block cannot be edited anymore."""
         try:
@@ -223,9 +380,9 @@ class BlockchainOperations:
             #create new working block to append new transactions to.
             self.new_working_block()
 
-            #Fire events
-            self.server.server_events.blc_blockchain_updated.emit(self.server.block_chain.serialize())
+            #Fire events, only the new block is serialized so this doesn't grow with the chain.
             self.server.server_events.blc_block_added.emit(old_block.serialize())
+            self.emit_blockchain_updated()
             
         except Exception as e:
             self.server.logger.Log(f"Error adding to finalising block; {e}" , "error")
@@ -0,0 +1,229 @@
+"""
+This module contains the checkpoints that let a validator join without replaying the whole blockchain.
+
+Every CHECKPOINT_INTERVAL blocks the lead validator starts the new working block with a CHECKPOINT transaction, it
+commits to the hash of the serialized snapshot as it was after the block before. The serialization includes the elector
+registry and vote tally that the basic snapshot leaves out, so a node that loads it has the same state as one that parsed
+every block. Validators check the hash against their own snapshot before accepting the block, and every node that agrees
+keeps the latest checkpoint so it can send it to a joining node.
+"""
+from __future__ import annotations  # Type checking
+
+# Standard library imports
+import asyncio
+import json
+import os
+import typing
+
+# Type checking imports
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from server.core.server import Server
+
+# Blockchain modules
+from blockchain.block import Block
+from blockchain.blockchain_snapshot import Snapshot, checkpoint_hash, load_snapshot_from_checkpoint
+from blockchain.transaction import Transaction
+
+# Server constants
+import server.core.constants as CONSTANTS
+from server.core.logger import LOG_EVENTS
+
+
+def checkpoint_transaction(block : Block) -> Transaction | None:
+    """Returns the block's checkpoint transaction, a checkpoint is only valid as the first transaction of a block."""
+    if len(block.data) > 0 and block.data[0].operation == "CHECKPOINT":
+        return block.data[0]
+    return None
+
+def serialize_and_hash(snapshot : Snapshot) -> typing.Tuple[bytes , str]:
+    """Serializes the snapshot and hashes the result, run in a thread on a snapshot no other thread changes."""
+    checkpoint_data = snapshot.serialize_checkpoint()
+    return checkpoint_data , checkpoint_hash(checkpoint_data)
+
+def verify_checkpoint(block : Block , height : int , checkpoint_data : bytes) -> Snapshot | None:
+    """Checks the serialized snapshot is the one committed to by the block's checkpoint transaction.
+    Returns the loaded snapshot, or None if it doesn't match."""
+    transaction = checkpoint_transaction(block)
+    if transaction is None:
+        return None
+    if transaction.data.get("height") != height or transaction.data.get("snapshot_hash") != checkpoint_hash(checkpoint_data):
+        return None
+    try:
+        snapshot = load_snapshot_from_checkpoint(checkpoint_data)
+    except (ValueError , KeyError , TypeError):
+        return None
+    # the checkpoint is the state the block was added to.
+    if snapshot.blockchain_head != block.previous_hash or snapshot.blockchain_head != transaction.data.get("blockchain_head"):
+        return None
+    return snapshot
+
+
+class Checkpoint:
+    block : Block
+    height : int
+    snapshot_hash : str
+    data : bytes
+    """A checkpoint block with the serialized snapshot it commits to."""
+    def __init__(self , block : Block , height : int , snapshot_hash : str , data : bytes):
+        self.block = block
+        self.height = height
+        self.snapshot_hash = snapshot_hash
+        self.data = data
+
+
+class CheckpointManager:
+    server : Server
+    latest : Checkpoint | None
+    """Creates, checks and keeps the checkpoints found in the blockchain.
+
+    Serializing and hashing the snapshot is done in a thread on a copy of it, so the event loop isn't blocked by a large
+    elector registry. Only the latest kept checkpoint holds on to its serialized snapshot."""
+    def __init__(self , server : Server):
+        self.server = server
+        self.latest = None
+        self.serialization = (None , None , None) # snapshot id , head , task serializing the snapshot at that head.
+        self.recording = None # task keeping the checkpoint of the last parsed checkpoint block.
+
+    def serialization_task(self) -> asyncio.Task | None:
+        """Starts serializing and hashing the current snapshot, the task gives (data , hash). The task is reused until the
+        head changes, so the lead and a validator checking and then parsing the block only serialize it once.
+        Returns None on a node that doesn't know the electors, its serialization could never match a checkpoint."""
+        snapshot = self.server.snapshot
+        if snapshot.electors_known == False:
+            return None
+        snapshot_id , head , task = self.serialization
+        if task is None or task.cancelled() or snapshot_id != id(snapshot) or head != snapshot.blockchain_head:
+            task = asyncio.ensure_future(asyncio.to_thread(serialize_and_hash , snapshot.checkpoint_copy()))
+            self.serialization = (id(snapshot) , snapshot.blockchain_head , task)
+        return task
+
+    async def serialize_snapshot(self) -> typing.Tuple[bytes , str] | None:
+        task = self.serialization_task()
+        if task is None:
+            return None
+        return await task
+
+    def release_serialization(self , head : str) -> None:
+        """Drops the serialization of the snapshot at head once nothing else will ask for it, so it isn't kept in memory
+        alongside the latest checkpoint."""
+        if self.serialization[1] == head:
+            self.serialization = (None , None , None)
+
+    async def add_checkpoint_transaction(self) -> None:
+        """Used by the lead validator after finalizing a block, starts the new working block with a checkpoint if one is due."""
+        height = self.server.block_chain.height()
+        if CONSTANTS.CHECKPOINT_INTERVAL <= 0 or height % CONSTANTS.CHECKPOINT_INTERVAL != 0:
+            return
+        if len(self.server.working_block.data) > 0:
+            return # the block wasn't finalized, a checkpoint has to be the first transaction.
+        head = self.server.snapshot.blockchain_head
+        serialized = await self.serialize_snapshot()
+        if serialized is None or self.server.snapshot.blockchain_head != head:
+            return
+        data , snapshot_hash = serialized
+
+        # votes can be added to the working block while the snapshot is serialized, the checkpoint is put before them.
+        new_working_block = Block(head)
+        new_working_block.add_transaction(Transaction("CHECKPOINT" , {
+            "height" : height,
+            "blockchain_head" : head,
+            "snapshot_hash" : snapshot_hash,
+            "size" : len(data),
+        }))
+        for each_transaction in self.server.working_block.data:
+            new_working_block.add_transaction(each_transaction)
+        self.server.working_block = new_working_block
+        self.server.logger.event(LOG_EVENTS.CHECKPOINT_CREATED , height , snapshot_hash , len(data))
+
+    async def checkpoint_matches(self , transaction : Transaction) -> bool:
+        """True if the checkpoint commits to the current snapshot, which a block being validated is added to."""
+        if transaction.data.get("blockchain_head") != self.server.snapshot.blockchain_head:
+            return False
+        serialized = await self.serialize_snapshot()
+        return serialized is not None and transaction.data.get("snapshot_hash") == serialized[1]
+
+    def record_checkpoint(self , block : Block) -> None:
+        """Called before the block's transactions are parsed, keeps the checkpoint once it is found to match the local snapshot.
+        A node that only has the basic snapshot doesn't know the electors so it can't keep checkpoints."""
+        transaction = checkpoint_transaction(block)
+        if transaction is None:
+            return
+        task = self.serialization_task()
+        if task is None:
+            return
+        if transaction.data.get("blockchain_head") != self.server.snapshot.blockchain_head:
+            self.server.logger.Log(f"Checkpoint at height {transaction.data.get('height')} doesn't follow the local head, not kept" , "info")
+            return
+        if self.recording is not None and self.recording.done() == False:
+            # a replayed chain passes many checkpoints at once, only the newest needs its snapshot serialized.
+            self.recording.cancel()
+        self.recording = asyncio.ensure_future(self.keep_checkpoint(block , transaction , task))
+
+    async def keep_checkpoint(self , block : Block , transaction : Transaction , task : asyncio.Task) -> None:
+        data , snapshot_hash = await task
+        self.release_serialization(transaction.data.get("blockchain_head"))
+        if transaction.data.get("snapshot_hash") != snapshot_hash:
+            self.server.logger.Log(f"Checkpoint at height {transaction.data.get('height')} doesn't match the local snapshot, not kept" , "info")
+            return
+        height = int(transaction.data.get("height"))
+        if self.latest is None or height > self.latest.height:
+            self.latest = Checkpoint(block , height , snapshot_hash , data)
+
+    async def checkpoint_block_signed(self , block : Block , snapshot : Snapshot , known_validators : typing.Set[str]) -> bool:
+        """Checks a checkpoint block sent by another node was submitted by the lead validator of the checkpoint's snapshot,
+        which has to be a validator this node knew of before the sync. The lead's SUBMIT_BLOCK signature covers the
+        block's previous hash and transactions, so the checkpoint can't have been made up by the node sending it."""
+        if len(block.data) < 2 or block.data[-1].operation != "SUBMIT_BLOCK":
+            return False
+        submit_data = block.data[-1].data
+        lead_validator_id = snapshot.get_lead_validator()
+        if lead_validator_id not in known_validators or submit_data.get("node_id") != lead_validator_id:
+            return False
+        if submit_data.get("signed_nonce") != block.submitted_digest():
+            return False
+        lead_validator_pub_key = self.server.peer_directory.get(lead_validator_id , {}).get("public_key")
+        if lead_validator_pub_key is None:
+            return False
+        return await self.server.crypto_executor.verify(
+            lead_validator_id , lead_validator_pub_key , submit_data.get("signed_nonce") , str(submit_data.get("signature"))
+        )
+
+    def set_latest(self , block : Block , height : int , data : bytes) -> None:
+        """Keeps a checkpoint this node was bootstrapped from, and saves it next to the block store if there is one."""
+        self.latest = Checkpoint(block , height , checkpoint_hash(data) , data)
+        if self.server.block_store is not None:
+            self.save_base_checkpoint(self.latest)
+
+    # a chain synced from a checkpoint is stored without the blocks before it, the checkpoint is stored with it.
+
+    def base_checkpoint_path(self) -> str:
+        return self.server.block_store.path + ".checkpoint"
+
+    def save_base_checkpoint(self , checkpoint : Checkpoint) -> None:
+        path = self.base_checkpoint_path()
+        with open(path + ".tmp" , "wb") as checkpoint_file:
+            checkpoint_file.write(json.dumps({"height" : checkpoint.height , "snapshot_hash" : checkpoint.snapshot_hash}).encode() + b"\n")
+            checkpoint_file.write(checkpoint.data)
+            checkpoint_file.flush()
+            os.fsync(checkpoint_file.fileno())
+        os.replace(path + ".tmp" , path)
+
+    def load_base_checkpoint(self , first_block : Block) -> typing.Tuple[int , Snapshot] | None:
+        """Returns the height and snapshot of the checkpoint saved for a stored chain starting at first_block,
+        or None if there isnt one or it isnt the checkpoint in first_block."""
+        if self.server.block_store is None or os.path.exists(self.base_checkpoint_path()) == False:
+            return None
+        with open(self.base_checkpoint_path() , "rb") as checkpoint_file:
+            header = checkpoint_file.readline()
+            data = checkpoint_file.read()
+        try:
+            height = int(json.loads(header).get("height"))
+        except (ValueError , TypeError , AttributeError):
+            return None
+        snapshot = verify_checkpoint(first_block , height , data)
+        if snapshot is None:
+            return None
+        self.latest = Checkpoint(first_block , height , checkpoint_hash(data) , data)
+        return height , snapshot
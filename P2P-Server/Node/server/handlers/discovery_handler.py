@@ -23,13 +23,18 @@ def generate_connected_peers(server : Server) -> list:
     for eachConnection in server.connections:
 
         connected_peers.append({
-            "host" : eachConnection.get("host"),
-            "port" : eachConnection.get("port"),
-            "node_id": eachConnection.get("node_id" or 0)
+            "host" : eachConnection.host,
+            "port" : eachConnection.port,
+            "node_id": eachConnection.node_id
         })
 
     return connected_peers
             
+def generate_advertised_routes(server : Server) -> dict:
+    """Generates the routes advertised to neighbors, maps each reachable node id to [hops , next_hop]."""
+    neighbor_ids = [each_connection.node_id for each_connection in server.connections if each_connection.node_id is not None]
+    return server.routing_table.advertise(server.node_id , neighbor_ids)
+
 def generate_global_nodes(server : Server) -> list:
     """"""
     output = []
@@ -77,7 +82,8 @@ class DiscoveryHandler:
                     "code": MESSAGE_CODES.CONNECTION_DISCOVERY.value,
                     "message_timestamp" : time.time(),
                     "data": {
-                        "connections_list" : generate_connected_peers(self.server)
+                        "connections_list" : generate_connected_peers(self.server),
+                        "routes" : generate_advertised_routes(self.server),
                     }
                 }
 
@@ -197,6 +203,11 @@ class DiscoveryHandler:
         if message_data is None:
             return
 
+        # routes are only learned from neighbors, the connection discovery message is sent directly so the sender should be one.
+        advertised_routes : typing.Optional[dict] = message_data.get("routes")
+        if advertised_routes is not None and server.connections.get_by_node_id(sender) is not None:
+            server.routing_table.update_from_neighbor(sender , advertised_routes , server.node_id)
+
         connections_list : typing.Optional[list] = message_data.get("connections_list")
 
         if connections_list is None:
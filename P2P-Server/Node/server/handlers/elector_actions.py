@@ -8,6 +8,7 @@ import json
 from typing import TYPE_CHECKING
 
 import server.core.constants as constants
+from server.core.logger import LOG_EVENTS
 
 import utilities.authentication as authentication
 from utilities.elector_loading import read_credentials_file
@@ -54,6 +55,7 @@ async def propose_vote(server : Server, vote_choice_id : int):
     }
 
     print(message)
+    server.logger.event(LOG_EVENTS.VOTE_SUBMITTED , vote_choice_id)
     await server.message_proccessor.ttl_broadcast(message , lead_validator_id)
 
 async def own_vote_detected(server : Server , blockhash : str):#
@@ -0,0 +1,74 @@
+"""
+This module contains the lead failure detector used by validators to notice when the lead validator stops producing blocks.
+
+Rather than polling the blockchain head, a single deadline is kept on the event loop with loop.call_at, it is moved back
+every time the snapshot head changes. If the deadline is reached no block was added for BLOCK_TIMEOUT seconds and a new
+lead validator is assigned.
+"""
+from __future__ import annotations  # Type checking
+
+# Standard library imports
+import asyncio
+import typing
+
+# Type checking imports
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from server.core.server import Server
+
+import server.core.constants as CONSTANTS
+import server.handlers.validator_actions as validator_actions
+
+
+class LeadFailureDetector:
+    server : Server
+    loop : asyncio.AbstractEventLoop | None
+    deadline_handle : asyncio.TimerHandle | None
+    reassign_task : asyncio.Task | None
+    """Reassigns the lead validator if the blockchain head doesn't change for BLOCK_TIMEOUT seconds."""
+    def __init__(self , server : Server):
+        self.server = server
+        self.loop = None
+        self.deadline_handle = None
+        self.reassign_task = None
+        self.timeouts = 0
+
+    def start(self) -> None:
+        """Starts watching the head, must be called from the server's event loop."""
+        self.loop = asyncio.get_running_loop()
+        self.reset_deadline()
+
+    def stop(self) -> None:
+        if self.deadline_handle is not None:
+            self.deadline_handle.cancel()
+            self.deadline_handle = None
+        self.loop = None
+
+    def head_changed(self) -> None:
+        """Called when the snapshot head changes, moves the deadline back."""
+        if self.loop is not None:
+            self.reset_deadline()
+
+    def reset_deadline(self) -> None:
+        if self.deadline_handle is not None:
+            self.deadline_handle.cancel()
+        self.deadline_handle = self.loop.call_at(self.loop.time() + CONSTANTS.BLOCK_TIMEOUT , self.deadline_reached)
+
+    def deadline_reached(self) -> None:
+        self.deadline_handle = None
+        if self.server.validator == False:
+            self.loop = None
+            return
+        self.timeouts += 1
+        # only one reassign is sent at a time, the deadline is reset either way so a failed reassign is tried again.
+        if self.reassign_task is None or self.reassign_task.done():
+            self.reassign_task = self.loop.create_task(self.reassign_lead_validator())
+        self.reset_deadline()
+
+    async def reassign_lead_validator(self) -> None:
+        try:
+            new_id = validator_actions.new_lead_validator_id(self.server)
+            await validator_actions.send_reassign_message(self.server , new_id)
+        except Exception as e:
+            self.server.logger.Log(f"Validator loop error, {e}", "error")
@@ -10,7 +10,7 @@ import time
 import os
 
 # Blockchain imports
-from blockchain.block import Block , load_from_dict
+from blockchain.block import Block , load_from_dict , submit_digest
 
 from blockchain.transaction import Transaction
 import utilities.authentication as auth
@@ -31,7 +31,7 @@ async def self_became_lead_validator(server : Server ):
     if server.lead_validator: return print("already validator") #already a valdiator no need to process twice
     server.lead_validator = True
     #server.server_events.blc_became_validator.emit()
-    server.logger.Log(f"{LOG_EVENTS.SELF_BECAME_VALIDATOR.value} ({server.node_id})" , "warn")
+    server.logger.event(LOG_EVENTS.SELF_BECAME_VALIDATOR , server.node_id , tag="warn")
 
     server_events : ServerEvents = server.server_events
     server_events.blc_became_lead_validator.emit()
@@ -52,7 +52,7 @@ async def add_validator(server : Server, node_id : int) -> None:
 
     nonce = os.urandom(16).hex()
     signed_data = f"({node_id},{nonce})"
-    signature = auth.generate_signature_str_rsa(server.node_private_key , nonce)
+    signature = await server.crypto_executor.sign(nonce)
 
     validator_transaction_data =  {
         "node_id" : node_id,
@@ -86,8 +86,13 @@ async def lead_validator_loop(server : Server):
 
 async def submit_working_block_to_network(server : Server):
 
-    block_nonce = os.urandom(16).hex()
-    signature = auth.generate_signature_str_rsa(server.node_private_key , block_nonce)
+    # the signed nonce commits to the block's contents, so the block can be checked by a node that only has the lead's key.
+    # votes can be added while it is signed, then it is signed again.
+    while True:
+        block_nonce = submit_digest(server.snapshot.blockchain_head , server.working_block.merkle_tree.root())
+        signature = await server.crypto_executor.sign(block_nonce)
+        if block_nonce == submit_digest(server.snapshot.blockchain_head , server.working_block.merkle_tree.root()):
+            break
 
     server.blockchain_operations.add_transaction_to_working(
         "SUBMIT_BLOCK", {
@@ -100,6 +105,7 @@ async def submit_working_block_to_network(server : Server):
     finalized_block = server.working_block
     # print("SENT" , len(finalized_block.data))
     server.blockchain_operations.finalize_block()
+    await server.checkpoints.add_checkpoint_transaction()
 
     finalize_message = {
         "code" : MESSAGE_CODES.NEW_BLOCK_ADDED.value,
@@ -108,7 +114,10 @@ async def submit_working_block_to_network(server : Server):
         }
     }
 
-    await server.message_proccessor.ttl_broadcast(finalize_message)
+    await server.message_proccessor.broadcast(finalize_message)
+    vote_count = sum(1 for each_transaction in finalized_block.data if each_transaction.operation == "ADD_VOTE")
+    if vote_count > 0:
+        server.logger.event(LOG_EVENTS.VOTES_FINALIZED , finalized_block.hash , vote_count)
 
 
 def add_candidate(server : Server , candidate_name : str , candidate_id : int) -> None:
@@ -63,10 +63,10 @@ class NewBlockProcessor:
                     
                     #check submit block trans is valid.
                     
-                    if self.verify_new_submit_sig(block_data):
+                    if await self.verify_new_submit_sig(block_data):
                         self.accept_new_block(block_data)
                     else:
-                        self.server.logger.Log(f"{LOG_EVENTS.SUBMIT_BLOCK_TRANSACTION_INVALID.value} ()", "warn")
+                        self.server.logger.event(LOG_EVENTS.SUBMIT_BLOCK_TRANSACTION_INVALID , tag="warn")
 
 
                  
@@ -75,7 +75,7 @@ class NewBlockProcessor:
         self.count_dict = {}
         new_block = self.server.blockchain_operations.load_block(block_data)
 
-    def verify_new_submit_sig(self , block_data):
+    async def verify_new_submit_sig(self , block_data):
         constructed_block : Block = load_from_dict(block_data)
         if len(constructed_block.data) <= 0:
                 return False
@@ -99,7 +99,8 @@ class NewBlockProcessor:
         if lead_validator_pub_key is None:
             return False
 
-        return auth.verify_signature_rsa(
+        return await self.server.crypto_executor.verify(
+            lead_validator_id,
             lead_validator_pub_key,
             signed_nonce,
             signature
@@ -18,7 +18,8 @@ import server.handlers.lead_validator_actions as lead_validator_actions
 from server.handlers.discovery_handler import generate_global_nodes, generate_discovered_nodes
 
 import utilities.authentication as authentication
-from utilities.elector_loading import read_electors_file
+from utilities.elector_loading import iter_elector_key_batches
+from blockchain.elector_registry import pack_elector_keys
 
 from typing import TYPE_CHECKING
 from server.core import constants
@@ -50,22 +51,17 @@ async def self_became_validator(server : Server , bootstrap:bool=False):
     if server.validator: return print("already validator") #already a valdiator no need to process twice
     server.validator = True
     server.server_events.blc_became_validator.emit()
-    server.logger.Log(f"{LOG_EVENTS.SELF_BECAME_VALIDATOR.value} ({server.node_id})" , "warn")
+    server.logger.event(LOG_EVENTS.SELF_BECAME_VALIDATOR , server.node_id , tag="warn")
 
 
     #validator loop
     asyncio.create_task(validator_discovery_loop(server))
-    asyncio.create_task(validator_loop(server))
+    server.lead_failure_detector.start()
     #request full blockchain
     if bootstrap == False:
         lead_validator = server.snapshot.get_lead_validator()  
-        server.blockchain_operations.set_blockchain_lock(True) 
-
-        message = {
-            "code": MESSAGE_CODES.REQUEST_FULL_BLOCKCHAIN.value,
-        }
-
-        await server.message_proccessor.ttl_broadcast(message , target_node_id=lead_validator)
+        if lead_validator == server.node_id: return # a chain restored from disk may make this node the lead, nothing to request.
+        await server.block_sync.start(lead_validator)
 
 def add_candidate(server : Server , candidate_name : str) -> None:
     operation : str = "ADD_CANDIDATE"
@@ -82,67 +78,9 @@ def add_candidate(server : Server , candidate_name : str) -> None:
     }
     server.blockchain_operations.add_transaction_to_working(operation , candidate_data)
 
-def verify_vote(server : Server, vote_sig:str , vote_nonce : str, voter_public_key_comp : str , choice_id:int) -> bool:
-    #reconstruct vote package.
-
-    reconstructed_vote_package : dict = {
-        "elector_public_key" : voter_public_key_comp,
-        "choice" : choice_id,
-        "nonce" : vote_nonce,
-    }
-
-    valid_candidates = server.snapshot.get_candidates()
-
-    #candidate valid check.
-    candidate_entry = valid_candidates.get(choice_id , None)
-    if candidate_entry is None: 
-        server.logger.Log(f"{LOG_EVENTS.CANDIDATE_CHOSEN_NOT_VALID.value} ({choice_id})" , "warn")
-        return False
-
-    #elector registered check.
-    if server.snapshot.is_elector_registered(voter_public_key_comp) == False:
-        server.logger.Log(f"{LOG_EVENTS.UNKNOWN_ELECTOR_CREDS.value} ({voter_public_key_comp})" , "warn")
-        return False
-
-    if server.snapshot.has_elector_voted(voter_public_key_comp) == True:
-        server.logger.Log(f"{LOG_EVENTS.ELECTOR_ALREADY_VOTED.value} ({voter_public_key_comp})" , "warn")
-        return False
-
-    #check vote signature.
-    json_package : str = json.dumps(reconstructed_vote_package , sort_keys=True)
-    voter_public_key = authentication.decompress_ecdsa_key(voter_public_key_comp , is_private=False)
-
-    return authentication.verify_signature_ecdsa(voter_public_key , json_package , vote_sig)
-
-
 def handle_vote(server : Server , vote_message : dict) -> None:
-    message_data : typing.Dict[str,typing.Any] = vote_message.get("data" , None)
-    vote_signature : str = message_data.get("signature" , None)
-    vote_package : typing.Dict[str,typing.Any] = message_data.get("vote_package" , None)
-
-    vote_nonce = vote_package.get("nonce" , None) 
-    voter_public_key_str : str = vote_package.get("elector_public_key" , None)
-    voter_public_key_str = voter_public_key_str.strip()
-    choice_id : int = int(vote_package.get("choice" , "-999"))
-
-    if verify_vote(
-        server=server,
-        vote_sig=vote_signature,
-        vote_nonce=vote_nonce,
-        voter_public_key_comp=voter_public_key_str,
-        choice_id=choice_id,
-    ) == True:
-        #verification passed.
-        vote_data = {
-            "vote_choice" : choice_id,
-            "voter_public_key" : voter_public_key_str,
-            "vote_signature" : vote_signature,
-            "nonce" : vote_nonce
-        } 
-        server.blockchain_operations.add_transaction_to_working("ADD_VOTE" , vote_data)
-        server.logger.Log(f"{LOG_EVENTS.VOTE_COUNTED.value} ({choice_id})" , "info")
-    else:
-        server.logger.Log(f"{LOG_EVENTS.RECEIVED_VOTE_FAILED_VERIFCATION.value} ({choice_id})" , "warn")
+    """Queues the vote, votes are checked and added to the working block in batches by the server's vote ingestor."""
+    server.vote_ingestor.submit(vote_message)
 
 
 async def send_node_discovery_message(server : Server):
@@ -171,7 +109,7 @@ def new_lead_validator_id(server : Server) -> str:
 async def send_reassign_message(server : Server , new_validator_id : str) -> None:
 
     block_nonce = os.urandom(16).hex()
-    signature = authentication.generate_signature_str_rsa(server.node_private_key , block_nonce)
+    signature = await server.crypto_executor.sign(block_nonce)
 
     server.blockchain_operations.add_transaction_to_working(
         "SET_LEAD_VALIDATOR", {
@@ -189,39 +127,7 @@ async def send_reassign_message(server : Server , new_validator_id : str) -> Non
         }
     }
 
-    await server.message_proccessor.ttl_broadcast(finalize_message)
-
-async def validator_loop(server : Server):
-    T : float = time.perf_counter()
-    dt : float
-
-    new_block_count : float = 0
-    old_head = server.snapshot.blockchain_head
-
-    while server.validator:
-        try:
-            now = time.perf_counter()
-            dt = now - T
-            T = now
-
-            new_block_count += dt
-
-            if old_head != server.snapshot.blockchain_head:
-                old_head = server.snapshot.blockchain_head
-                new_block_count = 0
-
-            if new_block_count > constants.BLOCK_TIMEOUT:
-
-                new_id = new_lead_validator_id(server)
-                await send_reassign_message(server , new_id)
-                new_block_count = 0
-            
-        except Exception as e:
-            server.logger.Log(f"Validator loop error, {e}", "error")
-
-        finally: 
-            await asyncio.sleep(0)
-
+    await server.message_proccessor.broadcast(finalize_message)
 
 async def validator_discovery_loop(server : Server):
     print("vs" , server.validator)
@@ -268,52 +174,62 @@ async def handle_new_block(server : Server , new_block_message : dict[str , typi
     if new_block.hash == server.snapshot.blockchain_head:
         return
 
-    each_transaction : Transaction
-    for each_transaction in new_block.data:
-        
-        if each_transaction.operation == "ADD_VOTE":
-            vote_choice = int(each_transaction.data.get("vote_choice" , "-999"))
-            voter_public_key = each_transaction.data.get("voter_public_key" , "")
-            vote_signature = each_transaction.data.get("vote_signature" , "")
-            nonce = each_transaction.data.get("nonce" , "")
-
-            result = verify_vote(
-                server,
-                vote_signature,
-                nonce,
-                voter_public_key,
-                vote_choice
-            )
-
-            if result == True:
-                continue
-            else:
-                server.logger.Log("Could not propergate block: ADD_VOTE operation could not be verified.")
-
-    #verication passed (else return before here)
-    server.working_block = new_block
-    server.blockchain_operations.finalize_block()
-
-    #echo the finalization meesage.
-    finalize_message = {
-        "code" : MESSAGE_CODES.NEW_BLOCK_ADDED.value,
-        "data" : {
-            "finalized_block" : new_block.serialize()
+    #the block and any held blocks after it are only added if every transaction in them verifies.
+    #the block is held if the block before it hasnt arrived yet, echo each block once it is added.
+    for each_block in await server.block_validator.receive_block(new_block):
+        #echo the finalization meesage.
+        finalize_message = {
+            "code" : MESSAGE_CODES.NEW_BLOCK_ADDED.value,
+            "data" : {
+                "finalized_block" : each_block.serialize()
+            }
         }
-    }
-    
-    await server.message_proccessor.ttl_broadcast(finalize_message)
+        
+        await server.message_proccessor.broadcast(finalize_message)
 
-def load_all_electors(server : Server) -> None:
+async def load_all_electors(server : Server , electors_path : typing.Optional[str] = None) -> None:
+    """Registers every elector in the electors file on the blockchain.
 
-    electors_dict = read_electors_file()
-    if electors_dict is None:
+    The file is read and decoded on a worker thread a batch at a time so the event loop keeps running, each batch is
+    added to the working block as one ADD_ELECTORS transaction. A block takes at most MAX_ELECTORS_PER_BLOCK electors,
+    the rest wait for the next working block."""
+    if electors_path is None:
+        electors_path = constants.ELECTORS_FILE
+    if os.path.exists(electors_path) == False:
         server.server_events.sys_missing_electors_file.emit()
         return
 
-    each_elector_info : dict 
-    for each_elector_info in electors_dict.values():
-        load_elector(server , each_elector_info)
+    key_batches = iter_elector_key_batches(electors_path , constants.ELECTOR_BATCH_SIZE)
+    loaded_count = 0
+    skipped_count = 0
+    working_block = server.working_block
+    electors_in_block = 0
+    while True:
+        try:
+            next_batch = await asyncio.to_thread(next , key_batches , None)
+        except (OSError , ValueError) as e:
+            server.logger.Log(f"could not read electors file ({e})" , "error")
+            break
+        if next_batch is None:
+            break
+        elector_keys , batch_skipped = next_batch
+        skipped_count += batch_skipped
+        if len(elector_keys) == 0:
+            continue
+
+        while server.working_block is working_block and electors_in_block > 0 and electors_in_block + len(elector_keys) > constants.MAX_ELECTORS_PER_BLOCK:
+            await asyncio.sleep(0.1) # wait for the lead validator to finalize the block.
+        if server.working_block is not working_block:
+            working_block = server.working_block
+            electors_in_block = 0
+
+        server.blockchain_operations.add_transactions_to_working("ADD_ELECTORS" , [{"elector_public_keys" : pack_elector_keys(elector_keys)}])
+        electors_in_block += len(elector_keys)
+        loaded_count += len(elector_keys)
+
+    if skipped_count > 0:
+        server.logger.Log(f"could not load {skipped_count} electors, missing or invalid public key" , "warn")
+    server.logger.event(LOG_EVENTS.ELECTORS_LOADED , loaded_count)
 
 def handle_heartbeat(server : Server , message : dict) -> None:
     sender = message.get("sender")
@@ -333,22 +249,6 @@ def handle_heartbeat(server : Server , message : dict) -> None:
         dict_entry["port"] = data.get("port")
 
 
-def load_elector(server : Server , elector_info : dict) -> None:
-
-    elector_public_key = elector_info.get("public_key")
-    elector_private_key = elector_info.get("private_key")
-
-    if elector_private_key is None or elector_public_key is None:
-        server.logger.Log("could not load elector, missing public or private key")
-        return
-
-    print(elector_public_key , elector_private_key)
-    server.blockchain_operations.add_transaction_to_working(
-        "ADD_ELECTOR", 
-        {
-            "elector_public_key" : elector_public_key
-        }
-    )
 
 async def start_new_lead_validator_vote(server : Server):
     """This function is used to decide a new lead validator if the current lead becomes unresponsive."""
@@ -0,0 +1,185 @@
+"""
+This module contains the vote ingestion queue used by the lead validator to count received votes.
+
+Votes are collected for a short window and then checked as one batch, each elector key is decoded once, a batch only keeps
+the first vote from each elector and the signatures are verified together on the crypto executor's workers. The accepted
+votes are appended to the working block in one go.
+"""
+from __future__ import annotations  # Type checking
+
+# Standard library imports
+import asyncio
+import json
+import typing
+
+# Type checking imports
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from server.core.server import Server
+
+from blockchain.elector_registry import elector_key_bytes
+import server.core.constants as CONSTANTS
+from server.core.logger import LOG_EVENTS
+
+
+def vote_package_json(elector_public_key : str , choice_id : int , nonce : str) -> str:
+    """The vote package as it was signed by the elector."""
+    vote_package = {
+        "elector_public_key" : elector_public_key,
+        "choice" : choice_id,
+        "nonce" : nonce,
+    }
+    return json.dumps(vote_package , sort_keys=True)
+
+
+class PendingVote:
+    """A received vote waiting for its batch to be checked."""
+    __slots__ = ("elector_public_key" , "key_bytes" , "choice_id" , "nonce" , "signature")
+    elector_public_key : str
+    key_bytes : bytes | None
+    choice_id : int
+    nonce : str
+    signature : str
+
+    def __init__(self , elector_public_key : str , choice_id : int , nonce : str , signature : str):
+        self.elector_public_key = elector_public_key
+        self.key_bytes = elector_key_bytes(elector_public_key) # None if the key isnt a valid elector key.
+        self.choice_id = choice_id
+        self.nonce = nonce
+        self.signature = signature
+
+    def signed_json(self) -> str:
+        return vote_package_json(self.elector_public_key , self.choice_id , self.nonce)
+
+    def transaction_data(self) -> typing.Dict[str , typing.Any]:
+        return {
+            "vote_choice" : self.choice_id,
+            "voter_public_key" : self.elector_public_key,
+            "vote_signature" : self.signature,
+            "nonce" : self.nonce,
+        }
+
+
+def load_pending_vote(vote_message : dict) -> PendingVote | None:
+    """Returns the vote in a VOTE message, or None if the message is malformed."""
+    message_data = vote_message.get("data") or {}
+    vote_package = message_data.get("vote_package") or {}
+    elector_public_key = vote_package.get("elector_public_key")
+    signature = message_data.get("signature")
+    if isinstance(elector_public_key , str) == False or isinstance(signature , str) == False:
+        return None
+    try:
+        choice_id = int(vote_package.get("choice" , "-999"))
+    except (TypeError , ValueError):
+        return None
+    return PendingVote(elector_public_key.strip() , choice_id , vote_package.get("nonce") , signature)
+
+
+class VoteIngestor:
+    server : Server
+    pending : typing.List[PendingVote]
+    """Collects received votes into batches, a batch is checked once VOTE_BATCH_WINDOW has passed or VOTE_BATCH_SIZE votes are waiting."""
+    def __init__(self , server : Server):
+        self.server = server
+        self.pending = []
+        self.flush_handle = None
+        self.batch_lock = asyncio.Lock()
+        self.working_block = None
+        self.working_block_voters = set()
+
+        self.votes_accepted = 0
+        self.votes_rejected = 0
+
+    def submit(self , vote_message : dict) -> None:
+        vote = load_pending_vote(vote_message)
+        if vote is None:
+            self.votes_rejected += 1
+            self.server.logger.event(LOG_EVENTS.RECEIVED_VOTE_FAILED_VERIFCATION , "malformed" , tag="warn")
+            return
+
+        self.pending.append(vote)
+        if len(self.pending) >= CONSTANTS.VOTE_BATCH_SIZE:
+            self.flush()
+        elif self.flush_handle is None:
+            loop = asyncio.get_running_loop()
+            self.flush_handle = loop.call_later(CONSTANTS.VOTE_BATCH_WINDOW , self.flush)
+
+    def flush(self) -> None:
+        if self.flush_handle is not None:
+            self.flush_handle.cancel()
+            self.flush_handle = None
+        if len(self.pending) == 0:
+            return
+        batch , self.pending = self.pending , []
+        asyncio.create_task(self.process_batch(batch))
+
+    async def process_batch(self , batch : typing.List[PendingVote]) -> None:
+        # batches are counted one at a time so an elector can't be counted by two batches at once.
+        async with self.batch_lock:
+            voters = self.voters_in_working_block()
+            accepted = []
+            for each_vote , each_result in await self.check_batch(batch , voters):
+                if each_result == False:
+                    self.reject(each_vote , LOG_EVENTS.RECEIVED_VOTE_FAILED_VERIFCATION)
+                elif each_vote.key_bytes in voters:
+                    self.reject(each_vote , LOG_EVENTS.ELECTOR_ALREADY_VOTED , each_vote.elector_public_key)
+                else:
+                    voters.add(each_vote.key_bytes)
+                    accepted.append(each_vote)
+
+            added_transactions = self.server.blockchain_operations.add_transactions_to_working(
+                "ADD_VOTE" , [each_vote.transaction_data() for each_vote in accepted]
+            )
+            # the signatures dont need checking again when the block is validated.
+            self.server.block_validator.mark_verified(each_transaction.hash for each_transaction in added_transactions)
+            self.votes_accepted += len(accepted)
+            for each_vote in accepted:
+                self.server.logger.event(LOG_EVENTS.VOTE_COUNTED , each_vote.choice_id)
+
+    async def check_batch(self , batch : typing.List[PendingVote] , voters : typing.Set[bytes]) -> typing.List[typing.Tuple[PendingVote , bool]]:
+        """Runs the snapshot checks on the batch and verifies the signatures of the votes that pass them in parallel.
+        Only the first copy of a repeated vote is verified, an elector is only marked as voted once a signature is valid
+        so a forged vote can't block the elector's real one."""
+        snapshot = self.server.snapshot
+        valid_candidates = snapshot.get_candidates()
+        seen_votes = set()
+        to_verify = []
+
+        for each_vote in batch:
+            if each_vote.choice_id not in valid_candidates:
+                self.reject(each_vote , LOG_EVENTS.CANDIDATE_CHOSEN_NOT_VALID , str(each_vote.choice_id))
+                continue
+            elector_index = None if each_vote.key_bytes is None else snapshot.get_elector_index(each_vote.key_bytes)
+            if elector_index is None:
+                self.reject(each_vote , LOG_EVENTS.UNKNOWN_ELECTOR_CREDS , each_vote.elector_public_key)
+                continue
+            vote_key = (each_vote.key_bytes , each_vote.signature)
+            if snapshot.electors.is_voted(elector_index) or each_vote.key_bytes in voters or vote_key in seen_votes:
+                self.reject(each_vote , LOG_EVENTS.ELECTOR_ALREADY_VOTED , each_vote.elector_public_key)
+                continue
+            seen_votes.add(vote_key)
+            to_verify.append(each_vote)
+
+        crypto_executor = self.server.crypto_executor
+        results = await asyncio.gather(*[
+            crypto_executor.verify_vote(each_vote.elector_public_key , each_vote.signed_json() , each_vote.signature)
+            for each_vote in to_verify
+        ])
+        return list(zip(to_verify , results))
+
+    def voters_in_working_block(self) -> typing.Set[bytes]:
+        """Raw keys of the electors with a vote in the working block, the snapshot isnt updated with them until the block is
+        finalized. The set is only rebuilt when the working block changes."""
+        working_block = self.server.working_block
+        if working_block is not self.working_block:
+            self.working_block = working_block
+            self.working_block_voters = set()
+            for each_transaction in (working_block.data if working_block is not None else []):
+                if each_transaction.operation == "ADD_VOTE":
+                    self.working_block_voters.add(elector_key_bytes(each_transaction.data.get("voter_public_key" , "")))
+        return self.working_block_voters
+
+    def reject(self , vote : PendingVote , log_event : LOG_EVENTS , detail : str | None = None) -> None:
+        self.votes_rejected += 1
+        self.server.logger.event(log_event , detail if detail is not None else vote.choice_id , tag="warn")
@@ -0,0 +1,92 @@
+"""
+This module contains the wire framing used between nodes.
+
+Messages are sent as a 4 byte big-endian length header followed by the utf-8 json payload.
+The older "#" terminated framing is still available by setting constants.LEGACY_FRAMING.
+"""
+from __future__ import annotations  # Type checking
+
+# Standard library imports
+import asyncio
+import struct
+import typing
+
+# Server constants
+import server.core.constants as CONSTANTS
+
+FRAME_HEADER = struct.Struct(">I")
+LEGACY_DELIMITER = b"#"
+LEGACY_READ_SIZE = 64 * 1024
+
+
+class FrameTooLargeError(Exception):
+    """Raised when a peer announces or sends a frame larger than constants.MAX_FRAME_SIZE."""
+    pass
+
+
+def encode_frame(message_str : str) -> bytes:
+    """Takes a json message string and returns the bytes to write to a StreamWriter."""
+    return frame_payload(message_str.encode("utf-8"))
+
+
+def frame_payload(payload : bytes) -> bytes:
+    """Takes an already encoded json payload and returns the bytes to write to a StreamWriter."""
+    if CONSTANTS.LEGACY_FRAMING:
+        return payload + LEGACY_DELIMITER
+    return FRAME_HEADER.pack(len(payload)) + payload
+
+
+async def read_frames(reader : asyncio.StreamReader) -> typing.AsyncIterator[bytes]:
+    """Yields each complete frame payload received on the given reader, each connection should have its own call.
+    Returns when the connection closes, raises FrameTooLargeError if the max frame size is exceeded."""
+    if CONSTANTS.LEGACY_FRAMING:
+        async for each_frame in read_legacy_frames(reader):
+            yield each_frame
+        return
+
+    while True:
+        try:
+            header = await reader.readexactly(FRAME_HEADER.size)
+        except asyncio.IncompleteReadError:
+            return
+
+        (frame_size,) = FRAME_HEADER.unpack(header)
+        if frame_size > CONSTANTS.MAX_FRAME_SIZE:
+            raise FrameTooLargeError(f"frame of {frame_size} bytes exceeds max frame size")
+
+        try:
+            yield await reader.readexactly(frame_size)
+        except asyncio.IncompleteReadError:
+            return
+
+
+async def read_legacy_frames(reader : asyncio.StreamReader) -> typing.AsyncIterator[bytes]:
+    """Yields "#" terminated frames, the buffer is only searched from where the last search stopped
+    and consumed frames are removed once per read so large messages are parsed in linear time."""
+    buffer = bytearray()
+    search_start = 0
+    while True:
+        data = await reader.read(LEGACY_READ_SIZE)
+        if not data:
+            return
+        buffer += data
+
+        frame_start = 0
+        view = memoryview(buffer)
+        try:
+            while True:
+                delimiter_index = buffer.find(LEGACY_DELIMITER , search_start)
+                if delimiter_index == -1:
+                    break
+                frame = bytes(view[frame_start:delimiter_index])
+                frame_start = delimiter_index + 1
+                search_start = frame_start
+                if len(frame) > 0:
+                    yield frame
+        finally:
+            view.release()
+
+        del buffer[:frame_start]
+        search_start = len(buffer)
+        if search_start > CONSTANTS.MAX_FRAME_SIZE:
+            raise FrameTooLargeError(f"unterminated frame of {search_start} bytes exceeds max frame size")
@@ -0,0 +1,57 @@
+"""
+This module contains the Message class which holds a signed message in its encoded forms.
+
+The wire json is the canonical signed json with the signature and ttl_value appended as the last members,
+this means the message only needs to be json encoded once, and relays can rewrite the ttl_value of a received
+frame without decoding and re-encoding the whole message.
+"""
+from __future__ import annotations  # Type checking
+
+# Standard library imports
+import json
+import re
+import typing
+
+from server.messaging.framing import encode_frame, frame_payload
+
+TTL_SUFFIX_PATTERN = re.compile(rb'"ttl_value":\s*(\d+)\}\s*$')
+TTL_SUFFIX_SEARCH_SIZE = 64 # only the end of the message is searched for the ttl_value.
+
+
+class Message:
+    fields : dict
+    signed_json : str
+    signature : str
+    ttl_value : int
+    """A signed message, the signed json, wire json and frame are generated once and reused for every peer."""
+    def __init__(self , fields : dict , signed_json : str , signature : str , ttl_value : int = 0):
+        self.fields = fields
+        self.signed_json = signed_json
+        self.signature = signature
+        self.ttl_value = ttl_value
+        self.cached_wire_json = None
+        self.cached_frame = None
+
+    def wire_json(self) -> str:
+        if self.cached_wire_json is None:
+            wire_json = self.signed_json[:-1] + ', "signature": ' + json.dumps(self.signature)
+            if self.ttl_value > 0:
+                wire_json += f', "ttl_value": {self.ttl_value}'
+            self.cached_wire_json = wire_json + "}"
+        return self.cached_wire_json
+
+    def frame(self) -> bytes:
+        if self.cached_frame is None:
+            self.cached_frame = encode_frame(self.wire_json())
+        return self.cached_frame
+
+
+def rewrite_ttl_frame(raw_message : bytes , ttl_value : int , new_ttl_value : int) -> typing.Optional[bytes]:
+    """Returns a frame of the received message with the trailing ttl_value replaced,
+    or None if the message was not laid out with ttl_value as its last member."""
+    tail_start = max(0 , len(raw_message) - TTL_SUFFIX_SEARCH_SIZE)
+    match = TTL_SUFFIX_PATTERN.search(raw_message , tail_start)
+    if match is None or int(match.group(1)) != ttl_value:
+        return None
+    new_payload = raw_message[:match.start()] + f'"ttl_value": {new_ttl_value}}}'.encode("utf-8")
+    return frame_payload(new_payload)
@@ -33,22 +33,39 @@ from utilities.enum_encoder import EnumEncoder
 #End of imports
 
 # Initial message parsing
-async def handle_message(server : Server, message: dict[str , typing.Any], writer: StreamWriter, acceptor: bool):
-    """Takes the message and a dictionary, verifies it and calls any actions that result from the message."""#
+async def handle_message(server : Server, message: dict[str , typing.Any], writer: StreamWriter, acceptor: bool, raw_message: bytes | None = None):
+    """Takes the message and a dictionary, verifies it and calls any actions that result from the message.
+    raw_message is the received json payload, if given ttl messages are relayed from it without re-encoding."""
     code = message.get("code")
-    if is_message_valid(server , message) == False:
+    message_type = message.get("message_type")
+    # another copy of this message may be having its signature checked, wait for it so this copy is seen as a duplicate.
+    await wait_for_verification(server , message.get("id"))
+    if message_type == "plumtree" and message.get("id") in server.processed_messages:
+        server.network_estimator.record_reception(duplicate=True)
+        server.plumtree.handle_duplicate(message , writer)
+        return
+    if await is_message_valid(server , message) == False:
         return
     
     sender = message.get("sender")
     message_id = message.get("id")
     
-    server.processed_messages.add(message_id) 
-
-    message_type = message.get("message_type")
-    if message_type == "ttl":
-        asyncio.create_task(server.message_proccessor.propergate_ttl(message))
+    if message_id:
+        server.network_estimator.record_reception(duplicate=False)
+
+    if message_type == "plumtree":
+        server.plumtree.handle_gossip(message , raw_message , writer)
+    elif message_type == "ttl":
+        # the first copy of a flooded message arrives over the shortest path, so its hop count is the distance to the sender.
+        ttl_start = message.get("ttl_start")
+        if isinstance(ttl_start , int) and sender:
+            server.network_estimator.observe_distance(sender , ttl_start - int(message.get("ttl_value") or 0) + 1)
+        target_node = message.get("target_node")
+        # a message that has reached its target node doesnt need to go any further.
+        if target_node != server.node_id:
+            asyncio.create_task(server.message_proccessor.propergate_ttl(message , raw_message))
         #if the ttl message has a target node designated dont process the ttl message just propergate.
-        if message.get("target_node") is not None and message.get("target_node") != server.node_id:
+        if target_node is not None and target_node != server.node_id:
             return
 
 
@@ -76,6 +93,20 @@ async def handle_message(server : Server, message: dict[str , typing.Any], write
         
 
     #All other messages.
+    elif code == MESSAGE_CODES.REQUEST_BLOCKS.value:
+        await server.block_sync.handle_request_blocks(message)
+    elif code == MESSAGE_CODES.SEND_BLOCKS.value:
+        await server.block_sync.handle_received_blocks(message)
+    elif code == MESSAGE_CODES.REQUEST_CHECKPOINT.value:
+        await server.block_sync.handle_request_checkpoint(message)
+    elif code == MESSAGE_CODES.SEND_CHECKPOINT.value:
+        await server.block_sync.handle_received_checkpoint(message)
+    elif code == MESSAGE_CODES.PLUMTREE_IHAVE.value:
+        server.plumtree.handle_ihave(message)
+    elif code == MESSAGE_CODES.PLUMTREE_GRAFT.value:
+        server.plumtree.handle_graft(message)
+    elif code == MESSAGE_CODES.PLUMTREE_PRUNE.value:
+        server.plumtree.handle_prune(message)
     elif code == MESSAGE_CODES.REQUEST_FULL_BLOCKCHAIN.value:
         await handle_request_full_blockchain(server , message)
     elif code == MESSAGE_CODES.REQUEST_BASIC_SNAPSHOT.value:
@@ -113,25 +144,50 @@ async def handle_message(server : Server, message: dict[str , typing.Any], write
     else:
         server.logger.Log(f"Unknown message code: {code}", "warn")
 
-def is_message_valid(server : Server , message : dict[str , typing.Any]) -> bool:
+async def is_message_valid(server : Server , message : dict[str , typing.Any]) -> bool:
     if isinstance(message, dict) == False:
         return False
     
     code = message.get("code")
     if code is None:
         return False
-    
-    if (code in VERIFCATION_EXEMPT_CODES) == False and verify_message(server, message) == False:
-        return False
-        
 
+    # check for duplicates first, flooded ttl messages arrive many times and dont need the signature checked again.
     message_id = message.get("id")
     if message_id and message_id in server.processed_messages: 
+        server.network_estimator.record_reception(duplicate=True)
+        return False
+
+    # ids are only remembered for a limited window, so a message older than that could be a replay.
+    if message_id and server.processed_messages.is_timestamp_valid(message.get("timestamp")) == False:
         return False
     
+    if (code in VERIFCATION_EXEMPT_CODES) == False:
+        # the id is reserved before the signature check is awaited so other copies wait on this check instead of making their own.
+        verification = None
+        if message_id:
+            verification = asyncio.get_running_loop().create_future()
+            server.pending_verifications[message_id] = verification
+        verified = False
+        try:
+            verified = await verify_message(server, message)
+        finally:
+            if verification is not None:
+                server.pending_verifications.pop(message_id , None)
+                verification.set_result(verified)
+        if verified == False:
+            return False
+
+    if message_id:
+        server.processed_messages.add(message_id , message.get("timestamp"))
     return True
 
-def verify_message(server : Server, message : dict[str , typing.Any]):
+async def wait_for_verification(server : Server , message_id : str | None) -> None:
+    """Waits until no copy of message_id is having its signature checked, if that copy passed the id is then processed."""
+    while message_id and message_id in server.pending_verifications:
+        await asyncio.shield(server.pending_verifications[message_id])
+
+async def verify_message(server : Server, message : dict[str , typing.Any]):
     """verifies a message from the message signature by creating a shallow copy of the message dict to
     not modify the original message, returns a boolean """
     message_copy = message.copy()
@@ -156,8 +212,8 @@ def verify_message(server : Server, message : dict[str , typing.Any]):
         print("no public key str")
         return False
 
-    output =  authentication.verify_signature_rsa(
-        public_key_str, json.dumps(message_copy, sort_keys=True, cls=EnumEncoder), signature
+    output = await server.crypto_executor.verify(
+        sender, public_key_str, json.dumps(message_copy, sort_keys=True, cls=EnumEncoder), signature
     )
 
     return output
@@ -206,7 +262,7 @@ def handle_text_message(server : Server, message : dict):
     if message_data: 
         message_text = message_data.get("text" , None)
         if message_text:
-            server.logger.Log(f"{LOG_EVENTS.MESSAGE_RECIEVED.value} ({message_text})" , "warn")
+            server.logger.event(LOG_EVENTS.MESSAGE_RECIEVED , message_text , tag="warn")
 
 def handle_recieved_snapshot(server : Server, message):
     sender = message.get("sender")
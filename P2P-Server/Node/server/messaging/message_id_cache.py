@@ -0,0 +1,68 @@
+"""This module contains the cache of processed message ids used to drop duplicate and replayed messages."""
+import time
+import typing
+
+class MessageIdCache:
+    window : float
+    max_size : int
+    max_clock_skew : float
+    current : set
+    previous : set
+    forgotten_newest : float
+    """A rotating pair of id sets, bounded by both time and size.
+
+    Ids are held for at least one window unless the size limit forces an early rotation. Each generation remembers the
+    newest message timestamp added to it, when a generation is dropped messages with a timestamp up to that one are
+    rejected, so an id that has been forgotten can't be replayed. Early rotations shrink the accepted window instead of
+    letting the cache grow."""
+    def __init__(self , window : float , max_size : int , max_clock_skew : float , clock : typing.Callable[[], float] = time.time):
+        self.window = window
+        self.max_size = max(2 , max_size)
+        self.max_clock_skew = max_clock_skew
+        self.clock = clock
+
+        now = self.clock()
+        self.current = set()
+        self.previous = set()
+        self.current_started = now
+        self.current_newest = float("-inf") # newest message timestamp added to each generation.
+        self.previous_newest = float("-inf")
+        self.forgotten_newest = float("-inf") # newest message timestamp of any id that has been dropped.
+
+    def rotate_if_needed(self) -> None:
+        now = self.clock()
+        if now - self.current_started >= self.window or len(self.current) >= self.max_size // 2:
+            self.forgotten_newest = max(self.forgotten_newest , self.previous_newest)
+            self.previous = self.current
+            self.previous_newest = self.current_newest
+            self.current = set()
+            self.current_started = now
+            self.current_newest = float("-inf")
+
+    def add(self , message_id : str , timestamp : float | None = None) -> None:
+        """Remembers the id of a message sent at timestamp, messages this node creates are sent now."""
+        self.rotate_if_needed()
+        self.current.add(message_id)
+        self.current_newest = max(self.current_newest , self.clock() if timestamp is None else float(timestamp))
+
+    def oldest_accepted_timestamp(self) -> float:
+        """Messages sent at or before this time may have been forgotten so can't be checked for duplicates."""
+        return max(self.clock() - self.window , self.forgotten_newest)
+
+    def is_timestamp_valid(self , timestamp : typing.Any) -> bool:
+        try:
+            timestamp = float(timestamp)
+        except (TypeError , ValueError):
+            return False
+        if timestamp > self.clock() + self.max_clock_skew:
+            return False
+        if timestamp <= self.forgotten_newest:
+            return False
+        return timestamp >= self.clock() - self.window
+
+    def __contains__(self , message_id : str) -> bool:
+        self.rotate_if_needed()
+        return message_id in self.current or message_id in self.previous
+
+    def __len__(self) -> int:
+        return len(self.current) + len(self.previous)
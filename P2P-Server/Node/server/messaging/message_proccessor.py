@@ -6,13 +6,13 @@ import os
 import json
 import hashlib
 import time
-import traceback
 
 #local Imports
 import utilities.authentication as authentication
 import server.core.constants as CONSTANTS
 from utilities.enum_encoder import EnumEncoder
-import math
+from server.messaging.framing import encode_frame
+from server.messaging.message import Message, rewrite_ttl_frame
 
 # Type checking imports
 from typing import TYPE_CHECKING
@@ -23,11 +23,16 @@ if TYPE_CHECKING:
 
 class MessageProccessor: 
     server : Server
+    routed_messages : int
+    flooded_messages : int
     def __init__(self , server : Server):
         self.server = server
+        self.routed_messages = 0 # targeted ttl messages sent to a single next hop.
+        self.flooded_messages = 0 # ttl messages sent to every connection.
 
     # put ttl value in here becuase it should be added post signing, just makes it easier.
-    def process_message(self , pre_json_message , ttl_value=0):
+    async def process_message(self , pre_json_message , ttl_value=0) -> Message:
+        """Signs the message, the message is only json encoded once and its frame can be written to every connection."""
         pre_json_message["sender"] = self.server.node_id
         nonce_str = os.urandom(16).hex()
         pre_json_message["nonce"] = nonce_str
@@ -35,88 +40,132 @@ class MessageProccessor:
         data_to_hash = str(pre_json_message["timestamp"]) + pre_json_message["sender"] + nonce_str
         message_id = hashlib.sha256(data_to_hash.encode('utf-8')).hexdigest()
         pre_json_message["id"] = message_id
-        self.server.processed_messages.add(message_id)
+        self.server.processed_messages.add(message_id , pre_json_message["timestamp"])
         message_to_sign_str = json.dumps(pre_json_message , sort_keys=True , cls=EnumEncoder)
 
-        pre_json_message["signature"] = authentication.generate_signature_str_rsa(self.server.node_private_key , message_to_sign_str)
+        signature = await self.server.crypto_executor.sign(message_to_sign_str)
+        pre_json_message["signature"] = signature
         if ttl_value > 0: pre_json_message["ttl_value"] = ttl_value
-        str_message = json.dumps(pre_json_message , sort_keys=True , cls=EnumEncoder)
-        str_message += "#"
-        return str_message
+        return Message(pre_json_message , message_to_sign_str , signature , ttl_value)
     
-    def calculate_time_to_live(self): #need to rethink this
-        connections = []
-        for each_peer in self.server.peer_directory.values():
-            connections.append(each_peer.get("connections", 0))
-
-        n = max(1, len(connections))
-        k = CONSTANTS.MIN_CONNECTIONS
-
-        return max(1, math.ceil(math.log(n, max(1, k))) + 1)
+    def calculate_time_to_live(self) -> int:
+        """Sizes the ttl to reach every node, from the measured distance to the furthest node plus a safety margin."""
+        route_distances = {destination : route.hops for destination , route in self.server.routing_table.routes.items()}
+        for each_connection in self.server.connections:
+            if each_connection.node_id is not None:
+                route_distances[each_connection.node_id] = 1
+        network_size = max(1 , len(self.server.peer_directory)) # the peer directory includes this node.
+        return self.server.network_estimator.time_to_live(network_size , len(self.server.connections) , route_distances)
 
-    async def ttl_broadcast(self , pre_json_message , target_node_id:str=None):
+    def send_to_all(self , frame : bytes) -> None:
+        """Queues the frame on every connection's outbound queue, this never waits on a slow peer."""
+        for each_connection in self.server.connections:
+            each_connection.outbound.send(frame)
+
+    def route_frame(self , frame : bytes , target_node_id : str) -> bool:
+        """Sends the frame to the next hop on the shortest known route to the target, returns False if there is no route."""
+        connection = self.server.connections.get_by_node_id(target_node_id)
+        if connection is None:
+            route = self.server.routing_table.get_route(target_node_id)
+            if route is None:
+                return False
+            connection = self.server.connections.get_by_node_id(route.next_hop)
+            if connection is None:
+                return False
+        if connection.outbound.send(frame) == False:
+            return False
+        self.routed_messages += 1
+        return True
+
+    def flood_frame(self , frame : bytes) -> None:
+        self.flooded_messages += 1
+        self.send_to_all(frame)
+
+    async def ttl_broadcast(self , pre_json_message , target_node_id:str=None , flood:bool=True) -> bool:
+        """Floods the message, or sends it along the shortest known route if it has a target node.
+        With flood False a targeted message with no route isn't sent, returns False if the message wasn't sent."""
         pre_json_message["message_type"] = "ttl"
         ttl_value = self.calculate_time_to_live()
         if target_node_id:
             pre_json_message["target_node"] = target_node_id
-
-        str_message = self.process_message(pre_json_message , ttl_value)
-        for eachConnection in self.server.connections:
-            try:
-                writer = eachConnection.get("writer")
-                writer.write(str_message.encode())
-                await writer.drain()
-            except Exception as e:
-                self.server.logger.Log(f"Failed to send message to a client: {e}" , "error")
-
-    async def propergate_ttl(self , pre_json_message):
+            route = self.server.routing_table.get_route(target_node_id)
+            if route is not None:
+                ttl_value = max(ttl_value , route.hops) # the ttl must last the whole route.
+        # signed so receivers can measure how many hops the message took.
+        pre_json_message["ttl_start"] = ttl_value
+
+        frame = (await self.process_message(pre_json_message , ttl_value)).frame()
+        # targeted messages follow the shortest route, flooding is only used when no route is known.
+        if target_node_id and self.route_frame(frame , target_node_id):
+            return True
+        if flood == False:
+            return False
+        self.flood_frame(frame)
+        return True
+
+    async def broadcast(self , pre_json_message) -> None:
+        """Sends a message to every node using constants.BROADCAST_MODE."""
+        if CONSTANTS.BROADCAST_MODE == "plumtree":
+            await self.server.plumtree.broadcast(pre_json_message)
+        else:
+            await self.ttl_broadcast(pre_json_message)
+
+    async def propergate_ttl(self , pre_json_message , raw_message : bytes | None = None):
         ttl_value = int(pre_json_message.get("ttl_value") or 0)
         if ttl_value <= 0:
             return
-        pre_json_message["ttl_value"] = ttl_value-1
-        str_message = json.dumps(pre_json_message , sort_keys=True, cls=EnumEncoder)
-        # we dont want to process_message because that will change timestamp and sender ect just add message seperator char.
-        str_message += "#"
-
-        for eachConnection in self.server.connections:
-            try:
-                writer = eachConnection.get("writer")
-                writer.write(str_message.encode())
-                await writer.drain()
-            except Exception as e:
-                self.server.logger.Log(f"Failed to send message to a client: {e}" , "error")
-                traceback.print_exc()
+        # we dont want to process_message because that will change timestamp and sender ect.
+        # forward the received frame with only the ttl rewritten, re-encoding is only needed if the ttl isnt the last member.
+        frame = None
+        if raw_message is not None:
+            frame = rewrite_ttl_frame(raw_message , ttl_value , ttl_value - 1)
+        if frame is None:
+            pre_json_message["ttl_value"] = ttl_value-1
+            str_message = json.dumps(pre_json_message , sort_keys=True, cls=EnumEncoder)
+            frame = encode_frame(str_message)
+
+        target_node_id = pre_json_message.get("target_node")
+        if target_node_id and self.route_frame(frame , target_node_id):
+            return
+        self.flood_frame(frame)
 
     async def direct_broadcast(self, pre_json_message):
         # preprocess message
         pre_json_message["message_type"] = "direct"
-        str_message = self.process_message(pre_json_message)
+        frame = (await self.process_message(pre_json_message)).frame()
+
+        self.send_to_all(frame)
+
 
-        for eachConnection in self.server.connections:
-            try:
-                writer = eachConnection.get("writer")
-                writer.write(str_message.encode())
-                await writer.drain()
-            except Exception as e:
-                self.server.logger.Log(f"Failed to send message to a client: {e}" , "error")
+    async def send_to_node(self , node_id : str , pre_json_message , address : tuple | None = None , flood : bool = True) -> bool:
+        """Sends a direct message to a single node, over the connection to it if it is a neighbor or otherwise a temp connection
+        to its address. If no address is given or known the message is sent as a targeted ttl broadcast, which with flood
+        False is only sent if there is a route. Returns False if the message wasn't sent."""
+        connection = self.server.connections.get_by_node_id(node_id)
+        if connection is not None:
+            address = connection.address()
+        elif address is None:
+            node_entry = self.server.global_node_table.get(node_id) or {}
+            if node_entry.get("host") is not None and node_entry.get("port") is not None:
+                address = (node_entry.get("host") , int(node_entry.get("port")))
 
+        if address is None:
+            return await self.ttl_broadcast(pre_json_message , target_node_id=node_id , flood=flood)
+        await self.send_direct_message(address[0] , address[1] , pre_json_message)
+        return True
 
     async def send_direct_message(self, address , port , pre_json_message):
         # Preprocess message.
         pre_json_message["message_type"] = "direct"
-        str_message = self.process_message(pre_json_message)
-
-        for each_connection in self.server.connections:
-            try:
-                if each_connection.get("host") == address and each_connection.get("port") == port:
-                    writer = each_connection.get("writer")
-                    writer.write((str_message).encode())
-                    await writer.drain()
-                    self.server.logger.Log(f"Message sent to {address}" , "info")
-                    return
-            except Exception as e:
-                self.server.logger.Log(f"Failed to send message to {address}: {e}" , "error")
-                return
+        frame = (await self.process_message(pre_json_message)).frame()
+
+        connection = self.server.connections.get_by_address(address , port)
+        if connection is not None:
+            if connection.outbound.send(frame):
+                self.server.logger.Log(f"Message sent to {address}" , "info")
+            else:
+                self.server.logger.Log(f"Failed to send message to {address}: outbound queue unavailable" , "error")
+            return
 
         self.server.logger.Log(f"Failed to send message to {address} no direct connection")
 
@@ -125,7 +174,7 @@ class MessageProccessor:
         try:
             await self.server.set_up_temp_connection(address , port)
             writer = self.server.temp_connections[(address,port)].get("writer")
-            writer.write((str_message).encode())
+            writer.write(frame)
             await writer.drain()
             await self.server.close_temp_connection(address , port)
         except:
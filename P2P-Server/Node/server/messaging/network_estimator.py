@@ -0,0 +1,68 @@
+"""
+This module contains the network estimator used to size the ttl of flooded messages.
+
+The distance to other nodes is measured from the hop count of received ttl messages and from the routes learned through
+discovery gossip. A message needs a ttl of the distance to the furthest node to reach every node, when not every node's
+distance is known yet the ttl is estimated from the network size and node degree instead.
+"""
+import math
+import time
+import typing
+
+class NetworkEstimator:
+    distances : typing.Dict[str , typing.Tuple[int , float]]
+    safety_margin : int
+    max_ttl : int
+    window : float
+    unique_receptions : int
+    duplicate_receptions : int
+    """Estimates the ttl needed to reach the whole network and counts how often messages are received more than once."""
+    def __init__(self , safety_margin : int , max_ttl : int , window : float , clock : typing.Callable[[], float] = time.time):
+        self.distances = {} # node_id : (hops , observed_at)
+        self.safety_margin = safety_margin
+        self.max_ttl = max(1 , max_ttl)
+        self.window = window
+        self.clock = clock
+        self.unique_receptions = 0
+        self.duplicate_receptions = 0
+
+    def observe_distance(self , node_id : str , hops : int) -> None:
+        """Records the hop count of a message received from node_id, only the first copy of a message should be observed."""
+        if hops < 1:
+            return
+        self.distances[node_id] = (hops , self.clock())
+
+    def known_distances(self , route_distances : typing.Dict[str , int]) -> typing.Dict[str , int]:
+        """Merges the observed distances with the route hop counts, keeping the shortest for each node."""
+        now = self.clock()
+        known = {}
+        for node_id , (hops , observed_at) in list(self.distances.items()):
+            if now - observed_at > self.window:
+                del self.distances[node_id] # nodes that have gone quiet may have left.
+            else:
+                known[node_id] = hops
+        for node_id , hops in route_distances.items():
+            known[node_id] = min(hops , known.get(node_id , hops))
+        return known
+
+    def time_to_live(self , network_size : int , degree : int , route_distances : typing.Dict[str , int]) -> int:
+        """network_size includes this node, degree is the number of connections this node has."""
+        known = self.known_distances(route_distances)
+        furthest = max(known.values() , default=1)
+
+        # nodes without a measured distance could be further away than any measured one.
+        if len(known) < network_size - 1:
+            branching = max(2 , degree)
+            estimated = math.ceil(math.log(max(2 , network_size)) / math.log(branching))
+            furthest = max(furthest , estimated)
+
+        return min(self.max_ttl , furthest + self.safety_margin)
+
+    def record_reception(self , duplicate : bool) -> None:
+        if duplicate:
+            self.duplicate_receptions += 1
+        else:
+            self.unique_receptions += 1
+
+    def duplicates_per_message(self) -> float:
+        return self.duplicate_receptions / max(1 , self.unique_receptions)
@@ -0,0 +1,82 @@
+"""
+This module contains the per-connection outbound queue.
+
+Each connection owns a bounded queue of frames and a writer task, broadcasts only enqueue the frame
+so one slow peer can't hold up delivery to the others. When a queue is full the overflow policy decides
+if the frame is dropped or the peer is disconnected.
+"""
+from __future__ import annotations  # Type checking
+
+# Standard library imports
+import asyncio
+import typing
+
+OVERFLOW_POLICIES = ("drop" , "disconnect")
+
+
+class OutboundQueue:
+    writer : asyncio.StreamWriter
+    queue : asyncio.Queue
+    overflow_policy : str
+    frames_sent : int
+    frames_dropped : int
+    """A bounded queue of frames written to a single connection by its own task."""
+    def __init__(self , writer : asyncio.StreamWriter , max_size : int , overflow_policy : str = "drop" , on_error : typing.Callable[[str] , None] | None = None):
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"{overflow_policy} is not a valid overflow policy, expected one of {OVERFLOW_POLICIES}")
+        self.writer = writer
+        self.queue = asyncio.Queue(max(1 , max_size))
+        self.overflow_policy = overflow_policy
+        self.on_error = on_error
+        self.frames_sent = 0
+        self.frames_dropped = 0
+        self.closed = False
+        self.writer_task = asyncio.create_task(self.writer_loop())
+
+    def send(self , frame : bytes) -> bool:
+        """Queues the frame without blocking, returns False if the frame was not queued."""
+        if self.closed:
+            return False
+        try:
+            self.queue.put_nowait(frame)
+            return True
+        except asyncio.QueueFull:
+            self.frames_dropped += 1
+            if self.overflow_policy == "disconnect":
+                self.report_error("outbound queue full, disconnecting peer")
+                self.close()
+                self.writer.close() # the connection's reader sees the close and removes the connection.
+            else:
+                self.report_error("outbound queue full, frame dropped")
+            return False
+
+    def queue_depth(self) -> int:
+        return self.queue.qsize()
+
+    async def writer_loop(self) -> None:
+        try:
+            while True:
+                frame = await self.queue.get()
+                self.writer.write(frame)
+                # write everything already queued before waiting on a single drain.
+                while self.queue.empty() == False:
+                    self.writer.write(self.queue.get_nowait())
+                    self.frames_sent += 1
+                self.frames_sent += 1
+                await self.writer.drain()
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            self.report_error(f"failed to write to peer: {e}")
+        finally:
+            self.closed = True
+
+    def report_error(self , error : str) -> None:
+        if self.on_error is not None:
+            self.on_error(error)
+
+    def close(self) -> None:
+        """Stops the writer task, frames still queued are discarded."""
+        self.closed = True
+        if self.writer_task.done() == False:
+            self.writer_task.cancel()
@@ -0,0 +1,192 @@
+"""
+This module contains the plumtree broadcast used to spread blocks without flooding every copy to every neighbor.
+
+Each neighbor is either eager or lazy. Messages are pushed in full to eager neighbors, lazy neighbors are only sent the
+ids of the messages in batched IHAVE messages. The first copy of a message to arrive keeps its sender eager, a neighbor
+that sends a copy that was already received is sent a PRUNE and becomes lazy, so the eager links settle into a spanning
+tree. When an IHAVE arrives for a message that doesn't follow within the graft timeout the announcing neighbor is sent a
+GRAFT, which makes it eager again and has it send the message, this repairs the tree when an eager link is lost.
+"""
+from __future__ import annotations  # Type checking
+
+# Standard library imports
+import asyncio
+import json
+import typing
+from collections import OrderedDict
+
+# Type checking imports
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from server.core.server import Server
+    from server.core.connection_registry import Connection
+    from server.messaging.message import Message
+
+# Server constants
+import server.core.constants as CONSTANTS
+from server.core.constants import MESSAGE_CODES
+from server.messaging.framing import encode_frame, frame_payload
+from utilities.enum_encoder import EnumEncoder
+
+
+class Plumtree:
+    server : Server
+    lazy_peers : typing.Set[str]
+    message_cache : OrderedDict[str , bytes]
+    pending_ihave : typing.Dict[str , typing.List[str]]
+    missing : typing.Dict[str , typing.List[str]]
+    """Eager push along a spanning tree of the neighbor connections, with lazy push of message ids to the other neighbors.
+    Neighbors are eager unless they are in lazy_peers, so new connections start eager."""
+    def __init__(self , server : Server):
+        self.server = server
+        self.lazy_peers = set()
+        self.message_cache = OrderedDict() # message_id : frame, kept to answer GRAFT messages.
+        self.pending_ihave = {} # node_id : message ids not announced to it yet.
+        self.ihave_handle = None
+        self.missing = {} # message_id : node ids that announced it, in the order the IHAVE messages arrived.
+        self.graft_handles = {}
+
+        self.eager_pushes = 0
+        self.lazy_pushes = 0
+        self.grafts = 0
+        self.prunes = 0
+
+    def neighbor_id(self , writer : asyncio.StreamWriter) -> str | None:
+        connection = self.server.connections.get_by_writer(writer)
+        return None if connection is None else connection.node_id
+
+    def split_peers(self , exclude : str | None) -> typing.Tuple[typing.List[Connection] , typing.List[Connection]]:
+        """Returns the (eager , lazy) connections, leaving out the neighbor the message came from."""
+        eager = []
+        lazy = []
+        for each_connection in self.server.connections:
+            if each_connection.node_id is not None and each_connection.node_id == exclude:
+                continue
+            if each_connection.node_id in self.lazy_peers:
+                lazy.append(each_connection)
+            else:
+                eager.append(each_connection)
+        return eager , lazy
+
+    # dissemination
+
+    async def broadcast(self , pre_json_message : dict) -> None:
+        pre_json_message["message_type"] = "plumtree"
+        message : Message = await self.server.message_proccessor.process_message(pre_json_message)
+        self.push(message.fields["id"] , message.frame() , None)
+
+    def handle_gossip(self , message : dict , raw_message : bytes | None , writer : asyncio.StreamWriter) -> None:
+        """Relays the first copy of a plumtree message, the message has already been validated."""
+        sender = self.neighbor_id(writer)
+        if sender is not None:
+            self.lazy_peers.discard(sender)
+        if raw_message is not None:
+            frame = frame_payload(raw_message)
+        else:
+            frame = encode_frame(json.dumps(message , sort_keys=True , cls=EnumEncoder))
+        self.push(message.get("id") , frame , sender)
+
+    def push(self , message_id : str , frame : bytes , sender : str | None) -> None:
+        self.cancel_graft(message_id)
+        self.message_cache[message_id] = frame
+        while len(self.message_cache) > CONSTANTS.PLUMTREE_CACHE_SIZE:
+            self.message_cache.popitem(last=False)
+
+        eager , lazy = self.split_peers(sender)
+        for each_connection in eager:
+            each_connection.outbound.send(frame)
+            self.eager_pushes += 1
+        for each_connection in lazy:
+            self.pending_ihave.setdefault(each_connection.node_id , []).append(message_id)
+            self.lazy_pushes += 1
+        if len(self.pending_ihave) > 0 and self.ihave_handle is None:
+            loop = asyncio.get_running_loop()
+            self.ihave_handle = loop.call_later(CONSTANTS.PLUMTREE_IHAVE_INTERVAL , self.flush_ihave)
+
+    def handle_duplicate(self , message : dict , writer : asyncio.StreamWriter) -> None:
+        """A copy of a message that was already received, the link it came over isn't needed in the tree."""
+        sender = self.neighbor_id(writer)
+        if sender is None or sender in self.lazy_peers:
+            return
+        self.lazy_peers.add(sender)
+        self.prunes += 1
+        asyncio.create_task(self.send_control(sender , MESSAGE_CODES.PLUMTREE_PRUNE , []))
+
+    # control messages
+
+    def flush_ihave(self) -> None:
+        self.ihave_handle = None
+        pending , self.pending_ihave = self.pending_ihave , {}
+        for node_id , message_ids in pending.items():
+            asyncio.create_task(self.send_control(node_id , MESSAGE_CODES.PLUMTREE_IHAVE , message_ids))
+
+    async def send_control(self , node_id : str , code : MESSAGE_CODES , message_ids : typing.List[str]) -> None:
+        if self.server.connections.get_by_node_id(node_id) is None:
+            return # control messages are only for neighbors.
+        control_message = {
+            "code" : code.value,
+            "data" : {
+                "message_ids" : message_ids,
+            }
+        }
+        await self.server.message_proccessor.send_to_node(node_id , control_message)
+
+    def handle_ihave(self , message : dict) -> None:
+        sender = message.get("sender")
+        message_ids = (message.get("data") or {}).get("message_ids" , [])
+        for each_message_id in message_ids:
+            if each_message_id in self.server.processed_messages:
+                continue
+            announcers = self.missing.setdefault(each_message_id , [])
+            if sender not in announcers:
+                announcers.append(sender)
+            if each_message_id not in self.graft_handles:
+                self.start_graft_timer(each_message_id)
+
+    def start_graft_timer(self , message_id : str) -> None:
+        loop = asyncio.get_running_loop()
+        self.graft_handles[message_id] = loop.call_later(CONSTANTS.PLUMTREE_GRAFT_TIMEOUT , self.graft_timed_out , message_id)
+
+    def graft_timed_out(self , message_id : str) -> None:
+        """The message was announced but hasn't arrived, it is requested from the next neighbor that announced it."""
+        self.graft_handles.pop(message_id , None)
+        announcers = self.missing.get(message_id)
+        if not announcers or message_id in self.server.processed_messages:
+            self.missing.pop(message_id , None)
+            return
+        announcer = announcers.pop(0)
+        self.lazy_peers.discard(announcer)
+        self.grafts += 1
+        asyncio.create_task(self.send_control(announcer , MESSAGE_CODES.PLUMTREE_GRAFT , [message_id]))
+        # keep a timer running in case the announcer has gone, the next announcer is tried.
+        if announcers:
+            self.start_graft_timer(message_id)
+        else:
+            del self.missing[message_id]
+
+    def cancel_graft(self , message_id : str) -> None:
+        handle = self.graft_handles.pop(message_id , None)
+        if handle is not None:
+            handle.cancel()
+        self.missing.pop(message_id , None)
+
+    def handle_graft(self , message : dict) -> None:
+        sender = message.get("sender")
+        connection = self.server.connections.get_by_node_id(sender)
+        if connection is None:
+            return
+        self.lazy_peers.discard(sender)
+        for each_message_id in (message.get("data") or {}).get("message_ids" , []):
+            frame = self.message_cache.get(each_message_id)
+            if frame is not None:
+                connection.outbound.send(frame)
+
+    def handle_prune(self , message : dict) -> None:
+        sender = message.get("sender")
+        if self.server.connections.get_by_node_id(sender) is not None:
+            self.lazy_peers.add(sender)
+
+    def remove_neighbor(self , node_id : str) -> None:
+        self.lazy_peers.discard(node_id)
+        self.pending_ihave.pop(node_id , None)
@@ -0,0 +1,97 @@
+"""
+This module contains the routing table used to forward targeted ttl messages along a shortest path.
+
+Routes are learned distance-vector style from the connection discovery gossip, each node advertises the hop count and
+next hop of every node it can reach, its neighbors keep the shortest route through any neighbor. Routes that aren't
+re-advertised expire, so routes through nodes that have left are dropped and targeted messages fall back to flooding.
+"""
+import time
+import typing
+
+def is_route_valid(advertised_route : typing.Any) -> bool:
+    """True if an advertised route is a [hops , next_hop] pair with a non negative int hop count and a str next hop."""
+    if isinstance(advertised_route , list) == False or len(advertised_route) != 2:
+        return False
+    hops , next_hop = advertised_route
+    # bool is a subclass of int but isnt a hop count.
+    return isinstance(hops , int) and isinstance(hops , bool) == False and hops >= 0 and isinstance(next_hop , str)
+
+
+class Route:
+    """The next hop towards a destination node, hops is the total path length."""
+    __slots__ = ("next_hop" , "hops" , "updated_at")
+    next_hop : str
+    hops : int
+    updated_at : float
+
+    def __init__(self , next_hop : str , hops : int , updated_at : float):
+        self.next_hop = next_hop
+        self.hops = hops
+        self.updated_at = updated_at
+
+
+class RoutingTable:
+    routes : typing.Dict[str , Route]
+    max_hops : int
+    expiry : float
+    """Shortest known routes to nodes that aren't neighbors, neighbors are always routed to directly."""
+    def __init__(self , max_hops : int , expiry : float , clock : typing.Callable[[], float] = time.time):
+        self.routes = {}
+        self.max_hops = max_hops
+        self.expiry = expiry
+        self.clock = clock
+
+    def update_from_neighbor(self , neighbor_id : str , advertised_routes : typing.Dict[str , typing.Any] , self_id : str) -> None:
+        """Updates the table from the routes a neighbor advertised, advertised_routes maps node id to [hops , next_hop].
+        The routes come from another node so any entry that isn't in that form is skipped."""
+        if isinstance(advertised_routes , dict) == False:
+            return
+        now = self.clock()
+        for destination , advertised_route in advertised_routes.items():
+            if is_route_valid(advertised_route) == False:
+                continue
+            hops , next_hop = advertised_route
+            if destination == self_id or destination == neighbor_id:
+                continue
+            # split horizon, a route the neighbor learned through this node would loop back here.
+            if next_hop == self_id:
+                continue
+            hops = hops + 1
+            if hops > self.max_hops:
+                continue
+
+            current = self.routes.get(destination)
+            if current is None or self.is_expired(current , now) or hops < current.hops or current.next_hop == neighbor_id:
+                self.routes[destination] = Route(neighbor_id , hops , now)
+
+    def is_expired(self , route : Route , now : float) -> bool:
+        return now - route.updated_at > self.expiry
+
+    def get_route(self , destination : str) -> Route | None:
+        route = self.routes.get(destination)
+        if route is None:
+            return None
+        if self.is_expired(route , self.clock()):
+            del self.routes[destination]
+            return None
+        return route
+
+    def remove_neighbor(self , neighbor_id : str) -> None:
+        """Drops every route through a neighbor that has disconnected."""
+        self.routes = {destination : route for destination , route in self.routes.items() if route.next_hop != neighbor_id}
+
+    def advertise(self , self_id : str , neighbor_ids : typing.Iterable[str]) -> typing.Dict[str , typing.List]:
+        """Returns the routes to send to neighbors, including this node and its neighbors."""
+        now = self.clock()
+        advertised = {self_id : [0 , self_id]}
+        for each_neighbor_id in neighbor_ids:
+            advertised[each_neighbor_id] = [1 , each_neighbor_id]
+        for destination , route in list(self.routes.items()):
+            if self.is_expired(route , now):
+                del self.routes[destination]
+            elif destination not in advertised:
+                advertised[destination] = [route.hops , route.next_hop]
+        return advertised
+
+    def __len__(self) -> int:
+        return len(self.routes)
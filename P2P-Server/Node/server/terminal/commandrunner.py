@@ -55,9 +55,11 @@ class CommandRunner:
         self.CommandMappings["add_candidate"] = self.add_candidate
         self.CommandMappings["vote"] = self.vote
         self.CommandMappings["pause"] = self.pause
+        self.CommandMappings["wait_event"] = self.wait_event
         self.CommandMappings["show_votes"] = self.show_votes
         self.CommandMappings["sv"] = self.show_votes
         self.CommandMappings["set_block_proposal_time"] = self.set_block_proposal_time
+        self.CommandMappings["metrics"] = self.show_metrics
 
         self.CommandMessages = {}
         self.CommandMessages["help"] = "Displays all valid commands."
@@ -77,7 +79,9 @@ class CommandRunner:
         self.CommandMessages["add_candidate"] = 'Adds a candidate, Example add_candidate "Mr Smith" 1.'
         self.CommandMessages["vote"] = "Casts a vote for a given candidate_id, Example: vote 1."
         self.CommandMessages["pause"] = "Pauses the input thread for a given amount of seconds, Example: pause 10."
+        self.CommandMessages["wait_event"] = "Pauses the input thread until this node logs the event or the timeout passes, Example: wait_event VOTE_COUNTED 15."
         self.CommandMessages["show_votes"] = "Shows the current tally of vote as recorded on the local blockchain."
+        self.CommandMessages["metrics"] = "Shows performance metrics such as the crypto executor queue depth."
         self.Display = Display(self.program_state)
         self.Display.initial_message()
 
@@ -104,6 +108,17 @@ class CommandRunner:
             seconds = float(match.group(1))
             self.program_state["hold_time"] = seconds
 
+    def wait_event(self , unparsedtext="") -> None:
+        server : Server = self.program_state.get("server")
+        match = re.match(r"wait_event\s+(\w+)(?:\s+(\d+(?:\.\d+)?))?", unparsedtext)
+        if match and server is not None:
+            event_name = match.group(1)
+            timeout = float(match.group(2) or 30)
+            if server.logger.wait_for_event(event_name , timeout) == False:
+                print(f"[IO] {event_name} was not logged within {timeout} seconds.")
+        else:
+            print("[IO] Invalid command usage, should be wait_event <EVENT> <timeout>")
+
     def set_block_proposal_time(self , unparsedtext="") -> None:
         server : Server = self.program_state.get("server")
         match = re.match(r'set_block_proposal_time\s+(\d+(?:\.\d+)?)', unparsedtext)
@@ -117,6 +132,9 @@ class CommandRunner:
     def show_votes(self , unparsedtext="") -> None:
         self.Display.show_votes()
 
+    def show_metrics(self , unparsedtext="") -> None:
+        self.Display.show_metrics()
+
     async def vote(self , unparsedtext="") -> None:
         server : Server = self.program_state.get("server")
         match = re.match(r'vote (\d+)', unparsedtext)
@@ -141,7 +159,7 @@ class CommandRunner:
         )
 
     def log(self , unparsedtext=""):
-        self.program_state["server"].Logger.display_logs()
+        self.program_state["server"].logger.display_logs()
 
     def peer_directory(self , unparsedtext=""):
         self.Display.show_peer_directory()
@@ -178,10 +196,10 @@ class CommandRunner:
 
     def load_electors(self , unparsedtext=""):
         server : Server = self.program_state.get("server") 
-        self.server_thread.loop.call_soon_threadsafe(
-            validator_actions.load_all_electors,
-            server
-        ) 
+        asyncio.run_coroutine_threadsafe(
+            validator_actions.load_all_electors(server),
+            self.server_thread.loop
+        )
 
     def load_credentials(self , unparsedtext=""):
         server = self.program_state.get("server") 
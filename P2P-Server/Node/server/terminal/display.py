@@ -32,9 +32,10 @@ class Display():
         print("live connections:" + str(len(server.connections)) +"\n")
         for each_connection in server.connections:
             line = ""
-            line += f"Node_Id : {each_connection.get("node_id" , "unknown")} "
-            line += f"Host : {each_connection.get("host" , "unkown")} "
-            line += f"Port : {each_connection.get("port" , "unkown")} "
+            line += f"Node_Id : {each_connection.node_id or "unknown"} "
+            line += f"Host : {each_connection.host} "
+            line += f"Port : {each_connection.port} "
+            line += f"Queued : {each_connection.outbound.queue_depth()} "
             print(line)
         print("-"*36)
     
@@ -100,6 +101,25 @@ class Display():
         print(f"Number of validators : {len(snapshot.validator_addresses)}")
         print("-"*36)
 
+    def show_metrics(self) -> None:
+        server : Server = self.progam_state.get("server")
+        crypto_executor = server.crypto_executor
+        print("Metrics".center(36 , "-"))
+        print(f"Crypto Mode : {crypto_executor.mode}")
+        print(f"Crypto Queue Depth : {crypto_executor.queue_depth()}")
+        print(f"Crypto Peak Queue Depth : {crypto_executor.peak_queue_depth}")
+        print(f"Crypto Jobs Completed : {crypto_executor.jobs_completed}")
+        print(f"Known Routes : {len(server.routing_table)}")
+        print(f"Routed Messages : {server.message_proccessor.routed_messages}")
+        print(f"Flooded Messages : {server.message_proccessor.flooded_messages}")
+        print(f"Current TTL : {server.message_proccessor.calculate_time_to_live()}")
+        print(f"Plumtree Eager/Lazy Pushes : {server.plumtree.eager_pushes}/{server.plumtree.lazy_pushes}")
+        print(f"Plumtree Grafts/Prunes : {server.plumtree.grafts}/{server.plumtree.prunes}")
+        print(f"Votes Accepted/Rejected : {server.vote_ingestor.votes_accepted}/{server.vote_ingestor.votes_rejected}")
+        print(f"Blocks Validated/Rejected : {server.block_validator.blocks_validated}/{server.block_validator.blocks_rejected}")
+        print(f"Duplicate Receptions Per Message : {server.network_estimator.duplicates_per_message():.2f}")
+        print("-"*36)
+
     def show_validators(self) -> None:
         snapshot : Snapshot = self.progam_state.get("server").snapshot
         validators : list = snapshot.get_validators()
@@ -10,7 +10,8 @@ params = {
         add_candidate "A" 1
         pause 0.5
         le
-        pause 7
+        wait_event VOTE_COUNTED 15
+        wait_event VOTES_FINALIZED 15
         quit"""
     },
     "2" : { #voting node
@@ -21,11 +22,12 @@ params = {
         lc
         pause 5
         vote 1
+        wait_event OWN_VOTE_DETECTED 15
         quit"""
     }
 }
 
-expected_in_bootstrap_log = ["SERVER_STARTED" , "ADD_CANDIDATE" , "VOTE_COUNTED"]
+expected_in_bootstrap_log = ["SERVER_STARTED" , "ADD_CANDIDATE" , "VOTE_COUNTED" , "VOTES_FINALIZED"]
 expected_in_voter_log = ["SERVER_STARTED" , "ADD_CANDIDATE" ]
 
 def test_case():
@@ -44,6 +46,13 @@ def test_case():
         if each_log.operation in expected_in_voter_log:
             expected_in_voter_log.remove(each_log.operation)
 
+    #vote to inclusion latency, both events are logged by the voting node.
+    voter_events = logparser.generate_event_log("0.0.0.0" , 8001)
+    vote_submitted = voter_events.first("VOTE_SUBMITTED")
+    own_vote_detected = voter_events.first("OWN_VOTE_DETECTED")
+    if vote_submitted is not None and own_vote_detected is not None:
+        output["metrics"] = {"vote_to_inclusion_ms" : logparser.latency_ms(vote_submitted , own_vote_detected)}
+
     #Verify test
     if len(expected_in_bootstrap_log) == 0 and len(expected_in_voter_log) == 0:
         output["passed"] = True
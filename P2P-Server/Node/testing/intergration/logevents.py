@@ -12,10 +12,16 @@ class LOG_EVENTS(Enum):
     SNAPSHOT_UPDATED = "SNAPSHOT_UPDATED"
     SELF_BECAME_VALIDATOR = "NODE_BECAME_VALIDATOR"
     OWN_VOTE_DETECTED = "OWN_VOTE_DETECTED"
+    VOTE_SUBMITTED = "VOTE_SUBMITTED"
+    VOTES_FINALIZED = "VOTES_FINALIZED"
     VALIDATOR_ADDED_TO_LOCAL_SNAPSHOT = "VALIDATOR_ADDED_TO_LOCAL_SNAPSHOT"
     LEAD_VALIDATOR_CHANGED_ON_LOCAL_SNAPSHOT = "LEAD_VALIDATOR_CHANGED_ON_LOCAL_SNAPSHOT"
     SELF_BECAME_LEAD_VALIDATOR = "SELF_BECAME_LEAD_VALIDATOR"
     SUBMIT_BLOCK_TRANSACTION_INVALID = "SUBMIT_BLOCK_TRANSACTION_INVALID"
+    BLOCK_SYNC_STARTED = "BLOCK_SYNC_STARTED"
+    BLOCK_SYNC_COMPLETED = "BLOCK_SYNC_COMPLETED"
+    CHECKPOINT_CREATED = "CHECKPOINT_CREATED"
+    CHECKPOINT_LOADED = "CHECKPOINT_LOADED"
 
     RECEIVED_FULL_MESSAGE = "RECEIVED_FULL_MESSAGE"
 
@@ -25,6 +31,9 @@ class LOG_EVENTS(Enum):
     UNKNOWN_ELECTOR_CREDS = "UNKNOWN_ELECTOR_CREDS"
     SIG_NOT_VALID = "SIG_NOT_VALID"
     CANDIDATE_CHOSEN_NOT_VALID = "CANDIDATE_CHOSEN_NOT_VALID"
+    BLOCK_REJECTED = "BLOCK_REJECTED"
+    CHECKPOINT_REJECTED = "CHECKPOINT_REJECTED"
 
     #ERROR
+    BLOCK_SYNC_FAILED = "BLOCK_SYNC_FAILED"
     
\ No newline at end of file
@@ -2,6 +2,8 @@ import typing
 import os
 import sys
 import re
+import json
+import time
 import datetime
 
 project_root_dir = os.path.join(os.path.dirname(__file__) , ".." , "..")
@@ -24,6 +26,47 @@ class Log:
     def append(self , next_entry : LogEntry)->None:
         self.entries.append(next_entry)
 
+class EventEntry:
+    event : str
+    t_ns : int
+    timestamp : float
+    tag : str
+    params : list
+    """A structured LOG_EVENTS record, t_ns is a monotonic clock so records from nodes on the same machine can be compared."""
+    def __init__(self , event , t_ns , timestamp , tag , params):
+        self.event = event
+        self.t_ns = t_ns
+        self.timestamp = timestamp
+        self.tag = tag
+        self.params = params
+
+class EventLog:
+    entries : typing.List[EventEntry]
+    index : typing.Dict[str , typing.List[EventEntry]]
+    def __init__(self):
+        self.entries = []
+        self.index = {} # event : entries of that event in the order they were logged.
+    def append(self , next_entry : EventEntry)->None:
+        self.entries.append(next_entry)
+        self.index.setdefault(next_entry.event , []).append(next_entry)
+    def get(self , event : str) -> typing.List[EventEntry]:
+        return self.index.get(event , [])
+    def first(self , event : str , predicate : typing.Callable[[EventEntry] , bool] | None = None) -> EventEntry | None:
+        for each_entry in self.get(event):
+            if predicate is None or predicate(each_entry):
+                return each_entry
+        return None
+
+def parse_event_line(event_line : str) -> EventEntry | None:
+    try:
+        record = json.loads(event_line)
+        return EventEntry(record["event"] , int(record["t_ns"]) , float(record.get("time" , 0)) , record.get("tag" , "info") , record.get("params" , []))
+    except (json.JSONDecodeError , KeyError , TypeError , ValueError):
+        return None
+
+def latency_ms(start_entry : EventEntry , end_entry : EventEntry) -> float:
+    return (end_entry.t_ns - start_entry.t_ns) / 1e6
+
 def parse_log_line(log_line : str) -> LogEntry | None:
     pattern = r"\[(?P<timestamp>\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\] \[(?P<tag>\w+)\] (?P<log_event>.*?)(\((?P<params>.*)\))?$"
     match = re.match(pattern, log_line)
@@ -76,4 +119,41 @@ def generate_log(host , port)-> Log | None:
     except Exception as e:
         print(f"Error generating logs, {e}")
 
-    return new_log
\ No newline at end of file
+    return new_log
+
+def event_file_path(host , port) -> str:
+    return os.path.join(os.path.dirname(__file__) , "logs" , f"{host}_{port}_log_events.jsonl")
+
+def generate_event_log(host , port)-> EventLog:
+    new_log = EventLog()
+    try:
+        with open(event_file_path(host , port) , "r") as event_file:
+            for each_line in event_file:
+                event_entry = parse_event_line(each_line)
+                if event_entry is not None:
+                    new_log.append(event_entry)
+    except FileNotFoundError:
+        print("File not found")
+    return new_log
+
+def wait_for_event(host , port , event : str , timeout : float = 30 , predicate : typing.Callable[[EventEntry] , bool] | None = None) -> EventEntry | None:
+    """Follows the node's events file until the event is logged, returns None if it isn't logged within timeout seconds."""
+    deadline = time.monotonic() + timeout
+    position = 0
+    partial_line = ""
+    while time.monotonic() < deadline:
+        try:
+            with open(event_file_path(host , port) , "r") as event_file:
+                event_file.seek(position)
+                text = event_file.read()
+                position = event_file.tell()
+        except FileNotFoundError:
+            text = ""
+        lines = (partial_line + text).split("\n")
+        partial_line = lines.pop() # the last line may not be written fully yet.
+        for each_line in lines:
+            event_entry = parse_event_line(each_line)
+            if event_entry is not None and event_entry.event == event and (predicate is None or predicate(event_entry)):
+                return event_entry
+        time.sleep(0.05)
+    return None
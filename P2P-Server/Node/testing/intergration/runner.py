@@ -36,7 +36,7 @@ scripts_dir = os.path.join("scripts")
 def clean_logs() -> None:
     if os.path.isdir(logs_dir):
         for filename in os.listdir(logs_dir):
-            if filename.endswith(".txt"):
+            if filename.endswith(".txt") or filename.endswith(".jsonl"):
                 file_path = os.path.join(logs_dir, filename)
                 if os.path.isfile(file_path):
                     os.remove(file_path)
@@ -135,9 +135,11 @@ def run_test_case(test_case : typing.Tuple[str , typing.Callable , typing.Dict])
                 {"test_name" : test_case_name, "result" : "failed" , "reason" : "exceeded_max_run_time"}
             )
         else:
-            time.sleep(5)
+            # nodes write any queued log lines before they exit, so the logs can be read straight away.
             print(f"Loading logs for {test_case_name}...")
             output = test_case_function()
+            for metric_name , metric_value in output.get("metrics" , {}).items():
+                print(f"{test_case_name} {metric_name}: {metric_value}")
 
             passed = output.get("passed" , False)
             fail_reason = output.get("fail_reason" , "None")
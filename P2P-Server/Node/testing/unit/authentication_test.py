@@ -8,6 +8,7 @@ sys.path.append(project_root_dir)
 
 import utilities.authentication as auth
 from utilities.authentication import Ed25519PrivateKey , Ed25519PublicKey , serialization
+from utilities.key_cache import PublicKeyCache
 
 class TestAuth(unittest.TestCase):
     def test_signature_ecdsa(self) -> None:
@@ -40,5 +41,23 @@ class TestAuth(unittest.TestCase):
             "Decompressed private key does not match original"
         )
 
+    def test_signature_rsa_cached_key(self) -> None:
+        private_key, public_key = auth.generate_rsa_key_pair()
+        public_key_str = auth.serialize_public_key(public_key)
+        test_message : str = "This is a test message."
+        signature = auth.generate_signature_str_rsa(private_key , test_message)
+
+        key_cache = PublicKeyCache(1)
+        loaded_key = key_cache.get("node" , public_key_str)
+        self.assertIs(key_cache.get("node" , public_key_str) , loaded_key)
+        self.assertTrue(auth.verify_signature_rsa_key(loaded_key , test_message , signature))
+        self.assertTrue(auth.verify_signature_rsa(public_key_str , test_message , signature))
+        self.assertFalse(auth.verify_signature_rsa_key(loaded_key , "Another message." , signature))
+
+        self.assertIsNone(key_cache.get("other_node" , "not a key"))
+        _ , other_public_key = auth.generate_rsa_key_pair()
+        key_cache.get("other_node" , auth.serialize_public_key(other_public_key))
+        self.assertEqual(len(key_cache) , 1)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,84 @@
+import os
+import unittest
+import sys
+import tempfile
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root_dir = os.path.abspath(os.path.join(current_dir, "..", ".."))
+sys.path.append(project_root_dir)
+
+from blockchain.block_store import BlockStore
+from blockchain.blockchain import Blockchain, load_from_block_store
+from blockchain.block import Block
+from block_test import generate_block
+
+def generate_stored_blockchain(path : str , size : int) -> Blockchain:
+    new_blockchain = Blockchain(False)
+    new_blockchain.attach_block_store(BlockStore(path , sync_batch_size=4))
+    genesis_block = Block()
+    new_blockchain.add_genesis_block(genesis_block)
+    for i in range(0 , size):
+        new_blockchain.add_block(generate_block(5))
+    new_blockchain.block_store.close()
+    return new_blockchain
+
+class TestBlockStore(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name , "blocks.dat")
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_reload(self) -> None:
+        origin_blockchain = generate_stored_blockchain(self.path , 20)
+        block_store = BlockStore(self.path)
+        loaded_blockchain = load_from_block_store(block_store)
+        block_store.close()
+
+        self.assertEqual(loaded_blockchain.head , origin_blockchain.head)
+        self.assertEqual([each.hash for each in loaded_blockchain.chain] , [each.hash for each in origin_blockchain.chain])
+
+    def test_startup_scans_once(self) -> None:
+        origin_blockchain = generate_stored_blockchain(self.path , 10)
+        block_store = BlockStore(self.path)
+        scans = []
+        original_scan = block_store.scan
+        block_store.scan = lambda: scans.append(True) or original_scan()
+        loaded_blockchain = load_from_block_store(block_store)
+        self.assertEqual(scans , []) # the blocks decoded by recover are reused.
+        self.assertEqual(loaded_blockchain.head , origin_blockchain.head)
+        self.assertEqual(len(block_store.load_blocks()) , len(origin_blockchain.chain))
+        self.assertEqual(len(scans) , 1)
+        block_store.close()
+
+    def test_read_block(self) -> None:
+        origin_blockchain = generate_stored_blockchain(self.path , 5)
+        block_store = BlockStore(self.path)
+        middle_block = origin_blockchain.chain[3]
+        self.assertIn(middle_block.hash , block_store)
+        self.assertEqual(block_store.read_block(middle_block.hash).to_json() , middle_block.to_json())
+        self.assertIsNone(block_store.read_block("missing"))
+        block_store.close()
+
+    def test_torn_write_truncated(self) -> None:
+        origin_blockchain = generate_stored_blockchain(self.path , 5)
+        size = os.path.getsize(self.path)
+        with open(self.path , "r+b") as file:
+            file.truncate(size - 10) # simulate a crash part way through writing the last block.
+
+        block_store = BlockStore(self.path)
+        self.assertEqual(len(block_store) , len(origin_blockchain.chain) - 1)
+        block_store.append(origin_blockchain.chain[-1])
+        block_store.close()
+
+        loaded_blockchain = load_from_block_store(BlockStore(self.path))
+        self.assertEqual(loaded_blockchain.head , origin_blockchain.head)
+
+    def test_empty_store(self) -> None:
+        block_store = BlockStore(self.path)
+        self.assertIsNone(load_from_block_store(block_store))
+        block_store.close()
+
+if __name__ == '__main__':
+    unittest.main()
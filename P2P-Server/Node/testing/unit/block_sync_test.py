@@ -0,0 +1,66 @@
+import os
+import unittest
+import sys
+import asyncio
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root_dir = os.path.abspath(os.path.join(current_dir, "..", ".."))
+sys.path.append(project_root_dir)
+
+from server.core.constants import MESSAGE_CODES
+from server.core.connection_registry import Connection, ConnectionRegistry
+from server.handlers.block_sync import BlockSync
+from fakes import FakeServer, FakeOutbound, FakeMessageProccessor
+
+def make_server(routes=()) -> FakeServer:
+    server = FakeServer(
+        connections=ConnectionRegistry(),
+        global_node_table={"far" : {"host" : "10.0.0.2" , "port" : 9000}},
+        message_proccessor=FakeMessageProccessor(routes),
+    )
+    server.connections.add(Connection("127.0.0.1" , 8001 , "near_writer" , "near" , FakeOutbound()))
+    return server
+
+async def send_request(block_sync : BlockSync , retries : int) -> None:
+    block_sync.retries = retries
+    await block_sync.send_request({"code" : MESSAGE_CODES.REQUEST_BLOCKS.value , "data" : {}})
+    block_sync.cancel_timeout()
+
+class TestBlockSyncRequests(unittest.TestCase):
+    def test_retry_follows_route(self) -> None:
+        server = make_server(routes=["far"])
+        block_sync = BlockSync(server)
+        block_sync.target_node_id = "far"
+        asyncio.run(send_request(block_sync , 0))
+        asyncio.run(send_request(block_sync , 1))
+        self.assertEqual([node_id for node_id , _ in server.message_proccessor.sent] , ["far"])
+        self.assertEqual([node_id for node_id , _ in server.message_proccessor.routed] , ["far"])
+        self.assertEqual(server.message_proccessor.flooded , [])
+
+    def test_retry_without_route_isnt_flooded(self) -> None:
+        server = make_server()
+        block_sync = BlockSync(server)
+        block_sync.target_node_id = "far"
+        asyncio.run(send_request(block_sync , 2))
+        self.assertEqual([node_id for node_id , _ in server.message_proccessor.sent] , ["far"])
+        self.assertEqual(server.message_proccessor.flooded , [])
+
+    def test_requester_address_must_be_known(self) -> None:
+        block_sync = BlockSync(make_server())
+        self.assertEqual(block_sync.requester_address("near" , {"host" : "127.0.0.1" , "port" : 8001}) , ("127.0.0.1" , 8001))
+        self.assertEqual(block_sync.requester_address("far" , {"host" : "10.0.0.2" , "port" : "9000"}) , ("10.0.0.2" , 9000))
+        self.assertIsNone(block_sync.requester_address("far" , {"host" : "10.0.0.9" , "port" : 9000}))
+        self.assertIsNone(block_sync.requester_address("near" , {"host" : "10.0.0.2" , "port" : 9000}))
+        self.assertIsNone(block_sync.requester_address("unknown" , {"host" : "10.0.0.2" , "port" : 9000}))
+        self.assertIsNone(block_sync.requester_address("far" , {"host" : "10.0.0.2" , "port" : "x"}))
+
+    def test_response_ignores_unknown_address(self) -> None:
+        server = make_server()
+        block_sync = BlockSync(server)
+        request = {"sender" : "far" , "message_type" : "ttl" , "data" : {"host" : "10.0.0.9" , "port" : 9000}}
+        asyncio.run(block_sync.send_response(request , {"code" : MESSAGE_CODES.SEND_BLOCKS.value , "data" : {}}))
+        self.assertEqual(server.message_proccessor.sent_addresses , [None])
+        self.assertEqual(server.message_proccessor.flooded , [])
+
+if __name__ == "__main__":
+    unittest.main()
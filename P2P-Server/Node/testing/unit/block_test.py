@@ -12,12 +12,14 @@ import utilities.authentication as auth
 from blockchain.blockchain import Blockchain
 from blockchain.block import Block, load_from_dict, load_from_json
 from blockchain.transaction import Transaction
+from blockchain.merkle import MerkleAccumulator, hash_pair
 
 def generate_block(size : int) -> Block:
     new_block = Block()
     for i in range(0 , size):
         new_transaction = Transaction("test" , random.randint(0 , 999))
         new_block.add_transaction(new_transaction)
+    new_block.hash = new_block.calculate_hash()
     return new_block
 
 class TestBlockchain(unittest.TestCase):
@@ -34,5 +36,24 @@ class TestBlockchain(unittest.TestCase):
         loaded_block = load_from_json(serialized_block_json)
         self.assertEqual(loaded_block.hash , test_block.hash)
 
+    def test_hash_changes_with_transactions(self) -> None:
+        test_block = generate_block(10)
+        old_hash = test_block.hash
+        test_block.add_transaction(Transaction("test" , 1000))
+        self.assertEqual(test_block.hash , old_hash) # only recalculated on finalize.
+        self.assertNotEqual(test_block.calculate_hash() , old_hash)
+
+class TestMerkle(unittest.TestCase):
+    def test_incremental_root_matches_tree(self) -> None:
+        leaves = [Transaction("test" , i).hash for i in range(0 , 5)]
+        accumulator = MerkleAccumulator()
+        for each_leaf in leaves:
+            accumulator.append(each_leaf)
+
+        nodes = [bytes.fromhex(each_leaf) for each_leaf in leaves]
+        left = hash_pair(hash_pair(nodes[0] , nodes[1]) , hash_pair(nodes[2] , nodes[3]))
+        self.assertEqual(accumulator.root() , hash_pair(left , nodes[4]).hex())
+        self.assertEqual(len(accumulator) , 5)
+
 if __name__ == '__main__':
     unittest.main()
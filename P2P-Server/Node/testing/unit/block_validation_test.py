@@ -0,0 +1,86 @@
+import os
+import unittest
+import sys
+import asyncio
+import json
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root_dir = os.path.abspath(os.path.join(current_dir, "..", ".."))
+sys.path.append(project_root_dir)
+
+import utilities.authentication as auth
+from utilities.key_cache import PublicKeyCache
+from blockchain.block import Block
+from blockchain.blockchain_snapshot import Snapshot
+from blockchain.transaction import Transaction
+from server.core.crypto_executor import CryptoExecutor
+from server.handlers.block_validation import BlockValidator
+from fakes import FakeServer
+
+def make_vote_transaction(private_key , public_key_str : str , nonce : str) -> Transaction:
+    vote_package = {"elector_public_key" : public_key_str , "choice" : 1 , "nonce" : nonce}
+    signature = auth.generate_signature_ecdsa(private_key , json.dumps(vote_package , sort_keys=True))
+    return Transaction("ADD_VOTE" , {"vote_choice" : 1 , "voter_public_key" : public_key_str , "vote_signature" : signature , "nonce" : nonce})
+
+def make_block(previous_hash : str , transactions : list) -> Block:
+    block = Block()
+    for each_transaction in transactions:
+        block.add_transaction(each_transaction)
+    block.set_previous_hash(previous_hash)
+    return block
+
+class TestBlockValidator(unittest.TestCase):
+    def setUp(self) -> None:
+        rsa_private_key , _ = auth.generate_rsa_key_pair()
+        self.crypto_executor = CryptoExecutor(rsa_private_key , PublicKeyCache(8) , "thread" , max_workers=2 , batch_size=4)
+        self.server = FakeServer(snapshot=Snapshot() , crypto_executor=self.crypto_executor)
+        self.server.snapshot.add_candidate("A" , 1)
+        self.block_validator = BlockValidator(self.server)
+        self.electors = []
+        for _ in range(0 , 8):
+            private_key , public_key = auth.generate_ecdsa_key_pair()
+            public_key_str = auth.compress_ecdsa_key(public_key)
+            self.server.snapshot.add_elector(public_key_str)
+            self.electors.append((private_key , public_key_str))
+
+    def tearDown(self) -> None:
+        self.crypto_executor.shutdown()
+
+    def receive(self , new_block : Block) -> list:
+        return asyncio.run(self.block_validator.receive_block(new_block))
+
+    def vote_transactions(self , start : int , end : int) -> list:
+        return [make_vote_transaction(private_key , public_key_str , str(i)) for i , (private_key , public_key_str) in enumerate(self.electors[start:end])]
+
+    def test_valid_block_is_added(self) -> None:
+        block = make_block("0" , self.vote_transactions(0 , 8))
+        self.assertEqual(self.receive(block) , [block])
+        self.assertEqual(self.block_validator.signatures_verified , 8)
+
+    def test_bad_signature_rejects_block(self) -> None:
+        transactions = self.vote_transactions(0 , 4)
+        transactions[2].data["vote_signature"] = transactions[1].data["vote_signature"]
+        block = make_block("0" , transactions)
+        self.assertEqual(self.receive(block) , [])
+        self.assertEqual(self.block_validator.blocks_rejected , 1)
+
+    def test_repeated_elector_rejects_block(self) -> None:
+        private_key , public_key_str = self.electors[0]
+        block = make_block("0" , [make_vote_transaction(private_key , public_key_str , "a") , make_vote_transaction(private_key , public_key_str , "b")])
+        self.assertEqual(self.receive(block) , [])
+
+    def test_verified_transactions_not_verified_again(self) -> None:
+        transactions = self.vote_transactions(0 , 4)
+        self.block_validator.mark_verified(each_transaction.hash for each_transaction in transactions[:3])
+        self.receive(make_block("0" , transactions))
+        self.assertEqual(self.block_validator.signatures_verified , 1)
+
+    def test_out_of_order_block_is_held(self) -> None:
+        first_block = make_block("0" , self.vote_transactions(0 , 2))
+        second_block = make_block(first_block.hash , self.vote_transactions(2 , 4))
+        self.assertEqual(self.receive(second_block) , [])
+        self.assertEqual(self.receive(first_block) , [first_block , second_block])
+        self.assertEqual(self.server.snapshot.blockchain_head , second_block.hash)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -34,5 +34,24 @@ class TestBlockchain(unittest.TestCase):
     def test_serialization_to_json(self) -> None:
         pass
 
+    def test_serialize_page(self) -> None:
+        blockchain = generate_blockchain(25)
+        page = blockchain.serialize_page(2 , 10)
+        self.assertEqual(page["page_count"] , 3)
+        self.assertEqual(page["height"] , 25)
+        self.assertEqual(page["head"] , blockchain.head)
+        self.assertEqual([each_block["hash"] for each_block in page["blocks"]] , [each_block.hash for each_block in blockchain.chain[20:]])
+        self.assertEqual(blockchain.serialize_page(9 , 10)["page"] , 2) # clamped to the last page.
+        self.assertEqual(Blockchain(False).serialize_page(0 , 10)["blocks"] , [])
+
+    def test_serialize_page_after_checkpoint(self) -> None:
+        blockchain = generate_blockchain(15)
+        blockchain.base_height = 1000 # as if bootstrapped from a checkpoint at height 1000.
+        first_page = blockchain.serialize_page(0 , 10)
+        self.assertEqual(first_page["page_count"] , 2)
+        self.assertEqual(first_page["height"] , 1015)
+        self.assertEqual([each_block["hash"] for each_block in first_page["blocks"]] , [each_block.hash for each_block in blockchain.chain[:10]])
+        self.assertEqual(len(blockchain.serialize_page(1 , 10)["blocks"]) , 5)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
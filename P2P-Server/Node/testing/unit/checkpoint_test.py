@@ -0,0 +1,206 @@
+import os
+import unittest
+import sys
+import asyncio
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root_dir = os.path.abspath(os.path.join(current_dir, "..", ".."))
+sys.path.append(project_root_dir)
+
+import utilities.authentication as auth
+from utilities.key_cache import PublicKeyCache
+from blockchain.block import Block, submit_digest
+from blockchain.blockchain import Blockchain
+from blockchain.transaction import Transaction
+from blockchain.blockchain_snapshot import Snapshot, checkpoint_hash, load_snapshot_from_checkpoint, load_snapshot_from_dict
+import server.core.constants as CONSTANTS
+from server.core.crypto_executor import CryptoExecutor
+from server.handlers.checkpoints import CheckpointManager, verify_checkpoint
+from server.handlers.blockchain_operations import BlockchainOperations
+from fakes import FakeServer, FakeServerEvents
+
+def make_snapshot() -> Snapshot:
+    snapshot = Snapshot()
+    snapshot.blockchain_head = "a" * 64
+    snapshot.add_validator("node1")
+    snapshot.set_lead_validator("node1")
+    snapshot.add_candidate("A" , 1)
+    snapshot.add_candidate("B" , 2)
+    snapshot.add_elector_keys(i.to_bytes(32 , "big") for i in range(0 , 20))
+    snapshot.electors.set_voted(3 , True)
+    snapshot.add_vote(2)
+    return snapshot
+
+def make_checkpoint_block(snapshot : Snapshot , height : int) -> Block:
+    checkpoint_data = snapshot.serialize_checkpoint()
+    block = Block()
+    block.add_transaction(Transaction("CHECKPOINT" , {
+        "height" : height,
+        "blockchain_head" : snapshot.blockchain_head,
+        "snapshot_hash" : checkpoint_hash(checkpoint_data),
+        "size" : len(checkpoint_data),
+    }))
+    block.set_previous_hash(snapshot.blockchain_head)
+    return block
+
+class TestSnapshotCheckpoint(unittest.TestCase):
+    def test_round_trip_includes_electors(self) -> None:
+        snapshot = make_snapshot()
+        loaded_snapshot = load_snapshot_from_checkpoint(snapshot.serialize_checkpoint())
+        self.assertEqual(len(loaded_snapshot.electors) , 20)
+        self.assertTrue(loaded_snapshot.electors.is_voted(3))
+        self.assertEqual(loaded_snapshot.electors.voted_count , 1)
+        self.assertEqual(loaded_snapshot.get_elector_index((19).to_bytes(32 , "big")) , 19)
+        self.assertEqual(loaded_snapshot.vote_tally , {2 : 1})
+        self.assertIn(1 , loaded_snapshot.get_candidates())
+        self.assertEqual(loaded_snapshot.get_lead_validator() , "node1")
+        # a loaded snapshot serializes the same so the next checkpoint hashes match.
+        self.assertEqual(loaded_snapshot.serialize_checkpoint() , snapshot.serialize_checkpoint())
+
+    def test_hash_changes_with_voted_electors(self) -> None:
+        snapshot = make_snapshot()
+        first_hash = checkpoint_hash(snapshot.serialize_checkpoint())
+        snapshot.electors.set_voted(4 , True)
+        self.assertNotEqual(checkpoint_hash(snapshot.serialize_checkpoint()) , first_hash)
+
+class TestVerifyCheckpoint(unittest.TestCase):
+    def test_matching_checkpoint(self) -> None:
+        snapshot = make_snapshot()
+        block = make_checkpoint_block(snapshot , 100)
+        loaded_snapshot = verify_checkpoint(block , 100 , snapshot.serialize_checkpoint())
+        self.assertIsNotNone(loaded_snapshot)
+        self.assertEqual(loaded_snapshot.blockchain_head , block.previous_hash)
+
+    def test_rejects_changed_data(self) -> None:
+        snapshot = make_snapshot()
+        block = make_checkpoint_block(snapshot , 100)
+        snapshot.add_vote(1)
+        self.assertIsNone(verify_checkpoint(block , 100 , snapshot.serialize_checkpoint()))
+
+    def test_rejects_wrong_height_or_block(self) -> None:
+        snapshot = make_snapshot()
+        block = make_checkpoint_block(snapshot , 100)
+        self.assertIsNone(verify_checkpoint(block , 99 , snapshot.serialize_checkpoint()))
+        block.set_previous_hash("b" * 64)
+        self.assertIsNone(verify_checkpoint(block , 100 , snapshot.serialize_checkpoint()))
+        self.assertIsNone(verify_checkpoint(Block() , 100 , snapshot.serialize_checkpoint()))
+
+class TestBlockchainBaseHeight(unittest.TestCase):
+    def test_block_at(self) -> None:
+        blockchain = Blockchain(False)
+        blockchain.base_height = 100
+        first_block = Block()
+        first_block.set_previous_hash("a" * 64)
+        blockchain.add_block(first_block , enforce_previous_hash=False)
+        blockchain.add_block(Block())
+        self.assertEqual(blockchain.height() , 102)
+        self.assertIs(blockchain.block_at(100) , first_block)
+        self.assertIsNone(blockchain.block_at(99))
+        self.assertIsNone(blockchain.block_at(102))
+class TestCheckpointManager(unittest.TestCase):
+    def make_server(self , snapshot : Snapshot) -> FakeServer:
+        server = FakeServer(snapshot=snapshot , block_chain=Blockchain(False))
+        server.checkpoints = CheckpointManager(server)
+        return server
+
+    def test_keeps_matching_checkpoint(self) -> None:
+        async def run():
+            server = self.make_server(make_snapshot())
+            block = make_checkpoint_block(server.snapshot , 100)
+            server.checkpoints.record_checkpoint(block)
+            server.snapshot.add_vote(1) # the block's transactions are parsed while the snapshot is serialized.
+            await server.checkpoints.recording
+            return server , block
+        server , block = asyncio.run(run())
+        self.assertIs(server.checkpoints.latest.block , block)
+        self.assertEqual(server.checkpoints.latest.height , 100)
+        self.assertIsNotNone(verify_checkpoint(block , 100 , server.checkpoints.latest.data))
+        self.assertEqual(server.checkpoints.serialization , (None , None , None))
+
+    def test_block_sync_keeps_checkpoint(self) -> None:
+        async def run():
+            server = self.make_server(Snapshot())
+            server.server_events = FakeServerEvents()
+            server.block_store = None
+            server.blockchain_operations = BlockchainOperations(server)
+            genesis_block = Block()
+            genesis_block.set_previous_hash(0)
+            self.assertTrue(server.blockchain_operations.append_synced_block(genesis_block))
+            self.assertEqual(server.snapshot.blockchain_head , genesis_block.hash)
+            checkpoint_block = make_checkpoint_block(server.snapshot , 1)
+            self.assertTrue(server.blockchain_operations.append_synced_block(checkpoint_block))
+            await server.checkpoints.recording
+            return server , checkpoint_block
+        server , checkpoint_block = asyncio.run(run())
+        self.assertIs(server.checkpoints.latest.block , checkpoint_block)
+        self.assertEqual(server.snapshot.blockchain_head , checkpoint_block.hash)
+
+    def test_node_without_electors_skips_serialization(self) -> None:
+        async def run():
+            server = self.make_server(load_snapshot_from_dict({"blockchain_head" : "a" * 64}))
+            server.checkpoints.record_checkpoint(make_checkpoint_block(make_snapshot() , 100))
+            return server , await server.checkpoints.serialize_snapshot()
+        server , serialized = asyncio.run(run())
+        self.assertIsNone(serialized)
+        self.assertIsNone(server.checkpoints.recording)
+        self.assertIsNone(server.checkpoints.latest)
+
+    def test_checkpoint_is_first_in_working_block(self) -> None:
+        async def run():
+            server = self.make_server(make_snapshot())
+            server.block_chain.base_height = CONSTANTS.CHECKPOINT_INTERVAL - 1
+            server.block_chain.add_block(Block() , enforce_previous_hash=False)
+            adding = asyncio.create_task(server.checkpoints.add_checkpoint_transaction())
+            await asyncio.sleep(0)
+            server.working_block.add_transaction(Transaction("ADD_VOTE" , {"vote_choice" : 1}))
+            await adding
+            return server
+        server = asyncio.run(run())
+        operations = [each_transaction.operation for each_transaction in server.working_block.data]
+        self.assertEqual(operations , ["CHECKPOINT" , "ADD_VOTE"])
+        self.assertTrue(asyncio.run(CheckpointManager(server).checkpoint_matches(server.working_block.data[0])))
+class TestCheckpointBlockSigned(unittest.TestCase):
+    def setUp(self) -> None:
+        private_key , public_key = auth.generate_rsa_key_pair()
+        self.crypto_executor = CryptoExecutor(private_key , PublicKeyCache(8) , "inline")
+        self.server = FakeServer(
+            crypto_executor=self.crypto_executor,
+            peer_directory={"node1" : {"public_key" : auth.serialize_public_key(public_key)}},
+        )
+        self.server.checkpoints = CheckpointManager(self.server)
+        self.snapshot = make_snapshot()
+
+    def tearDown(self) -> None:
+        self.crypto_executor.shutdown()
+
+    def submit(self , block : Block , node_id : str = "node1") -> Block:
+        """Adds a SUBMIT_BLOCK transaction the way the lead validator does."""
+        signed_nonce = submit_digest(block.previous_hash , block.merkle_tree.root())
+        block.add_transaction(Transaction("SUBMIT_BLOCK" , {
+            "node_id" : node_id,
+            "signed_nonce" : signed_nonce,
+            "signature" : asyncio.run(self.crypto_executor.sign(signed_nonce)),
+        }))
+        return block
+
+    def is_signed(self , block : Block , known_validators : set) -> bool:
+        return asyncio.run(self.server.checkpoints.checkpoint_block_signed(block , self.snapshot , known_validators))
+
+    def test_signed_by_known_lead(self) -> None:
+        self.assertTrue(self.is_signed(self.submit(make_checkpoint_block(self.snapshot , 100)) , {"node1"}))
+
+    def test_rejects_unknown_lead_or_missing_signature(self) -> None:
+        block = self.submit(make_checkpoint_block(self.snapshot , 100))
+        self.assertFalse(self.is_signed(block , {"node2"}))
+        self.assertFalse(self.is_signed(make_checkpoint_block(self.snapshot , 100) , {"node1"}))
+
+    def test_rejects_changed_block(self) -> None:
+        block = self.submit(make_checkpoint_block(self.snapshot , 100))
+        block.data.insert(1 , Transaction("ADD_VOTE" , {"vote_choice" : 1}))
+        self.assertFalse(self.is_signed(block , {"node1"}))
+        other_block = self.submit(make_checkpoint_block(self.snapshot , 100))
+        other_block.previous_hash = "b" * 64
+        self.assertFalse(self.is_signed(other_block , {"node1"}))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import os
+import unittest
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root_dir = os.path.abspath(os.path.join(current_dir, "..", ".."))
+sys.path.append(project_root_dir)
+
+from server.core.connection_registry import Connection, ConnectionRegistry
+
+def generate_connection(port : int , node_id : str | None = None) -> Connection:
+    return Connection("127.0.0.1" , port , object() , node_id , None)
+
+class TestConnectionRegistry(unittest.TestCase):
+    def test_lookups(self) -> None:
+        registry = ConnectionRegistry()
+        first = generate_connection(9000 , "a")
+        second = generate_connection(9001)
+        registry.add(first)
+        registry.add(second)
+
+        self.assertEqual(len(registry) , 2)
+        self.assertIs(registry.get_by_address("127.0.0.1" , 9000) , first)
+        self.assertIs(registry.get_by_node_id("a") , first)
+        self.assertIs(registry.get_by_writer(second.writer) , second)
+        self.assertIn(("127.0.0.1" , 9001) , registry)
+        self.assertEqual(registry.all() , [first , second])
+
+    def test_remove(self) -> None:
+        registry = ConnectionRegistry()
+        connection = generate_connection(9000 , "a")
+        registry.add(connection)
+        registry.remove(connection)
+        registry.remove(connection)
+
+        self.assertEqual(len(registry) , 0)
+        self.assertIsNone(registry.get_by_node_id("a"))
+        self.assertNotIn(("127.0.0.1" , 9000) , registry)
+
+    def test_set_node_id(self) -> None:
+        registry = ConnectionRegistry()
+        connection = generate_connection(9000 , "a")
+        registry.add(connection)
+        registry.set_node_id(connection , "b")
+
+        self.assertIsNone(registry.get_by_node_id("a"))
+        self.assertIs(registry.get_by_node_id("b") , connection)
+
+    def test_replaced_address_keeps_newer_connection(self) -> None:
+        registry = ConnectionRegistry()
+        old_connection = generate_connection(9000 , "a")
+        new_connection = generate_connection(9000 , "a")
+        registry.add(old_connection)
+        registry.add(new_connection)
+        registry.remove(old_connection)
+
+        self.assertIs(registry.get_by_address("127.0.0.1" , 9000) , new_connection)
+        self.assertIs(registry.get_by_node_id("a") , new_connection)
+        self.assertEqual(len(registry) , 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import os
+import unittest
+import sys
+import asyncio
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root_dir = os.path.abspath(os.path.join(current_dir, "..", ".."))
+sys.path.append(project_root_dir)
+
+import utilities.authentication as auth
+from utilities.key_cache import PublicKeyCache
+from server.core.crypto_executor import CryptoExecutor
+
+async def sign_and_verify(crypto_executor : CryptoExecutor , public_key_str : str) -> list:
+    messages = [f"message {i}" for i in range(0 , 10)]
+    signatures = await asyncio.gather(*[crypto_executor.sign(each_message) for each_message in messages])
+    results = await asyncio.gather(*[
+        crypto_executor.verify("node" , public_key_str , each_message , each_signature)
+        for each_message , each_signature in zip(messages , signatures)
+    ])
+    results.append(await crypto_executor.verify("node" , public_key_str , "wrong message" , signatures[0]))
+    return results
+
+class TestCryptoExecutor(unittest.TestCase):
+    def run_mode(self , mode : str) -> None:
+        private_key, public_key = auth.generate_rsa_key_pair()
+        public_key_str = auth.serialize_public_key(public_key)
+        crypto_executor = CryptoExecutor(private_key , PublicKeyCache(8) , mode , max_workers=2 , batch_size=4)
+        try:
+            results = asyncio.run(sign_and_verify(crypto_executor , public_key_str))
+        finally:
+            crypto_executor.shutdown()
+        self.assertEqual(results , [True] * 10 + [False])
+        self.assertEqual(crypto_executor.queue_depth() , 0)
+        self.assertEqual(crypto_executor.jobs_completed , 21)
+
+    def test_inline(self) -> None:
+        self.run_mode("inline")
+
+    def test_thread(self) -> None:
+        self.run_mode("thread")
+
+    def test_process(self) -> None:
+        self.run_mode("process")
+
+    def test_invalid_mode(self) -> None:
+        private_key, _ = auth.generate_rsa_key_pair()
+        with self.assertRaises(ValueError):
+            CryptoExecutor(private_key , PublicKeyCache(8) , "gpu")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import os
+import unittest
+import sys
+import asyncio
+import json
+import tempfile
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root_dir = os.path.abspath(os.path.join(current_dir, "..", ".."))
+sys.path.append(project_root_dir)
+
+import utilities.authentication as auth
+from utilities.elector_loading import iter_electors_file, iter_elector_key_batches
+from blockchain.block import Block
+from blockchain.blockchain_snapshot import Snapshot
+from blockchain.elector_registry import pack_elector_keys, unpack_elector_keys, elector_key_bytes
+from blockchain.transaction import Transaction
+import server.core.constants as CONSTANTS
+import server.handlers.validator_actions as validator_actions
+from fakes import FakeServer
+
+def make_public_keys(count : int) -> list:
+    return [auth.compress_ecdsa_key(auth.generate_ecdsa_key_pair()[1]) for _ in range(0 , count)]
+
+class TestElectorLoading(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.public_keys = make_public_keys(10)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def write_file(self , name : str , text : str) -> str:
+        path = os.path.join(self.directory.name , name)
+        with open(path , "w") as file:
+            file.write(text)
+        return path
+
+    def write_electors_json(self) -> str:
+        electors = {str(i) : {"elector_id" : each_key[:4].lower() , "public_key" : each_key , "private_key" : "x"} for i , each_key in enumerate(self.public_keys)}
+        return self.write_file("electors.json" , json.dumps(electors , indent=4))
+
+    def test_json_object_read_in_small_pieces(self) -> None:
+        path = self.write_electors_json()
+        entries = list(iter_electors_file(path , read_size=7))
+        self.assertEqual([each["public_key"] for each in entries] , self.public_keys)
+        self.assertEqual(list(iter_electors_file(self.write_file("empty.json" , " { } "))) , [])
+
+    def test_json_lines(self) -> None:
+        lines = [json.dumps(self.public_keys[0]) , "" , json.dumps({"public_key" : self.public_keys[1]})]
+        path = self.write_file("electors.jsonl" , "\n".join(lines))
+        self.assertEqual([each["public_key"] for each in iter_electors_file(path)] , self.public_keys[:2])
+
+    def test_truncated_file_raises(self) -> None:
+        path = self.write_file("electors.json" , '{"0" : {"public_key" : "abc"}')
+        with self.assertRaises(ValueError):
+            list(iter_electors_file(path))
+
+    def test_key_batches_skip_invalid_keys(self) -> None:
+        path = self.write_file("electors.jsonl" , "\n".join(json.dumps(each) for each in self.public_keys[:5] + ["bad key"]))
+        batches = list(iter_elector_key_batches(path , 2))
+        self.assertEqual([len(keys) for keys , _ in batches] , [2 , 2 , 1])
+        self.assertEqual(sum(skipped for _ , skipped in batches) , 1)
+
+    def test_pack_and_unpack_keys(self) -> None:
+        keys = [elector_key_bytes(each) for each in self.public_keys]
+        self.assertEqual(unpack_elector_keys(pack_elector_keys(keys)) , keys)
+        self.assertEqual(unpack_elector_keys("YWJj") , [])
+        snapshot = Snapshot()
+        snapshot.add_elector_keys(unpack_elector_keys(pack_elector_keys(keys)))
+        self.assertTrue(snapshot.is_elector_registered(self.public_keys[3]))
+
+    def test_load_all_electors_spreads_batches_across_blocks(self) -> None:
+        path = self.write_electors_json()
+        server = FakeServer()
+        original_sizes = (CONSTANTS.ELECTOR_BATCH_SIZE , CONSTANTS.MAX_ELECTORS_PER_BLOCK)
+        CONSTANTS.ELECTOR_BATCH_SIZE , CONSTANTS.MAX_ELECTORS_PER_BLOCK = 3 , 6
+        try:
+            blocks = []
+            async def run():
+                async def finalize_full_blocks():
+                    # stands in for the lead validator, the loader has to wait for the full block to be finalized.
+                    while True:
+                        await asyncio.sleep(0.1)
+                        if len(server.working_block.data) == 2:
+                            blocks.append(server.working_block)
+                            server.working_block = Block()
+                finalizer = asyncio.create_task(finalize_full_blocks())
+                await validator_actions.load_all_electors(server , path)
+                finalizer.cancel()
+                if len(server.working_block.data) > 0:
+                    blocks.append(server.working_block)
+            asyncio.run(run())
+        finally:
+            CONSTANTS.ELECTOR_BATCH_SIZE , CONSTANTS.MAX_ELECTORS_PER_BLOCK = original_sizes
+
+        self.assertEqual([len(each_block.data) for each_block in blocks] , [2 , 2])
+        loaded_keys = []
+        for each_block in blocks:
+            for each_transaction in each_block.data:
+                self.assertEqual(each_transaction.operation , "ADD_ELECTORS")
+                loaded_keys.extend(unpack_elector_keys(each_transaction.data["elector_public_keys"]))
+        self.assertEqual(loaded_keys , [elector_key_bytes(each) for each in self.public_keys])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import os
+import unittest
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root_dir = os.path.abspath(os.path.join(current_dir, "..", ".."))
+sys.path.append(project_root_dir)
+
+import utilities.authentication as auth
+from blockchain.elector_registry import ElectorRegistry, elector_key_bytes, load_registry
+from blockchain.blockchain_snapshot import Snapshot
+
+def make_key(i : int) -> bytes:
+    return i.to_bytes(32 , "big")
+
+class TestElectorRegistry(unittest.TestCase):
+    def test_add_and_lookup(self) -> None:
+        registry = ElectorRegistry()
+        self.assertEqual(registry.add(make_key(1)) , 0)
+        self.assertEqual(registry.add(make_key(2)) , 1)
+        self.assertEqual(registry.add(make_key(1)) , 0) # already registered
+        self.assertEqual(registry.lookup(make_key(2)) , 1)
+        self.assertIsNone(registry.lookup(make_key(3)))
+        self.assertEqual(len(registry) , 2)
+
+    def test_voted_bits(self) -> None:
+        registry = ElectorRegistry()
+        registry.add_many(make_key(i) for i in range(0 , 20))
+        registry.set_voted(9 , True)
+        registry.set_voted(9 , True)
+        self.assertTrue(registry.is_voted(9))
+        self.assertFalse(registry.is_voted(8))
+        self.assertFalse(registry.is_voted(10))
+        self.assertEqual(registry.voted_count , 1)
+        registry.set_voted(9 , False)
+        self.assertFalse(registry.is_voted(9))
+        self.assertEqual(registry.voted_count , 0)
+
+    def test_add_many_grows_bitset_once(self) -> None:
+        registry = ElectorRegistry()
+        registry.add(make_key(0))
+        registry.add_many(make_key(i) for i in range(0 , 1000))
+        self.assertEqual(len(registry) , 1000)
+        self.assertEqual(len(registry.voted) , 125)
+        registry.set_voted(999 , True)
+        self.assertTrue(registry.is_voted(999))
+
+    def test_copy_is_independent(self) -> None:
+        registry = ElectorRegistry()
+        registry.add(make_key(1))
+        copied_registry = registry.copy()
+        copied_registry.set_voted(0 , True)
+        copied_registry.add(make_key(2))
+        self.assertFalse(registry.is_voted(0))
+        self.assertEqual(len(registry) , 1)
+
+    def test_indexes_kept_when_table_grows(self) -> None:
+        registry = ElectorRegistry()
+        for i in range(0 , 1000):
+            self.assertEqual(registry.add(make_key(i)) , i)
+        registry.add_many(make_key(i) for i in range(500 , 1500))
+        self.assertEqual(len(registry) , 1500)
+        self.assertLessEqual(len(registry) * 2 , len(registry.slots))
+        self.assertEqual([registry.lookup(make_key(i)) for i in range(0 , 1500)] , list(range(0 , 1500)))
+        self.assertEqual(registry.raw_keys() , b"".join(make_key(i) for i in range(0 , 1500)))
+        self.assertIsNone(registry.lookup(make_key(1500)))
+        self.assertIsNone(registry.lookup(b"short"))
+        self.assertNotIn(bytearray(make_key(1500)) , registry)
+        self.assertIn(bytearray(make_key(7)) , registry)
+        with self.assertRaises(ValueError):
+            registry.add(b"short")
+
+    def test_fast_index(self) -> None:
+        registry = ElectorRegistry(fast_index=True)
+        registry.add_many(make_key(i) for i in range(0 , 100))
+        copied_registry = registry.copy()
+        copied_registry.add(make_key(100))
+        self.assertEqual(registry.lookup(make_key(42)) , 42)
+        self.assertIsNone(registry.lookup(make_key(100)))
+        self.assertEqual(copied_registry.lookup(make_key(100)) , 100)
+        loaded_registry = load_registry(registry.raw_keys() , bytes(registry.voted))
+        self.assertIsNone(loaded_registry.fast_index)
+        self.assertEqual(loaded_registry.lookup(make_key(42)) , 42)
+
+    def test_key_bytes(self) -> None:
+        _ , public_key = auth.generate_ecdsa_key_pair()
+        self.assertEqual(len(elector_key_bytes(auth.compress_ecdsa_key(public_key))) , 32)
+        self.assertIsNone(elector_key_bytes("not base64!"))
+        self.assertIsNone(elector_key_bytes("YWJj")) # valid base64 but the wrong length
+
+    def test_snapshot_electors(self) -> None:
+        snapshot = Snapshot()
+        keys = [auth.compress_ecdsa_key(auth.generate_ecdsa_key_pair()[1]) for _ in range(0 , 3)]
+        snapshot.add_electors(keys[:2] + ["bad key"])
+        self.assertTrue(snapshot.is_elector_registered(keys[0]))
+        self.assertFalse(snapshot.is_elector_registered(keys[2]))
+        self.assertFalse(snapshot.has_elector_voted(keys[1]))
+        snapshot.set_elector_voted(keys[1] , True)
+        self.assertTrue(snapshot.has_elector_voted(keys[1]))
+        self.assertIsNone(snapshot.has_elector_voted(keys[2]))
+
+if __name__ == "__main__":
+    unittest.main()
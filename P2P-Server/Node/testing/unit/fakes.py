@@ -0,0 +1,102 @@
+"""Stand ins for the parts of Server that the handler unit tests don't exercise."""
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root_dir = os.path.abspath(os.path.join(current_dir, "..", ".."))
+sys.path.append(project_root_dir)
+
+from blockchain.block import Block
+from blockchain.transaction import Transaction
+
+class FakeLogger:
+    def __init__(self):
+        self.lines = []
+
+    def Log(self , message , level="info" , *args):
+        self.lines.append(message)
+
+    def event(self , log_event , *params , tag="info"):
+        self.lines.append(f"{log_event.value} ({','.join(str(each) for each in params)})")
+
+class FakeBlockchainOperations:
+    """Adds transactions to the server's working block and finalizes blocks by moving the snapshot head."""
+    def __init__(self , server):
+        self.server = server
+        self.held_blocks = {}
+        self.finalized = []
+
+    def add_transactions_to_working(self , operation , data_list):
+        added_transactions = [Transaction(operation , each_data) for each_data in data_list]
+        for each_transaction in added_transactions:
+            self.server.working_block.add_transaction(each_transaction)
+        return added_transactions
+
+    def hold_block(self , new_block):
+        self.held_blocks[new_block.previous_hash] = new_block
+
+    def finalize_next_block(self , new_block):
+        self.server.snapshot.blockchain_head = new_block.hash
+        self.finalized.append(new_block)
+        return True
+
+class FakeBlockValidator:
+    def __init__(self):
+        self.verified = set()
+
+    def mark_verified(self , transaction_hashes):
+        self.verified.update(transaction_hashes)
+
+class FakeOutbound:
+    def __init__(self):
+        self.frames = []
+
+    def send(self , frame : bytes) -> bool:
+        self.frames.append(frame)
+        return True
+
+class FakeMessageProccessor:
+    """Records what is sent, routed ttl messages are only sent to the node ids in routes."""
+    def __init__(self , routes=()):
+        self.routes = set(routes)
+        self.sent = [] # (node_id , message)
+        self.sent_addresses = [] # address passed with each send_to_node.
+        self.routed = [] # (target_node_id , message)
+        self.flooded = []
+
+    async def send_to_node(self , node_id , message , address=None , flood=True):
+        self.sent.append((node_id , message))
+        self.sent_addresses.append(address)
+        return True
+
+    async def ttl_broadcast(self , message , target_node_id=None , flood=True):
+        if target_node_id in self.routes:
+            self.routed.append((target_node_id , message))
+            return True
+        if flood == False:
+            return False
+        self.flooded.append(message)
+        return True
+
+class FakeSignal:
+    def __init__(self):
+        self.emitted = []
+
+    def emit(self , *args):
+        self.emitted.append(args)
+
+class FakeServerEvents:
+    """Every attribute is a FakeSignal, created the first time it is used."""
+    def __getattr__(self , name):
+        signal = FakeSignal()
+        setattr(self , name , signal)
+        return signal
+
+class FakeServer:
+    """Has a logger, blockchain operations and working block, any other attributes a test needs are passed in."""
+    def __init__(self , **attributes):
+        self.working_block = Block()
+        self.logger = FakeLogger()
+        self.blockchain_operations = FakeBlockchainOperations(self)
+        for name , value in attributes.items():
+            setattr(self , name , value)
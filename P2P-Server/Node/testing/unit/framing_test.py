@@ -0,0 +1,42 @@
+import os
+import unittest
+import sys
+import asyncio
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root_dir = os.path.abspath(os.path.join(current_dir, "..", ".."))
+sys.path.append(project_root_dir)
+
+import server.core.constants as CONSTANTS
+from server.messaging.framing import encode_frame, read_frames, FrameTooLargeError
+
+async def collect_frames(data : bytes) -> list:
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    reader.feed_eof()
+    return [each_frame async for each_frame in read_frames(reader)]
+
+class TestFraming(unittest.TestCase):
+    def tearDown(self) -> None:
+        CONSTANTS.LEGACY_FRAMING = False
+
+    def test_length_prefixed_frames(self) -> None:
+        messages = ['{"code":0}' , '{"text":"#hash#"}' , "x" * 100000]
+        data = b"".join(encode_frame(each_message) for each_message in messages)
+        frames = asyncio.run(collect_frames(data))
+        self.assertEqual([each_frame.decode() for each_frame in frames] , messages)
+
+    def test_legacy_frames(self) -> None:
+        CONSTANTS.LEGACY_FRAMING = True
+        messages = ['{"code":0}' , '{"code":1}']
+        data = b"".join(encode_frame(each_message) for each_message in messages)
+        frames = asyncio.run(collect_frames(data))
+        self.assertEqual([each_frame.decode() for each_frame in frames] , messages)
+
+    def test_frame_too_large(self) -> None:
+        data = (CONSTANTS.MAX_FRAME_SIZE + 1).to_bytes(4 , "big")
+        with self.assertRaises(FrameTooLargeError):
+            asyncio.run(collect_frames(data))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import os
+import unittest
+import sys
+import json
+import tempfile
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root_dir = os.path.abspath(os.path.join(current_dir, "..", ".."))
+sys.path.append(project_root_dir)
+
+import generate_electors
+from utilities.elector_loading import iter_electors_file
+from blockchain.elector_registry import elector_key_bytes
+
+class TestGenerateElectors(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def path(self , name : str) -> str:
+        return os.path.join(self.directory.name , name)
+
+    def test_json_lines_and_roll(self) -> None:
+        generate_electors.write_electors(5 , self.path("electors.jsonl") , self.path("roll.jsonl") , workers=1)
+        electors = list(iter_electors_file(self.path("electors.jsonl")))
+        self.assertEqual(len(electors) , 5)
+        for each_elector in electors:
+            self.assertIsNotNone(elector_key_bytes(each_elector["public_key"]))
+            self.assertEqual(each_elector["elector_id"] , each_elector["public_key"][:4].lower())
+        roll = list(iter_electors_file(self.path("roll.jsonl")))
+        self.assertEqual([each["public_key"] for each in roll] , [each["public_key"] for each in electors])
+        self.assertNotIn("private_key" , roll[0])
+
+    def test_roll_written_as_json_lines(self) -> None:
+        generate_electors.write_electors(2 , self.path("electors.json") , self.path("roll.json") , workers=1)
+        self.assertFalse(os.path.exists(self.path("roll.json")))
+        roll = list(iter_electors_file(self.path("roll.json.jsonl")))
+        self.assertEqual(len(roll) , 2)
+
+    def test_json_object_output(self) -> None:
+        generate_electors.write_electors(3 , self.path("electors.json") , workers=1)
+        with open(self.path("electors.json")) as file:
+            electors = json.load(file)
+        self.assertEqual(list(electors.keys()) , ["0" , "1" , "2"])
+        self.assertEqual(set(electors["0"].keys()) , {"elector_id" , "public_key" , "private_key"})
+
+    def test_no_electors(self) -> None:
+        generate_electors.write_electors(0 , self.path("electors.json") , workers=1)
+        with open(self.path("electors.json")) as file:
+            self.assertEqual(json.load(file) , {})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import os
+import unittest
+import sys
+import asyncio
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root_dir = os.path.abspath(os.path.join(current_dir, "..", ".."))
+sys.path.append(project_root_dir)
+
+import server.core.constants as CONSTANTS
+from server.handlers.lead_failure_detector import LeadFailureDetector
+from fakes import FakeServer
+
+class RecordingDetector(LeadFailureDetector):
+    """Records reassigns instead of sending them."""
+    def __init__(self , server):
+        super().__init__(server)
+        self.reassigns = 0
+
+    async def reassign_lead_validator(self) -> None:
+        self.reassigns += 1
+
+class TestLeadFailureDetector(unittest.TestCase):
+    def setUp(self) -> None:
+        self.original_timeout = CONSTANTS.BLOCK_TIMEOUT
+        CONSTANTS.BLOCK_TIMEOUT = 0.1
+        self.server = FakeServer(validator=True)
+        self.detector = RecordingDetector(self.server)
+
+    def tearDown(self) -> None:
+        CONSTANTS.BLOCK_TIMEOUT = self.original_timeout
+
+    def test_head_changes_hold_off_reassign(self) -> None:
+        async def run():
+            self.detector.start()
+            for _ in range(0 , 6):
+                await asyncio.sleep(0.05)
+                self.detector.head_changed()
+            self.assertEqual(self.detector.reassigns , 0)
+            await asyncio.sleep(0.15)
+            self.assertEqual(self.detector.reassigns , 1)
+            self.detector.stop()
+        asyncio.run(run())
+
+    def test_reassign_repeats_while_no_block_is_added(self) -> None:
+        async def run():
+            self.detector.start()
+            await asyncio.sleep(0.35)
+            self.assertEqual(self.detector.reassigns , 3)
+            self.detector.stop()
+        asyncio.run(run())
+
+    def test_stops_when_no_longer_validator(self) -> None:
+        async def run():
+            self.detector.start()
+            self.server.validator = False
+            await asyncio.sleep(0.15)
+            self.assertEqual(self.detector.reassigns , 0)
+            self.assertIsNone(self.detector.deadline_handle)
+            self.detector.head_changed() # ignored once stopped.
+            self.assertIsNone(self.detector.deadline_handle)
+        asyncio.run(run())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import os
+import unittest
+import sys
+import tempfile
+import contextlib
+import io
+import threading
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root_dir = os.path.abspath(os.path.join(current_dir, "..", ".."))
+sys.path.append(project_root_dir)
+sys.path.append(os.path.join(project_root_dir, "testing", "intergration"))
+
+import server.core.constants as CONSTANTS
+from server.core.logger import Logger, LOG_EVENTS
+import logparser
+
+class TestLogger(unittest.TestCase):
+    def setUp(self) -> None:
+        self.original_directory = os.getcwd()
+        self.directory = tempfile.TemporaryDirectory()
+        os.chdir(self.directory.name) # the logger writes to logs/ in the working directory.
+        self.original_settings = (CONSTANTS.LOG_MAX_BYTES , CONSTANTS.LOG_BACKUP_COUNT , CONSTANTS.LOG_CACHE_SIZE)
+
+    def tearDown(self) -> None:
+        CONSTANTS.LOG_MAX_BYTES , CONSTANTS.LOG_BACKUP_COUNT , CONSTANTS.LOG_CACHE_SIZE = self.original_settings
+        os.chdir(self.original_directory)
+        self.directory.cleanup()
+
+    def read_lines(self , filename : str) -> list:
+        with open(os.path.join("logs" , filename)) as file:
+            return file.read().splitlines()
+
+    def test_lines_keep_parsed_format(self) -> None:
+        logger = Logger("test_log.txt" , False)
+        logger.Log("VOTE_COUNTED (abc, 1)")
+        with contextlib.redirect_stdout(io.StringIO()):
+            logger.Log("BLOCK_REJECTED (xyz)" , "warn")
+        logger.close()
+        entries = [logparser.parse_log_line(each_line) for each_line in self.read_lines("test_log.txt")]
+        entries = [each for each in entries if each is not None]
+        self.assertEqual([(each.tag , each.operation , each.data) for each in entries] , [
+            ("INFO" , "VOTE_COUNTED" , ("abc" , "1")),
+            ("WARN" , "BLOCK_REJECTED" , ("xyz" ,)),
+        ])
+
+    def test_flush_writes_queued_lines(self) -> None:
+        logger = Logger("test_log.txt" , False)
+        for i in range(0 , 100):
+            logger.Log(f"line {i}")
+        logger.flush()
+        self.assertEqual(self.read_lines("test_log.txt")[-1].split("] ")[-1] , "line 99")
+        logger.close()
+
+    def test_rotation(self) -> None:
+        CONSTANTS.LOG_MAX_BYTES , CONSTANTS.LOG_BACKUP_COUNT = 200 , 2
+        logger = Logger("test_log.txt" , False)
+        for i in range(0 , 6):
+            logger.Log("x" * 100)
+            logger.flush()
+        logger.close()
+        self.assertTrue(os.path.exists(os.path.join("logs" , "test_log.txt.1")))
+        self.assertTrue(os.path.exists(os.path.join("logs" , "test_log.txt.2")))
+        self.assertFalse(os.path.exists(os.path.join("logs" , "test_log.txt.3")))
+
+    def test_display_keeps_recent_lines(self) -> None:
+        CONSTANTS.LOG_CACHE_SIZE = 5
+        logger = Logger("test_log.txt" , False)
+        for i in range(0 , 20):
+            logger.Log(f"line {i}")
+        logger.close()
+        self.assertEqual(len(logger.log_cache) , 5)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            logger.display_logs(2)
+        self.assertIn("line 19" , output.getvalue())
+        self.assertNotIn("line 17" , output.getvalue())
+
+    def test_event_records(self) -> None:
+        logger = Logger("test_log.txt" , False)
+        logger.event(LOG_EVENTS.VOTE_SUBMITTED , 1)
+        logger.event(LOG_EVENTS.SERVER_STARTED , "0.0.0.0" , 8000)
+        logger.event(LOG_EVENTS.OWN_VOTE_DETECTED , "abc")
+        logger.close()
+
+        self.assertIn("SERVER_STARTED (0.0.0.0,8000)" , self.read_lines("test_log.txt")[-2])
+        event_log = logparser.EventLog()
+        for each_line in self.read_lines("test_log_events.jsonl"):
+            event_log.append(logparser.parse_event_line(each_line))
+        self.assertEqual(event_log.first("SERVER_STARTED").params , ["0.0.0.0" , 8000])
+        self.assertEqual(event_log.first("VOTE_SUBMITTED").params , [1])
+        self.assertGreaterEqual(logparser.latency_ms(event_log.first("VOTE_SUBMITTED") , event_log.first("OWN_VOTE_DETECTED")) , 0)
+        self.assertEqual(event_log.get("BLOCK_REJECTED") , [])
+
+    def test_wait_for_event(self) -> None:
+        logger = Logger("test_log.txt" , False)
+        self.assertFalse(logger.wait_for_event("VOTE_COUNTED" , 0.05))
+        timer = threading.Timer(0.05 , logger.event , (LOG_EVENTS.VOTE_COUNTED , 1))
+        timer.start()
+        self.assertTrue(logger.wait_for_event("VOTE_COUNTED" , 5))
+        self.assertTrue(logger.wait_for_event("VOTE_COUNTED" , 0)) # already logged.
+        timer.join()
+        logger.close()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import os
+import unittest
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root_dir = os.path.abspath(os.path.join(current_dir, "..", ".."))
+sys.path.append(project_root_dir)
+
+from server.messaging.message_id_cache import MessageIdCache
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+    def __call__(self) -> float:
+        return self.now
+
+class TestMessageIdCache(unittest.TestCase):
+    def test_ids_expire_after_window(self) -> None:
+        clock = FakeClock()
+        cache = MessageIdCache(60 , 1000 , 5 , clock)
+        cache.add("a")
+        clock.now += 61
+        self.assertIn("a" , cache) # kept in the previous generation.
+        clock.now += 61
+        self.assertNotIn("a" , cache)
+
+    def test_size_bound(self) -> None:
+        clock = FakeClock()
+        cache = MessageIdCache(60 , 10 , 5 , clock)
+        for i in range(0 , 100):
+            cache.add(str(i))
+        self.assertLessEqual(len(cache) , 10)
+        self.assertIn("99" , cache)
+
+    def test_old_and_future_timestamps_rejected(self) -> None:
+        clock = FakeClock()
+        cache = MessageIdCache(60 , 1000 , 5 , clock)
+        self.assertTrue(cache.is_timestamp_valid(clock.now - 30))
+        self.assertFalse(cache.is_timestamp_valid(clock.now - 61))
+        self.assertFalse(cache.is_timestamp_valid(clock.now + 10))
+        self.assertFalse(cache.is_timestamp_valid(None))
+
+    def test_early_rotation_shrinks_accepted_window(self) -> None:
+        clock = FakeClock()
+        cache = MessageIdCache(60 , 4 , 5 , clock)
+        cache.add("a" , clock.now)
+        clock.now += 10
+        for i in range(0 , 4):
+            cache.add(str(i) , clock.now - 4 + i) # forces rotations before the window ends.
+        self.assertNotIn("a" , cache)
+        self.assertNotIn("0" , cache)
+        self.assertFalse(cache.is_timestamp_valid(clock.now - 10)) # "a" could be replayed.
+        self.assertFalse(cache.is_timestamp_valid(clock.now - 4)) # so could "0".
+        self.assertTrue(cache.is_timestamp_valid(clock.now - 3))
+        self.assertTrue(cache.is_timestamp_valid(clock.now))
+
+    def test_size_rotation_rejects_forgotten_timestamps(self) -> None:
+        clock = FakeClock()
+        cache = MessageIdCache(60 , 4 , 5 , clock)
+        clock.now += 30
+        sent = {str(i) : clock.now - 20 + i for i in range(0 , 20)}
+        for message_id , timestamp in sent.items():
+            cache.add(message_id , timestamp) # several rotations at the same instant.
+        for message_id , timestamp in sent.items():
+            # a replayed message is either remembered or too old to be accepted.
+            self.assertTrue(message_id in cache or not cache.is_timestamp_valid(timestamp))
+        self.assertNotIn("0" , cache)
+        self.assertGreater(cache.oldest_accepted_timestamp() , clock.now - 60) # the window never widens.
+        self.assertTrue(cache.is_timestamp_valid(clock.now))
+
+if __name__ == '__main__':
+    unittest.main()
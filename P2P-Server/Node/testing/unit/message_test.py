@@ -0,0 +1,46 @@
+import os
+import unittest
+import sys
+import json
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root_dir = os.path.abspath(os.path.join(current_dir, "..", ".."))
+sys.path.append(project_root_dir)
+
+from server.messaging.framing import FRAME_HEADER
+from server.messaging.message import Message, rewrite_ttl_frame
+
+def generate_message(ttl_value : int) -> Message:
+    fields = {"action" : "TEST", "sender" : "node", "nonce" : "ab" , "data" : {"b" : 1 , "a" : [1 , 2]}}
+    signed_json = json.dumps(fields , sort_keys=True)
+    return Message(fields , signed_json , "c2lnbmF0dXJl" , ttl_value)
+
+class TestMessage(unittest.TestCase):
+    def test_wire_json_matches_signed_json(self) -> None:
+        message = generate_message(3)
+        parsed = json.loads(message.wire_json())
+        self.assertEqual(parsed.pop("signature") , "c2lnbmF0dXJl")
+        self.assertEqual(parsed.pop("ttl_value") , 3)
+        self.assertEqual(json.dumps(parsed , sort_keys=True) , message.signed_json)
+
+    def test_no_ttl_value(self) -> None:
+        parsed = json.loads(generate_message(0).wire_json())
+        self.assertNotIn("ttl_value" , parsed)
+
+    def test_rewrite_ttl_frame(self) -> None:
+        message = generate_message(3)
+        raw_message = message.wire_json().encode("utf-8")
+        frame = rewrite_ttl_frame(raw_message , 3 , 2)
+        payload = frame[FRAME_HEADER.size:]
+        self.assertEqual(FRAME_HEADER.unpack(frame[:FRAME_HEADER.size])[0] , len(payload))
+        parsed = json.loads(payload)
+        self.assertEqual(parsed["ttl_value"] , 2)
+        self.assertEqual(parsed["data"] , message.fields["data"])
+
+    def test_rewrite_ttl_frame_mismatch(self) -> None:
+        raw_message = generate_message(3).wire_json().encode("utf-8")
+        self.assertIsNone(rewrite_ttl_frame(raw_message , 4 , 3))
+        self.assertIsNone(rewrite_ttl_frame(b'{"ttl_value": 3, "a": 1}' , 3 , 2))
+
+if __name__ == '__main__':
+    unittest.main()
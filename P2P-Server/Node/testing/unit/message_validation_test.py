@@ -0,0 +1,79 @@
+import os
+import unittest
+import sys
+import asyncio
+import time
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root_dir = os.path.abspath(os.path.join(current_dir, "..", ".."))
+sys.path.append(project_root_dir)
+
+import server.core.constants as CONSTANTS
+from server.core.constants import MESSAGE_CODES
+from server.messaging.network_estimator import NetworkEstimator
+from server.messaging.message_id_cache import MessageIdCache
+from server.messaging.message_actions import is_message_valid, wait_for_verification
+from fakes import FakeServer
+
+class FakeCryptoExecutor:
+    """Holds every signature check until release is set, then answers with the queued results in order."""
+    def __init__(self , results):
+        self.results = list(results)
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def verify(self , sender , public_key_str , message_json , signature) -> bool:
+        self.calls += 1
+        result = self.results.pop(0)
+        await self.release.wait()
+        return result
+
+def make_message() -> dict:
+    return {"code" : MESSAGE_CODES.PING.value , "id" : "m1" , "sender" : "a" , "timestamp" : time.time() , "signature" : "c2ln" , "message_type" : "ttl"}
+
+async def receive(server , message) -> bool:
+    """The checks handle_message makes on each copy before acting on it."""
+    await wait_for_verification(server , message.get("id"))
+    return await is_message_valid(server , message)
+
+class TestMessageValidation(unittest.TestCase):
+    def make_server(self , results) -> FakeServer:
+        return FakeServer(
+            processed_messages=MessageIdCache(CONSTANTS.MESSAGE_ID_WINDOW , CONSTANTS.MESSAGE_ID_CACHE_SIZE , CONSTANTS.MAX_CLOCK_SKEW),
+            pending_verifications={},
+            network_estimator=NetworkEstimator(2 , 10 , 60),
+            peer_directory={"a" : {"public_key" : "key"}},
+            crypto_executor=FakeCryptoExecutor(results),
+        )
+
+    def test_concurrent_copies_checked_once(self) -> None:
+        async def run():
+            server = self.make_server([True])
+            first = asyncio.create_task(receive(server , make_message()))
+            second = asyncio.create_task(receive(server , make_message()))
+            await asyncio.sleep(0)
+            server.crypto_executor.release.set()
+            return server , await first , await second
+        server , first , second = asyncio.run(run())
+        self.assertTrue(first)
+        self.assertFalse(second)
+        self.assertEqual(server.crypto_executor.calls , 1)
+        self.assertIn("m1" , server.processed_messages)
+        self.assertEqual(server.pending_verifications , {})
+
+    def test_failed_check_releases_reservation(self) -> None:
+        async def run():
+            server = self.make_server([False , True])
+            forged = asyncio.create_task(receive(server , make_message()))
+            genuine = asyncio.create_task(receive(server , make_message()))
+            await asyncio.sleep(0)
+            server.crypto_executor.release.set()
+            return server , await forged , await genuine
+        server , forged , genuine = asyncio.run(run())
+        self.assertFalse(forged)
+        self.assertTrue(genuine)
+        self.assertEqual(server.crypto_executor.calls , 2)
+        self.assertIn("m1" , server.processed_messages)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import os
+import unittest
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root_dir = os.path.abspath(os.path.join(current_dir, "..", ".."))
+sys.path.append(project_root_dir)
+
+from server.messaging.network_estimator import NetworkEstimator
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+class TestNetworkEstimator(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+        self.estimator = NetworkEstimator(safety_margin=1 , max_ttl=16 , window=60 , clock=self.clock)
+
+    def test_ttl_covers_furthest_known_node(self) -> None:
+        self.estimator.observe_distance("b" , 1)
+        self.estimator.observe_distance("c" , 4)
+        self.assertEqual(self.estimator.time_to_live(3 , 1 , {}) , 5)
+
+    def test_routes_and_observations_keep_shortest(self) -> None:
+        self.estimator.observe_distance("c" , 6)
+        self.assertEqual(self.estimator.time_to_live(2 , 1 , {"c" : 2}) , 3)
+
+    def test_estimates_from_size_when_distances_missing(self) -> None:
+        # 64 nodes with 4 connections each, only one distance known.
+        self.assertEqual(self.estimator.time_to_live(64 , 4 , {"b" : 1}) , 4)
+
+    def test_single_connection_doesnt_divide_by_zero(self) -> None:
+        self.assertEqual(self.estimator.time_to_live(1 , 0 , {}) , 2)
+        self.assertEqual(self.estimator.time_to_live(8 , 1 , {}) , 4)
+
+    def test_ttl_is_capped(self) -> None:
+        self.estimator.observe_distance("z" , 40)
+        self.assertEqual(self.estimator.time_to_live(2 , 1 , {}) , 16)
+
+    def test_old_distances_expire(self) -> None:
+        self.estimator.observe_distance("c" , 5)
+        self.clock.now += 61
+        self.assertEqual(self.estimator.time_to_live(2 , 1 , {"c" : 1}) , 2)
+        self.assertNotIn("c" , self.estimator.distances)
+
+    def test_duplicates_per_message(self) -> None:
+        self.assertEqual(self.estimator.duplicates_per_message() , 0)
+        for duplicate in (False , True , True , False , True):
+            self.estimator.record_reception(duplicate)
+        self.assertEqual(self.estimator.duplicates_per_message() , 1.5)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import os
+import unittest
+import sys
+import asyncio
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root_dir = os.path.abspath(os.path.join(current_dir, "..", ".."))
+sys.path.append(project_root_dir)
+
+from server.messaging.outbound_queue import OutboundQueue
+
+class FakeWriter:
+    """Records written frames, drain blocks until release is set to simulate a slow peer."""
+    def __init__(self):
+        self.written = []
+        self.release = asyncio.Event()
+        self.is_closed = False
+
+    def write(self , data : bytes) -> None:
+        self.written.append(data)
+
+    async def drain(self) -> None:
+        await self.release.wait()
+
+    def close(self) -> None:
+        self.is_closed = True
+
+async def fill_slow_queue(overflow_policy : str) -> tuple:
+    writer = FakeWriter()
+    errors = []
+    outbound = OutboundQueue(writer , 2 , overflow_policy , errors.append)
+    outbound.send(b"first")
+    await asyncio.sleep(0) # writer task takes the first frame and blocks on drain.
+    results = [outbound.send(each_frame) for each_frame in (b"second" , b"third" , b"fourth")]
+    writer.release.set()
+    await asyncio.sleep(0.01)
+    outbound.close()
+    return writer , outbound , results , errors
+
+class TestOutboundQueue(unittest.TestCase):
+    def test_drop_policy(self) -> None:
+        writer , outbound , results , errors = asyncio.run(fill_slow_queue("drop"))
+        self.assertEqual(results , [True , True , False])
+        self.assertEqual(writer.written , [b"first" , b"second" , b"third"])
+        self.assertEqual(outbound.frames_dropped , 1)
+        self.assertEqual(outbound.frames_sent , 3)
+        self.assertFalse(writer.is_closed)
+        self.assertEqual(len(errors) , 1)
+
+    def test_disconnect_policy(self) -> None:
+        writer , outbound , results , errors = asyncio.run(fill_slow_queue("disconnect"))
+        self.assertEqual(results , [True , True , False])
+        self.assertTrue(writer.is_closed)
+        self.assertFalse(outbound.send(b"fifth"))
+
+    def test_invalid_policy(self) -> None:
+        with self.assertRaises(ValueError):
+            OutboundQueue(FakeWriter() , 2 , "block")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import os
+import asyncio
+import unittest
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root_dir = os.path.abspath(os.path.join(current_dir, "..", ".."))
+sys.path.append(project_root_dir)
+
+import server.core.constants as CONSTANTS
+from server.core.constants import MESSAGE_CODES
+from server.core.connection_registry import Connection, ConnectionRegistry
+from server.messaging.plumtree import Plumtree
+from fakes import FakeServer, FakeOutbound, FakeMessageProccessor
+
+def make_server(neighbor_ids) -> FakeServer:
+    server = FakeServer(connections=ConnectionRegistry() , processed_messages=set() , message_proccessor=FakeMessageProccessor())
+    for port , node_id in enumerate(neighbor_ids):
+        server.connections.add(Connection("127.0.0.1" , port , node_id + "_writer" , node_id , FakeOutbound()))
+    return server
+
+
+class TestPlumtree(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.saved_constants = (CONSTANTS.PLUMTREE_IHAVE_INTERVAL , CONSTANTS.PLUMTREE_GRAFT_TIMEOUT)
+        CONSTANTS.PLUMTREE_IHAVE_INTERVAL = 0.01
+        CONSTANTS.PLUMTREE_GRAFT_TIMEOUT = 0.02
+        self.server = make_server(["b" , "c" , "d"])
+        self.plumtree = Plumtree(self.server)
+
+    def tearDown(self) -> None:
+        CONSTANTS.PLUMTREE_IHAVE_INTERVAL , CONSTANTS.PLUMTREE_GRAFT_TIMEOUT = self.saved_constants
+
+    def outbound(self , node_id : str) -> FakeOutbound:
+        return self.server.connections.get_by_node_id(node_id).outbound
+
+    def sent_messages(self) -> list:
+        """(node_id , code , message_ids) of each message sent with send_to_node."""
+        return [(node_id , message["code"] , message["data"]["message_ids"]) for node_id , message in self.server.message_proccessor.sent]
+
+    async def test_gossip_pushed_to_eager_and_announced_to_lazy(self) -> None:
+        self.plumtree.lazy_peers.add("d")
+        self.plumtree.handle_gossip({"id" : "m1"} , b'{"id": "m1"}' , "b_writer")
+        self.assertEqual(len(self.outbound("b").frames) , 0) # not sent back to the sender.
+        self.assertEqual(len(self.outbound("c").frames) , 1)
+        self.assertEqual(len(self.outbound("d").frames) , 0)
+
+        await asyncio.sleep(0.05)
+        self.assertIn(("d" , MESSAGE_CODES.PLUMTREE_IHAVE.value , ["m1"]) , self.sent_messages())
+
+    async def test_duplicate_prunes_sender(self) -> None:
+        self.plumtree.handle_duplicate({"id" : "m1"} , "c_writer")
+        await asyncio.sleep(0)
+        self.assertIn("c" , self.plumtree.lazy_peers)
+        self.assertIn(("c" , MESSAGE_CODES.PLUMTREE_PRUNE.value , []) , self.sent_messages())
+
+    async def test_missing_message_is_grafted(self) -> None:
+        self.plumtree.lazy_peers.add("c")
+        self.plumtree.handle_ihave({"sender" : "c" , "data" : {"message_ids" : ["m2"]}})
+        await asyncio.sleep(0.05)
+        self.assertNotIn("c" , self.plumtree.lazy_peers)
+        self.assertIn(("c" , MESSAGE_CODES.PLUMTREE_GRAFT.value , ["m2"]) , self.sent_messages())
+
+    async def test_received_message_cancels_graft(self) -> None:
+        self.plumtree.handle_ihave({"sender" : "c" , "data" : {"message_ids" : ["m3"]}})
+        self.plumtree.handle_gossip({"id" : "m3"} , b'{"id": "m3"}' , "b_writer")
+        self.server.processed_messages.add("m3")
+        await asyncio.sleep(0.05)
+        self.assertEqual(self.plumtree.grafts , 0)
+
+    async def test_graft_sends_cached_message(self) -> None:
+        self.plumtree.lazy_peers.add("d")
+        self.plumtree.handle_gossip({"id" : "m4"} , b'{"id": "m4"}' , "b_writer")
+        self.plumtree.handle_graft({"sender" : "d" , "data" : {"message_ids" : ["m4"]}})
+        self.assertNotIn("d" , self.plumtree.lazy_peers)
+        self.assertEqual(len(self.outbound("d").frames) , 1)
+
+if __name__ == "__main__":
+    unittest.main()
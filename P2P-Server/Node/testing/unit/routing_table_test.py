@@ -0,0 +1,71 @@
+import os
+import unittest
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root_dir = os.path.abspath(os.path.join(current_dir, "..", ".."))
+sys.path.append(project_root_dir)
+
+from server.messaging.routing_table import RoutingTable
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+class TestRoutingTable(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+        self.routing_table = RoutingTable(max_hops=4 , expiry=10 , clock=self.clock)
+
+    def test_shortest_route_kept(self) -> None:
+        self.routing_table.update_from_neighbor("b" , {"b" : [0 , "b"] , "d" : [2 , "c"]} , "a")
+        self.routing_table.update_from_neighbor("c" , {"c" : [0 , "c"] , "d" : [1 , "d"]} , "a")
+        route = self.routing_table.get_route("d")
+        self.assertEqual((route.next_hop , route.hops) , ("c" , 2))
+        self.assertIsNone(self.routing_table.get_route("b")) # neighbors aren't stored as routes.
+
+    def test_split_horizon_and_max_hops(self) -> None:
+        self.routing_table.update_from_neighbor("b" , {"d" : [1 , "a"] , "e" : [4 , "f"]} , "a")
+        self.assertIsNone(self.routing_table.get_route("d"))
+        self.assertIsNone(self.routing_table.get_route("e"))
+
+    def test_same_next_hop_updates_worse_route(self) -> None:
+        self.routing_table.update_from_neighbor("b" , {"d" : [1 , "d"]} , "a")
+        self.routing_table.update_from_neighbor("b" , {"d" : [3 , "e"]} , "a")
+        self.assertEqual(self.routing_table.get_route("d").hops , 4)
+
+    def test_expiry_and_remove_neighbor(self) -> None:
+        self.routing_table.update_from_neighbor("b" , {"d" : [1 , "d"]} , "a")
+        self.routing_table.update_from_neighbor("c" , {"e" : [1 , "e"]} , "a")
+        self.routing_table.remove_neighbor("c")
+        self.assertIsNone(self.routing_table.get_route("e"))
+
+        self.clock.now += 11
+        self.assertIsNone(self.routing_table.get_route("d"))
+        self.assertEqual(len(self.routing_table) , 0)
+
+    def test_advertise(self) -> None:
+        self.routing_table.update_from_neighbor("b" , {"d" : [1 , "d"]} , "a")
+        advertised = self.routing_table.advertise("a" , ["b"])
+        self.assertEqual(advertised , {"a" : [0 , "a"] , "b" : [1 , "b"] , "d" : [2 , "b"]})
+    def test_malformed_routes_skipped(self) -> None:
+        self.routing_table.update_from_neighbor("b" , {
+            "c" : [1 , "c" , "x"],
+            "d" : "1,d",
+            "e" : [-1 , "e"],
+            "f" : ["1" , "f"],
+            "g" : [1 , None],
+            "h" : [True , "h"],
+            "i" : {"hops" : 1},
+            "j" : [1 , "j"],
+        } , "a")
+        self.assertEqual(list(self.routing_table.routes) , ["j"])
+        self.routing_table.update_from_neighbor("c" , ["not" , "a" , "dict"] , "a")
+        self.routing_table.update_from_neighbor("c" , None , "a")
+        self.assertEqual(len(self.routing_table) , 1)
+
+if __name__ == '__main__':
+    unittest.main()
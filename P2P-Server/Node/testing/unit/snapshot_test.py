@@ -0,0 +1,50 @@
+import os
+import unittest
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root_dir = os.path.abspath(os.path.join(current_dir, "..", ".."))
+sys.path.append(project_root_dir)
+
+from blockchain.blockchain_snapshot import Snapshot
+
+class TestSnapshotCopyOnWrite(unittest.TestCase):
+    def setUp(self) -> None:
+        self.snapshot = Snapshot()
+        self.snapshot.add_validator("node1")
+        self.snapshot.add_candidate("A" , 1)
+        self.snapshot.add_vote(1)
+
+    def test_copy_shares_until_changed(self) -> None:
+        copied_snapshot = self.snapshot.copy()
+        self.assertIs(copied_snapshot.vote_tally , self.snapshot.vote_tally)
+        self.assertIs(copied_snapshot.validator_addresses , self.snapshot.validator_addresses)
+
+        self.snapshot.add_vote(1)
+        self.snapshot.add_validator("node2")
+        self.snapshot.add_candidate("B" , 2)
+        self.assertEqual(copied_snapshot.vote_tally , {1 : 1})
+        self.assertEqual(copied_snapshot.validator_addresses , ["node1"])
+        self.assertNotIn(2 , copied_snapshot.get_candidates())
+        self.assertEqual(self.snapshot.vote_tally , {1 : 2})
+
+    def test_copy_changes_dont_reach_original(self) -> None:
+        copied_snapshot = self.snapshot.copy()
+        copied_snapshot.add_vote(1)
+        self.assertEqual(self.snapshot.vote_tally , {1 : 1})
+
+    def test_tally_view_is_read_only_and_fixed(self) -> None:
+        tally_view = self.snapshot.vote_tally_view()
+        with self.assertRaises(TypeError):
+            tally_view[1] = 5
+        self.snapshot.add_vote(1)
+        self.assertEqual(tally_view[1] , 1)
+        self.assertEqual(self.snapshot.vote_tally_view()[1] , 2)
+
+    def test_unshared_writes_dont_copy(self) -> None:
+        tally = self.snapshot.vote_tally
+        self.snapshot.add_vote(1)
+        self.assertIs(self.snapshot.vote_tally , tally)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import os
+import unittest
+import sys
+import asyncio
+import json
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root_dir = os.path.abspath(os.path.join(current_dir, "..", ".."))
+sys.path.append(project_root_dir)
+
+import utilities.authentication as auth
+from utilities.key_cache import PublicKeyCache
+from blockchain.blockchain_snapshot import Snapshot
+from server.core.crypto_executor import CryptoExecutor
+from server.handlers.vote_ingestion import VoteIngestor
+from fakes import FakeServer, FakeBlockValidator
+
+def make_vote(private_key , public_key_str : str , choice : int , nonce : str) -> dict:
+    vote_package = {"elector_public_key" : public_key_str , "choice" : choice , "nonce" : nonce}
+    signature = auth.generate_signature_ecdsa(private_key , json.dumps(vote_package , sort_keys=True))
+    return {"data" : {"vote_package" : vote_package , "signature" : signature}}
+
+class TestVoteIngestor(unittest.TestCase):
+    def setUp(self) -> None:
+        rsa_private_key , _ = auth.generate_rsa_key_pair()
+        self.crypto_executor = CryptoExecutor(rsa_private_key , PublicKeyCache(8) , "thread" , max_workers=2 , batch_size=4)
+        self.server = FakeServer(snapshot=Snapshot() , crypto_executor=self.crypto_executor , block_validator=FakeBlockValidator())
+        self.server.snapshot.add_candidate("A" , 1)
+        self.electors = []
+        for _ in range(0 , 6):
+            private_key , public_key = auth.generate_ecdsa_key_pair()
+            public_key_str = auth.compress_ecdsa_key(public_key)
+            self.server.snapshot.add_elector(public_key_str)
+            self.electors.append((private_key , public_key_str))
+
+    def tearDown(self) -> None:
+        self.crypto_executor.shutdown()
+
+    def ingest(self , vote_messages : list) -> VoteIngestor:
+        async def run() -> VoteIngestor:
+            vote_ingestor = VoteIngestor(self.server)
+            for each_message in vote_messages:
+                vote_ingestor.submit(each_message)
+            vote_ingestor.flush()
+            await asyncio.sleep(0)
+            async with vote_ingestor.batch_lock:
+                pass
+            return vote_ingestor
+        return asyncio.run(run())
+
+    def counted_voters(self) -> list:
+        return [each.data["voter_public_key"] for each in self.server.working_block.data if each.operation == "ADD_VOTE"]
+
+    def test_valid_votes_are_added_in_bulk(self) -> None:
+        messages = [make_vote(private_key , public_key_str , 1 , str(i)) for i , (private_key , public_key_str) in enumerate(self.electors)]
+        vote_ingestor = self.ingest(messages)
+        self.assertEqual(vote_ingestor.votes_accepted , 6)
+        self.assertEqual(sorted(self.counted_voters()) , sorted(each[1] for each in self.electors))
+        self.assertEqual(self.server.block_validator.verified , {each.hash for each in self.server.working_block.data})
+
+    def test_repeated_votes_in_batch_counted_once(self) -> None:
+        private_key , public_key_str = self.electors[0]
+        messages = [make_vote(private_key , public_key_str , 1 , "a") , make_vote(private_key , public_key_str , 1 , "b")]
+        messages.append(messages[0])
+        vote_ingestor = self.ingest(messages)
+        self.assertEqual(self.counted_voters() , [public_key_str])
+        self.assertEqual(vote_ingestor.votes_rejected , 2)
+
+    def test_forged_vote_doesnt_block_real_vote(self) -> None:
+        private_key , public_key_str = self.electors[0]
+        forger_key , _ = auth.generate_ecdsa_key_pair()
+        messages = [make_vote(forger_key , public_key_str , 1 , "a") , make_vote(private_key , public_key_str , 1 , "b")]
+        self.ingest(messages)
+        self.assertEqual(self.counted_voters() , [public_key_str])
+
+    def test_invalid_votes_rejected(self) -> None:
+        private_key , public_key_str = self.electors[0]
+        unknown_key , unknown_public_key = auth.generate_ecdsa_key_pair()
+        self.server.snapshot.set_elector_voted(self.electors[1][1] , True)
+        messages = [
+            make_vote(private_key , public_key_str , 7 , "a"), # unknown candidate
+            make_vote(unknown_key , auth.compress_ecdsa_key(unknown_public_key) , 1 , "b"), # unregistered elector
+            make_vote(self.electors[1][0] , self.electors[1][1] , 1 , "c"), # already voted
+            {"data" : {"vote_package" : {"choice" : 1}}}, # malformed
+        ]
+        vote_ingestor = self.ingest(messages)
+        self.assertEqual(vote_ingestor.votes_accepted , 0)
+        self.assertEqual(vote_ingestor.votes_rejected , 4)
+        self.assertEqual(self.counted_voters() , [])
+        self.assertIn("CANDIDATE_CHOSEN_NOT_VALID (7)" , self.server.logger.lines)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -52,6 +52,10 @@ class ServerThread(QThread):
         self.loop.run_until_complete(self.start_server())
 
     def cleanup(self):
+        if self.server:
+            self.server.crypto_executor.shutdown()
+            if self.server.block_store is not None:
+                self.server.block_store.close()
         if self.server and self.server.server:
             self.loop.run_until_complete(self.server.server.wait_closed())
         self.loop.close()
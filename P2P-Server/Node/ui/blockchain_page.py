@@ -8,9 +8,9 @@ from PyQt5.QtCore import Qt
 
 from utilities.utilities import clamp
 import typing
-from utilities.book import Book
 
 MAX_FONT_SIZE = 30
+PAGE_SIZE = 10
 
 class BlockchainPage(QWidget):
     def __init__(self, main_window: QMainWindow):
@@ -19,6 +19,8 @@ class BlockchainPage(QWidget):
 
     
         self.page = 0
+        self.page_count = 1
+        self.page_full = False # a full page doesn't change when blocks are added so it isnt requested again.
         self.create_widgets()
         self.format()
         self.apply_styles()
@@ -59,25 +61,35 @@ class BlockchainPage(QWidget):
 
     def leftButtonClicked(self):
         self.page -= 1  
-        self.page = clamp(self.page , 0 , self.blockchain_book.length - 1)
-        self.change_page()
+        self.page = clamp(self.page , 0 , self.page_count - 1)
+        self.request_page()
 
     def rightButtonClicked(self):
         self.page += 1 
-        self.page = clamp(self.page , 0 , self.blockchain_book.length - 1)
-        self.change_page()
+        self.page = clamp(self.page , 0 , self.page_count - 1)
+        self.request_page()
 
+    def request_page(self) -> None:
+        """Asks the server for the blocks on the current page, they arrive through blc_blockchain_page."""
+        self.main_window.ui_events.request_blockchain_page.emit(self.page , PAGE_SIZE)
 
-    def change_page(self) -> None:
+    def on_blockchain_page(self , page : dict) -> None:
+        self.page = page.get("page" , 0)
+        self.page_count = page.get("page_count" , 1)
+        page_data : typing.List[dict] = page.get("blocks" , [])
+        self.page_full = len(page_data) == PAGE_SIZE
+        self.change_page(page_data)
+
+    def change_page(self , page_data : typing.List[dict]) -> None:
         
         self.pageTitleLabel.setText(f"Page: {self.page}")
 
-        page_data : typing.List[dict] = self.blockchain_book.get_page(self.page)
         each_button : QPushButton
         for each_button in self.buttonList:
             each_button.setText("")
 
         for i, each_button in enumerate(self.buttonList):
+            each_button.block_hash = None
             if 0 <= i < len(page_data):
                 block_hash = page_data[i].get("hash" , "")
                 each_button.block_hash = block_hash
@@ -95,7 +107,7 @@ class BlockchainPage(QWidget):
         return button
 
     def block_button_clicked(self , button : QPushButton):
-        if hasattr(button , "block_hash") == False: return 
+        if getattr(button , "block_hash" , None) is None: return 
         print(button.block_hash)
         self.main_window.switch_page(self.main_window.block_page , button.block_hash)
 
@@ -146,21 +158,26 @@ class BlockchainPage(QWidget):
 
     def setupEvents(self):
         self.main_window.server_events.blc_blockchain_updated.connect(self.on_blockchain_updated)
+        self.main_window.server_events.blc_blockchain_page.connect(self.on_blockchain_page)
+        self.main_window.server_events.blc_new_blockchain_loaded.connect(self.on_blockchain_loaded)
 
         self.main_window.server_events.blc_snapshot_head_updated.connect(
             lambda new_head: (self.subTitleLabel.setText(f"Head: {new_head[:6]}") , self.focused())
         )
 
     def focused(self , *args):
-        pass
-
-    def on_blockchain_updated(self) -> None:
-        serialized_blockchain : dict | None = self.main_window.server_interface.blockchain
-        if serialized_blockchain is None: return
-        chainlist : list = serialized_blockchain.get("chainlist" , None)
-        if chainlist is None: return
-        self.blockchain_book = Book(chainlist , 10)
-        self.change_page()
+        self.request_page()
+
+    def on_blockchain_updated(self , update : dict) -> None:
+        """Only the page being shown is requested again, and only if it had room for the new blocks."""
+        self.page_count = max(1 , (update.get("height" , 0) + PAGE_SIZE - 1) // PAGE_SIZE)
+        if self.isVisible() and self.page_full == False:
+            self.request_page()
+
+    def on_blockchain_loaded(self) -> None:
+        self.page_full = False
+        if self.isVisible():
+            self.request_page()
 
     def apply_styles(self):
         primary_color = "#6A0DAD"
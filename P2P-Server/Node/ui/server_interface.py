@@ -16,9 +16,9 @@ class ServerInterface():
     n_connections : int
     validator_list : typing.List
     blockchain_head : str | None
-    blockchain : dict
+    blockchain_height : int
     node_directory : dict
-    vote_tally : dict
+    vote_tally : typing.Mapping
     candidates : typing.List[typing.Tuple[str , int]]
     """This class will be used to store the state of a the server for easy lookup in UI classes"""
     def __init__(self , main_window):
@@ -30,7 +30,7 @@ class ServerInterface():
 
         self.node_directory = {}
         self.candidates = []
-        self.blockchain = None
+        self.blockchain_height = 0
         self.lead_validator = None
         self.validator_list = []
         self.block_table = {}
@@ -68,7 +68,7 @@ class ServerInterface():
         self.blockchain_head = new_snapshot.blockchain_head
         self.lead_validator = new_snapshot.lead_validator
 
-    def new_vote_added(self , new_vote_tally : dict):
+    def new_vote_added(self , new_vote_tally : typing.Mapping):
         print(new_vote_tally)
         self.vote_tally = new_vote_tally
 
@@ -86,7 +86,7 @@ class ServerInterface():
         )
 
         server_events.blc_blockchain_updated.connect(
-            lambda new_blockchain : self.__setattr__("blockchain" , new_blockchain)
+            lambda update : self.__setattr__("blockchain_height" , update.get("height" , 0))
         )
 
         server_events.sys_new_node_id.connect(
@@ -97,8 +97,9 @@ class ServerInterface():
             lambda new_head : self.__setattr__("blockchain_head" , new_head)
         )
 
+        # the validator list can be shared with a snapshot so it is replaced rather than appended to.
         server_events.blc_validator_added.connect(
-            lambda node_id : self.validator_list.append(node_id)
+            lambda node_id : self.__setattr__("validator_list" , self.validator_list + [node_id])
         )
 
         server_events.blc_lead_validator_set.connect(
@@ -43,12 +43,13 @@ class UIEventHandler():
         self.ui_events.submit_vote.connect(self.submit_vote)
         self.ui_events.load_electors_from_file.connect(self.load_all_electors_from_file)
         self.ui_events.add_validator_pressed.connect(self.add_validator)
+        self.ui_events.request_blockchain_page.connect(self.request_blockchain_page)
     
     def load_all_electors_from_file(self):
         if self.server_thread.server is not None and self.server_thread.loop is not None:
-            self.server_thread.loop.call_soon_threadsafe(
-                validator_actions.load_all_electors,
-                self.server_thread.server
+            asyncio.run_coroutine_threadsafe(
+                validator_actions.load_all_electors(self.server_thread.server),
+                self.server_thread.loop
             )
                 
     def add_candidate(self , candidate_name : str):
@@ -66,6 +67,14 @@ class UIEventHandler():
                 self.server_thread.loop
             )
     
+    def request_blockchain_page(self , page_number : int , page_size : int):
+        if self.server_thread.server is not None and self.server_thread.loop is not None:
+            self.server_thread.loop.call_soon_threadsafe(
+                self.server_thread.server.blockchain_operations.send_blockchain_page,
+                page_number,
+                page_size
+            )
+
     def load_elector_creds_from_file(self):
         if self.server_thread.server is not None and self.server_thread.loop is not None:
              self.server_thread.loop.call_soon_threadsafe(
@@ -13,4 +13,7 @@ class UIEvents(QObject):
     """Passed Parameters: vote_choice : int | Fired when a user presses submit votes."""
 
     add_validator_pressed : pyqtSignal = pyqtSignal(str)
-    """Passed Parameters: node_id : str"""
\ No newline at end of file
+    """Passed Parameters: node_id : str"""
+
+    request_blockchain_page : pyqtSignal = pyqtSignal(int , int)
+    """Passed Parameters: page_number : int , page_size : int | Fired when a page of the local blockchain is needed, the server replies with blc_blockchain_page."""
\ No newline at end of file
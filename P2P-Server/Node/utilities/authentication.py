@@ -151,6 +151,15 @@ def serialize_public_key(public_key : rsa.RSAPublicKey) -> str:
     key_content = public_key_pem.decode("utf-8")
     return key_content
 
+def serialize_private_key(private_key : rsa.RSAPrivateKey) -> str:
+    "Takes a rsa private key and converts it into an unencrypted PEM string, only used to hand the key to local worker processes."
+    private_key_pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    )
+    return private_key_pem.decode("utf-8")
+
 def load_rsa_private_key(pem_key_str: str):
     """convert a PEM private key string into an RSA private key."""
     try:
@@ -176,12 +185,27 @@ def generate_signature_str_rsa(private_key : rsa.RSAPrivateKey, message_string:
     return base64.b64encode(signature).decode("utf-8")
 
 
+def load_rsa_public_key(pem_key_str : str) -> typing.Optional[rsa.RSAPublicKey]:
+    """convert a PEM public key string into an RSA public key, returns None if the key is not valid."""
+    try:
+        public_key = serialization.load_pem_public_key(pem_key_str.encode("utf-8"))
+        if isinstance(public_key , rsa.RSAPublicKey) == False:
+            return None
+        return public_key
+    except Exception:
+        return None
+
 def verify_signature_rsa(public_key_str : str, message_str : str, signature_str : str) -> bool:
     """Verifies the message_str was signed with the given signature matching the public key"""
+    public_key = load_rsa_public_key(public_key_str)
+    if public_key is None:
+        return False
+    return verify_signature_rsa_key(public_key , message_str , signature_str)
+
+def verify_signature_rsa_key(public_key : rsa.RSAPublicKey, message_str : str, signature_str : str) -> bool:
+    """Verifies the message_str was signed with the given signature matching an already loaded public key"""
     try:
         message_str = message_str.strip(" ")
-        public_key_bytes : bytes = public_key_str.encode("utf-8")
-        public_key : rsa.RSAPublicKey = serialization.load_pem_public_key(public_key_bytes)
         message_bytes = message_str.encode("utf-8")
         signature_bytes = base64.b64decode(signature_str)
         public_key.verify(
@@ -1,12 +1,13 @@
-
 from __future__ import annotations  # Type checking
 
 #standard lib imports
 import os
 import typing
 import json
+import re
 
 import utilities.authentication as authentication
+from blockchain.elector_registry import elector_key_bytes
 
 #type checking
 from typing import TYPE_CHECKING
@@ -14,6 +15,9 @@ if TYPE_CHECKING:
     from server.core.server import Server
     from server.core.server_events import ServerEvents
 
+ELECTORS_FILE_READ_SIZE = 1024 * 1024 # characters read from the electors file at a time.
+JSON_WHITESPACE = re.compile(r"[ \t\r\n]*")
+
 def read_electors_file() -> typing.Optional[dict]:
     if os.path.exists("electors.json") == False:
         return None
@@ -23,6 +27,104 @@ def read_electors_file() -> typing.Optional[dict]:
     file.close()
     return output
 
+def iter_electors_file(path : str , read_size : int = ELECTORS_FILE_READ_SIZE) -> typing.Iterator[dict]:
+    """Yields each elector entry in the file without loading the whole file.
+
+    A .jsonl file has one elector per line, either an object or just the public key string, any other file is read as
+    the json object of electors keyed by elector number."""
+    if path.endswith(".jsonl"):
+        yield from _iter_json_lines(path)
+    else:
+        yield from _iter_json_object_values(path , read_size)
+
+def _iter_json_lines(path : str) -> typing.Iterator[dict]:
+    with open(path , "r") as file:
+        for each_line in file:
+            each_line = each_line.strip()
+            if each_line == "":
+                continue
+            entry = json.loads(each_line)
+            yield {"public_key" : entry} if isinstance(entry , str) else entry
+
+def _iter_json_object_values(path : str , read_size : int) -> typing.Iterator[typing.Any]:
+    """Yields the values of the top level json object in the file, reading read_size characters at a time."""
+    decoder = json.JSONDecoder()
+    with open(path , "r") as file:
+        buffer = ""
+        position = 0
+        end_of_file = False
+
+        def read_more() -> None:
+            nonlocal buffer , position , end_of_file
+            chunk = file.read(read_size)
+            if chunk == "":
+                end_of_file = True
+            buffer = buffer[position:] + chunk
+            position = 0
+
+        def next_character() -> str:
+            """Skips whitespace and returns the next character without consuming it."""
+            nonlocal position
+            while True:
+                position = JSON_WHITESPACE.match(buffer , position).end()
+                if position < len(buffer):
+                    return buffer[position]
+                if end_of_file:
+                    raise ValueError("electors file ended before the json object was closed")
+                read_more()
+
+        def decode_value() -> typing.Any:
+            nonlocal position
+            next_character()
+            while True:
+                try:
+                    value , end = decoder.raw_decode(buffer , position)
+                    # a value ending at the end of the buffer may be cut short, e.g. a number, so it is decoded again with more read.
+                    if end < len(buffer) or end_of_file:
+                        position = end
+                        return value
+                except json.JSONDecodeError:
+                    if end_of_file:
+                        raise
+                read_more()
+
+        if next_character() != "{":
+            raise ValueError("electors file is not a json object")
+        position += 1
+        if next_character() == "}":
+            return
+        while True:
+            decode_value() # elector number
+            if next_character() != ":":
+                raise ValueError("expected ':' in electors file")
+            position += 1
+            yield decode_value()
+
+            separator = next_character()
+            position += 1
+            if separator == "}":
+                return
+            if separator != ",":
+                raise ValueError("expected ',' in electors file")
+
+def iter_elector_key_batches(path : str , batch_size : int) -> typing.Iterator[typing.Tuple[typing.List[bytes] , int]]:
+    """Yields the raw public keys of the electors in the file in lists of up to batch_size, along with the number of
+    entries skipped in that batch because they had no valid public key."""
+    batch = []
+    skipped = 0
+    for each_entry in iter_electors_file(path):
+        key_bytes = elector_key_bytes(each_entry.get("public_key")) if isinstance(each_entry , dict) else None
+        if key_bytes is None:
+            skipped += 1
+            continue
+        batch.append(key_bytes)
+        if len(batch) >= batch_size:
+            yield batch , skipped
+            batch = []
+            skipped = 0
+    if batch or skipped:
+        yield batch , skipped
+
 def read_credentials_file():
     if os.path.exists("credentials.json") == False:
             return None
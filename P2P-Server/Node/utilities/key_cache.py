@@ -0,0 +1,41 @@
+"""A bounded LRU cache of loaded rsa public keys, this avoids PEM parsing a peer's key for every message verified."""
+from __future__ import annotations  # Type checking
+
+import collections
+import typing
+
+import utilities.authentication as authentication
+
+if typing.TYPE_CHECKING:
+    from cryptography.hazmat.primitives.asymmetric.rsa import RSAPublicKey
+
+class PublicKeyCache:
+    max_size : int
+    entries : collections.OrderedDict
+    def __init__(self , max_size : int):
+        self.max_size = max_size
+        self.entries = collections.OrderedDict() # (node_id , pem_hash) -> RSAPublicKey
+
+    def get(self , node_id : str , public_key_pem : str) -> RSAPublicKey | None:
+        """Returns the loaded key for the given node and PEM string, loading it on a miss.
+        Keys are cached by PEM hash aswell so a node that changes key is not verified with the old one."""
+        cache_key = (node_id , authentication.generate_sha256_hash(public_key_pem))
+        public_key = self.entries.get(cache_key , None)
+        if public_key is not None:
+            self.entries.move_to_end(cache_key)
+            return public_key
+
+        public_key = authentication.load_rsa_public_key(public_key_pem)
+        if public_key is None:
+            return None
+
+        self.entries[cache_key] = public_key
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+        return public_key
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+    def __len__(self) -> int:
+        return len(self.entries)